@@ -0,0 +1,97 @@
+"""
+Benchmark of the event engines of the EventQueue in timed mode.
+
+The benchmark starts the event queue of an emulator for the mppt_hex_default configuration with every event engine, and
+measures the amount of threads in the process and how late fields are generated compared to their deadlines.
+
+Usage: python -m benchmarks.event_queue [duration in seconds]
+"""
+import datetime
+import os
+import sys
+import threading
+import time
+
+from vemulator.configuration.config import EmulatorConfig
+from vemulator.emulator.emulator import Emulator
+from vemulator.output.fileoutput import FileOutput
+
+config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'configs', 'mppt_hex_default.yaml')
+engines = ['timer', 'scheduler']
+
+
+def benchmark(engine, duration):
+    """
+    Run the event queue of an emulator with a specific event engine
+    :param engine: event engine, see EmulatorConfig.set_event_engine()
+    :type engine: str
+    :param duration: time in seconds to run the event queue
+    :type duration: float
+    :return: measured statistics
+    :rtype: dict
+    """
+    config = EmulatorConfig()
+    config.set_config_file(config_file)
+    config.set_output(FileOutput(os.devnull))
+    config.set_timed(True)
+    config.set_event_engine(engine)
+    config.set_stop_condition('none')
+    config.create_scenarios()
+    emulator = Emulator(config)
+
+    # Fields generate a new value every interval, starting from the moment the event queue is started.
+    # So the n-th value of a field should be generated at start + n * interval
+    generations = {}
+    lateness = []
+    start = datetime.datetime.now()
+
+    def on_update(key, value, old_value):
+        n = generations.get(key, 0) + 1
+        generations[key] = n
+        interval = emulator.get_field_scenarios(key)[0].interval if emulator.get_field_scenarios(key) else 1
+        deadline = start + datetime.timedelta(seconds=n * interval)
+        lateness.append((datetime.datetime.now() - deadline).total_seconds())
+
+    emulator.field_values.observable.on('update_hex_field_value', on_update)
+
+    cpu_start = time.process_time()
+    threads = []
+    start = datetime.datetime.now()
+    emulator.event_queue.start()
+    while (datetime.datetime.now() - start).total_seconds() < duration:
+        threads.append(threading.active_count())
+        time.sleep(0.01)
+    emulator.event_queue.stop()
+    cpu_time = time.process_time() - cpu_start
+    emulator.field_values.observable.off('update_hex_field_value', on_update)
+
+    lateness.sort()
+    return {
+        'engine': engine,
+        'fields': len(emulator.get_scenario_keys()),
+        'generations': len(lateness),
+        'max_threads': max(threads),
+        'mean_threads': sum(threads) / len(threads),
+        'mean_lateness_ms': 1000 * sum(lateness) / len(lateness) if lateness else 0.0,
+        'p99_lateness_ms': 1000 * lateness[int(len(lateness) * 0.99)] if lateness else 0.0,
+        'max_lateness_ms': 1000 * lateness[-1] if lateness else 0.0,
+        'cpu_time_s': cpu_time,
+    }
+
+
+def main():
+    """
+    Run the benchmark for all event engines and print the results
+    """
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    columns = ['engine', 'fields', 'generations', 'max_threads', 'mean_threads', 'mean_lateness_ms',
+               'p99_lateness_ms', 'max_lateness_ms', 'cpu_time_s']
+    print(' '.join(f'{column:>16}' for column in columns))
+    for engine in engines:
+        result = benchmark(engine, duration)
+        print(' '.join(f'{result[column]:>16.3f}' if isinstance(result[column], float) else f'{result[column]:>16}'
+                       for column in columns))
+
+
+if __name__ == '__main__':
+    main()
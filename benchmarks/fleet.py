@@ -0,0 +1,50 @@
+"""
+Benchmark of the throughput of a fleet of emulators in a single process.
+
+The benchmark runs a fleet of emulators for the mppt_text configuration on a virtual clock for a certain amount of
+emulated time, and prints the throughput of the fleet.
+
+Usage: python -m benchmarks.fleet [amount of emulators] [emulated seconds]
+"""
+import datetime
+import os
+import sys
+
+from vemulator.configuration.config import EmulatorConfig
+from vemulator.fleet.fleet import Fleet
+from vemulator.output.fileoutput import FileOutput
+from vemulator.util import log
+from vemulator.util.clock import VirtualClock
+
+config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'configs', 'mppt_text.yaml')
+
+
+def main():
+    """
+    Run the benchmark and print the results
+    """
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    duration = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    log.set_debugging(False)  # Debug logging of every generated value would dominate the results
+
+    fleet = Fleet(VirtualClock())
+    for i in range(amount):
+        config = EmulatorConfig()
+        config.set_config_file(config_file)
+        config.set_default_seed(i)
+        config.set_stop_condition('none')
+        config.create_scenarios()
+        fleet.add_emulator(f'mppt{i}', config, FileOutput(os.devnull))
+
+    # Stop all emulators after the emulated duration has passed
+    fleet.scheduler.schedule(fleet.clock.now() + datetime.timedelta(seconds=duration), fleet.stop)
+    fleet.run()
+
+    report = fleet.get_report()
+    print(f'emulators: {amount}, emulated seconds: {duration}, real seconds: {report["elapsed"]:.3f}')
+    print(f'messages: {report["messages"]} ({report["messages_per_second"]:.0f}/s), '
+          f'bytes: {report["bytes"]} ({report["bytes_per_second"]:.0f}/s)')
+
+
+if __name__ == '__main__':
+    main()
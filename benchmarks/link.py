@@ -0,0 +1,78 @@
+"""
+Estimate of the serial link utilisation of device configurations.
+
+The benchmark runs every configuration for a certain amount of emulated time on a virtual clock, with a pacer that
+only measures the link. It prints the bytes per second that the device writes, the utilisation of a link at the given
+baud rate, and how many of these devices fit on a single link, such as a serial multiplexer.
+
+Usage: python -m benchmarks.link [baud rate] [emulated seconds] [config files...]
+"""
+import glob
+import math
+import os
+import sys
+
+from vemulator.configuration.config import EmulatorConfig
+from vemulator.emulator.emulator import Emulator
+from vemulator.output.fileoutput import FileOutput
+from vemulator.output.pacer import Link, OutputPacer
+from vemulator.util import log
+from vemulator.util.clock import VirtualClock
+
+config_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'configs')
+
+
+def measure(config_file, baud_rate, duration):
+    """
+    Measure the link utilisation of a configuration
+    :param config_file: path of the configuration
+    :param baud_rate: baud rate of the link
+    :param duration: emulated seconds
+    :return: statistics of the link
+    """
+    clock = VirtualClock()
+    link = Link(baud_rate, window=duration, clock=clock)
+    config = EmulatorConfig()
+    config.set_config_file(config_file)
+    config.set_stop_condition('none')
+    config.set_clock(clock)
+    config.set_output(OutputPacer(FileOutput(os.devnull), link, policy='none'))
+    config.create_scenarios()
+
+    delay = config.get_delay()
+    if delay <= 0:
+        raise ValueError('the configuration has no delay between ticks')
+
+    emulator = Emulator(config)
+    emulator.prepare()
+    for _ in range(math.ceil(duration / delay)):
+        emulator.tick()
+        clock.sleep(delay)
+    emulator.finish()
+    return link.get_statistics()
+
+
+def main():
+    """
+    Run the benchmark and print the results
+    """
+    baud_rate = int(sys.argv[1]) if len(sys.argv) > 1 else 19200
+    duration = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    config_files = sys.argv[3:] if len(sys.argv) > 3 else sorted(glob.glob(os.path.join(config_dir, '*.yaml')))
+    log.set_debugging(False)
+
+    print(f'baud rate: {baud_rate}, emulated seconds: {duration}')
+    for config_file in config_files:
+        name = os.path.basename(config_file)
+        try:
+            statistics = measure(config_file, baud_rate, duration)
+        except Exception as e:
+            print(f'{name}: could not be emulated ({e})')
+            continue
+        devices = math.floor(1 / statistics['offered_load']) if statistics['offered_load'] > 0 else 'unlimited'
+        print(f'{name}: {statistics["offered"] / duration:.0f} bytes/s, '
+              f'utilisation: {statistics["offered_load"]:.1%}, devices per link: {devices}')
+
+
+if __name__ == '__main__':
+    main()
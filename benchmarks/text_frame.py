@@ -0,0 +1,82 @@
+"""
+Benchmark of the generation of text frames.
+
+The benchmark runs an emulator with every field of the vedirect_330 preset that has a valid default, which is split
+into multiple frames, for a number of ticks on a virtual clock, and prints the time per tick.
+
+Usage: python -m benchmarks.text_frame [ticks]
+"""
+import os
+import sys
+import time
+
+from vemulator.configuration.config import EmulatorConfig
+from vemulator.emulator.emulator import Emulator
+from vemulator.output.fileoutput import FileOutput
+from vemulator.util import log
+from vemulator.util.clock import VirtualClock
+
+preset_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'protocols', 'vedirect_330')
+
+
+def create_config(fields):
+    """
+    Create a config with fields of the vedirect_330 preset
+    :param fields: names of the fields
+    :return: yaml config
+    """
+    return '\n'.join([
+        'device: MPPT',
+        'name: Text frame benchmark',
+        'protocol: text',
+        'preset: vedirect_330',
+        'preset_fields:',
+    ] + [f'  - {field}: default' for field in fields])
+
+
+def usable_fields():
+    """
+    Get the fields of the vedirect_330 preset that have a valid default preset
+    :return: names of the fields
+    """
+    fields = []
+    for field in sorted(os.path.splitext(name)[0] for name in os.listdir(preset_dir)):
+        config = EmulatorConfig()
+        try:
+            config.set_config(create_config([field]))
+            config.create_scenarios()
+        except Exception:
+            continue
+        fields.append(field)
+    return fields
+
+
+def main():
+    """
+    Run the benchmark and print the results
+    """
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    log.set_debugging(False)  # Debug logging of every generated value would dominate the results
+
+    config = EmulatorConfig()
+    config.set_config(create_config(usable_fields()))
+    config.set_clock(VirtualClock())
+    config.set_stop_condition('none')
+    config.set_output(FileOutput(os.devnull))
+    config.create_scenarios()
+    emulator = Emulator(config)
+
+    emulator.prepare()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        emulator.tick()
+    elapsed = time.perf_counter() - start
+    emulator.finish()
+
+    statistics = emulator.get_statistics()
+    print(f'fields: {len(emulator.keys)}, ticks: {ticks}, frames: {statistics["messages"]}, bytes: {statistics["bytes"]}')
+    print(f'time per tick: {elapsed / ticks * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,5 +4,6 @@ setup(
     name='vemulator',
     version='1.0',
     author='Wilco van Beijnum, Jelte van Bommel, Matteo Bronkhorst',
-    install_requires=['pyserial', 'PyYAML', 'colorlog', 'observable']
+    install_requires=['pyserial', 'PyYAML', 'colorlog', 'observable'],
+    extras_require={'numpy': ['numpy']}
 )
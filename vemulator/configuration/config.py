@@ -4,6 +4,7 @@ from random import Random
 
 from ..util import hex
 from ..util import log
+from ..util.clock import Clock
 from ..util.config_checker import check_config_dict
 from ..util.deserialize_scenario import deserialize_scenario, scenario_has_children
 from ..util.yamlparser import load_yaml_with_lines, load_yaml
@@ -32,6 +33,11 @@ class EmulatorConfig:
         self.bit_error_checksum = False
         self.default_seed = 0
         self.timed = False
+        self.event_engine = 'scheduler'
+        self.clock = Clock()
+        self.overrun_policy = 'catch-up'
+        self.register_hold_time = None
+        self.register_file = None
         self.stop_condition = 'text'
 
     ################
@@ -117,8 +123,9 @@ class EmulatorConfig:
     def set_bit_error_rate(self, bit_error_rate=0.0):
         """
         Set the bit error rate for a message.
-        :param bit_error_rate: bit_error_rate is 0.0 by default, maximum value is 1.0. Example: Value of 0.6 indicates every
-        .6 bits per bit are to be flipped.
+        :param bit_error_rate: bit_error_rate is 0.0 by default, maximum value is 1.0. It is the probability that a bit
+        is flipped, independently of the other bits. Example: Value of 0.6 indicates that on average .6 bits per bit are
+        to be flipped.
         :type bit_error_rate: float
         """
         self.bit_error_rate = bit_error_rate
@@ -152,6 +159,55 @@ class EmulatorConfig:
         """
         self.timed = timed
 
+    def set_event_engine(self, event_engine='scheduler'):
+        """
+        Set the engine that executes the events for the generation of field values in timed mode.
+        :param event_engine: 'scheduler' by default, which executes all events on a single thread in order of their
+        deadline. 'timer' starts a separate threading.Timer for every event. 'lazy' does not use any threads, but
+        generates the values of a field for all passed intervals as soon as the field is read.
+        :type event_engine: str
+        """
+        self.event_engine = event_engine
+
+    def set_clock(self, clock=None):
+        """
+        Set the clock that determines how time passes during the emulation. This applies to the delay between text
+        messages, async hex intervals and the intervals of fields in timed mode.
+        :param clock: util.clock.Clock (default) to follow the real time, util.clock.ScaledClock to run faster or slower
+        than the real time, or util.clock.VirtualClock to emulate as fast as possible.
+        :type clock: util.clock.Clock
+        """
+        self.clock = clock if clock is not None else Clock()
+
+    def set_overrun_policy(self, overrun_policy='catch-up'):
+        """
+        Set what happens when a tick of the emulator takes longer than the delay between text messages, such that the
+        next tick is already overdue.
+        :param overrun_policy: 'catch-up' by default, which executes the overdue ticks as soon as possible until the
+        emulator is back on schedule. 'skip' skips the overdue ticks and continues at the next deadline.
+        :type overrun_policy: str
+        """
+        self.overrun_policy = overrun_policy
+
+    def set_register_hold_time(self, register_hold_time=None):
+        """
+        Set how long a value that is written to a register using a hex Set takes precedence over the values generated
+        by the scenarios of the register
+        :param register_hold_time: time in seconds; None by default, which holds the value until it is overwritten by
+        another Set
+        :type register_hold_time: float or None
+        """
+        self.register_hold_time = register_hold_time
+
+    def set_register_file(self, register_file=None):
+        """
+        Set a file in which the values written to registers using a hex Set are persisted, such that they survive a
+        restart of the emulator
+        :param register_file: path to the file; None by default, which does not persist the values
+        :type register_file: str or None
+        """
+        self.register_file = register_file
+
     def set_stop_condition(self, stop_condition='text'):
         """
         Set the condition under which the emulator is supposed to terminate.
@@ -444,8 +500,8 @@ class EmulatorConfig:
     def get_bit_error_rate(self):
         """
         Get the bit error rate for a message.
-        :return bit_error_rate is 0.0 by default, maximum value is 1.0. Example: Value of 0.6 indicates every
-        .6 bits per bit are to be flipped.
+        :return bit_error_rate is 0.0 by default, maximum value is 1.0. It is the probability that a bit is flipped.
+        Example: Value of 0.6 indicates that on average .6 bits per bit are to be flipped.
         :rtype float
         """
         return self.bit_error_rate
@@ -478,6 +534,46 @@ class EmulatorConfig:
         """
         return self.timed
 
+    def get_event_engine(self):
+        """
+        Get the engine that executes the events for the generation of field values in timed mode.
+        :return: one of 'scheduler', 'timer' or 'lazy'
+        :rtype: str
+        """
+        return self.event_engine
+
+    def get_clock(self):
+        """
+        Get the clock that determines how time passes during the emulation.
+        :return: clock
+        :rtype: util.clock.Clock
+        """
+        return self.clock
+
+    def get_overrun_policy(self):
+        """
+        Get what happens when a tick of the emulator takes longer than the delay between text messages.
+        :return: one of 'catch-up' or 'skip'
+        :rtype: str
+        """
+        return self.overrun_policy
+
+    def get_register_hold_time(self):
+        """
+        Get how long a value that is written to a register using a hex Set takes precedence over generated values
+        :return: time in seconds, or None to hold the value until it is overwritten
+        :rtype: float or None
+        """
+        return self.register_hold_time
+
+    def get_register_file(self):
+        """
+        Get the file in which the values written to registers are persisted
+        :return: path to the file, or None if the values are not persisted
+        :rtype: str or None
+        """
+        return self.register_file
+
     def get_stop_condition(self):
         """
         Get the condition under which the emulator is supposed to terminate.
@@ -0,0 +1,215 @@
+from ..scenarios.arithmetic import ArithmeticScenario
+from ..scenarios.mpptcharger import MpptChargerScenario, default_outputs
+from ..scenarios.parentscenario import ParentScenario
+from ..util import hex
+from ..util.deserialize_scenario import scenarios, scenario_has_children
+from ..util.expression import compile_expression
+
+
+class DependencyException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+def field_name(protocol, key):
+    """
+    Get the name by which Arithmetic expressions reference a field
+    :param protocol: either 'text' or 'hex'
+    :type protocol: str
+    :param key: key of the field
+    :type key: str or int
+    :return: the key of a text field, or 'H0x' followed by the big endian hex id of a hex field
+    :rtype: str
+    """
+    if protocol == 'hex':
+        return 'H0x' + hex.int_to_hex_string(key, 2, little_endian=False)
+    return key
+
+
+def referenced_names(scenarios):
+    """
+    Get the names of the fields that the Arithmetic scenarios in a list of scenarios reference, including the
+    Arithmetic scenarios that are children of other scenarios
+    :param scenarios: list of scenarios, or of the scenario dicts of a config
+    :type scenarios: list
+    :return: referenced names
+    :rtype: set
+    :exception ExpressionException if the expression of a scenario dict is invalid
+    """
+    names = set()
+    for scenario in scenarios:
+        if isinstance(scenario, dict):
+            if scenario.get('type') == 'Arithmetic' and 'value' in scenario:
+                names.update(compile_expression(scenario['value']).names)
+            elif scenario_dict_has_children(scenario):
+                names.update(referenced_names(scenario['values']))
+        elif isinstance(scenario, ArithmeticScenario):
+            names.update(scenario.expression.names)
+        elif isinstance(scenario, ParentScenario):
+            names.update(referenced_names(scenario.initial_children))
+    return names
+
+
+def written_names(scenarios):
+    """
+    Get the keys of the fields that the scenarios in a list of scenarios put values in, such as the fields
+    generated by an MpptCharger scenario, including the scenarios that are children of other scenarios
+    :param scenarios: list of scenarios, or of the scenario dicts of a config
+    :type scenarios: list
+    :return: keys of the fields
+    :rtype: set
+    """
+    names = set()
+    for scenario in scenarios:
+        if isinstance(scenario, dict):
+            if scenario.get('type') == 'MpptCharger':
+                names.update(scenario.get('outputs', default_outputs))
+            elif scenario_dict_has_children(scenario):
+                names.update(written_names(scenario['values']))
+        elif isinstance(scenario, MpptChargerScenario):
+            names.update(scenario.outputs)
+        elif isinstance(scenario, ParentScenario):
+            names.update(written_names(scenario.initial_children))
+    return names
+
+
+def field_dependencies(fields):
+    """
+    Get the names of the fields that every field references.
+    A field of which the value is put by the scenario of another field references that field.
+    :param fields: pairs of the name of a field and its lists of scenarios, or of scenario dicts, in the order of the
+    config
+    :type fields: list
+    :return: key is the name of a field, value is the set of names it references
+    :rtype: dict
+    :exception ExpressionException if the expression of a scenario dict is invalid
+    """
+    dependencies = dict()
+    writers = dict()  # key is the name of a field, value is the names of the fields whose scenarios put its value
+    for name, scenario_lists in fields:
+        names = set()
+        for scenarios in scenario_lists:
+            names.update(referenced_names(scenarios))
+            for written in written_names(scenarios) - {name}:
+                writers.setdefault(written, set()).add(name)
+        dependencies[name] = names
+    for name, names in writers.items():
+        dependencies.setdefault(name, set()).update(names)
+    return dependencies
+
+
+def scenario_dict_has_children(scenario):
+    """
+    Check if a scenario dict of a config has child scenarios
+    :param scenario: scenario dict
+    :type scenario: dict
+    :return: true if the scenario has a list of child scenarios, false otherwise
+    :rtype: bool
+    """
+    return scenario.get('type') in scenarios and scenario_has_children(scenario['type']) and \
+        isinstance(scenario.get('values', None), list)
+
+
+class DependencyGraph:
+    """
+    Graph of the fields that Arithmetic fields reference, across text and hex fields.
+    The graph determines the order in which fields have to be generated, such that a derived field is computed from
+    the values of the current tick, and keeps track of which derived fields have to be computed again because one of
+    the fields they reference has changed.
+    A field that references itself uses its previous value, which is not a cycle. A field of which the value is put by
+    the scenario of another field, such as an MpptCharger scenario, references that field.
+
+    Example:
+    graph = DependencyGraph({'V': set(), 'I': set(), 'P': {'V', 'I'}})
+    graph.order  # ['V', 'I', 'P']
+    graph.changed('V')
+    graph.is_dirty('P')  # True
+    """
+
+    def __init__(self, fields):
+        """
+        Create a dependency graph
+        :param fields: the names of the fields that every field references, in the order of the config
+        :type fields: dict
+        :exception DependencyException if fields reference each other
+        """
+        self.dependencies = {name: set(names) - {name} for name, names in fields.items()}
+        self.dependents = dict()  # key is a name, value is the set of fields that reference it
+        for name, names in fields.items():
+            for dependency in names:
+                self.dependents.setdefault(dependency, set()).add(name)
+        self.order = self.__sort()
+        # Derived fields have not been computed yet
+        self.dirty = set(name for name, names in fields.items() if len(names) > 0)
+
+    @staticmethod
+    def from_scenarios(text_fields, hex_fields):
+        """
+        Create a dependency graph of the scenarios of an emulator
+        :param text_fields: key is a text key, value is a list of lists of scenarios of the field
+        :type text_fields: dict
+        :param hex_fields: key is a hex id, value is a list of lists of scenarios of the field
+        :type hex_fields: dict
+        :return: the dependency graph
+        :rtype: DependencyGraph
+        :exception DependencyException if fields reference each other
+        """
+        fields = [(field_name(protocol, key), scenario_lists)
+                  for protocol, protocol_fields in [('text', text_fields), ('hex', hex_fields)]
+                  for key, scenario_lists in protocol_fields.items()]
+        return DependencyGraph(field_dependencies(fields))
+
+    def changed(self, name):
+        """
+        Mark the fields that reference a field as dirty, because the value of the field has changed
+        :param name: name of the field
+        :type name: str
+        """
+        self.dirty.update(self.dependents.get(name, ()))
+
+    def is_dirty(self, name):
+        """
+        Check if a derived field has to be computed again
+        :param name: name of the field
+        :type name: str
+        :return: true if a field it references has changed since it was computed, false otherwise
+        :rtype: bool
+        """
+        return name in self.dirty
+
+    def clean(self, name):
+        """
+        Mark a derived field as computed
+        :param name: name of the field
+        :type name: str
+        """
+        self.dirty.discard(name)
+
+    def __sort(self):
+        """
+        Sort the fields such that every field comes after the fields it references, and otherwise keeps its order
+        :return: sorted names of the fields
+        :rtype: list
+        :exception DependencyException if fields reference each other
+        """
+        order = []
+        done = set()
+        visiting = []
+
+        def visit(name):
+            if name in done or name not in self.dependencies:
+                return
+            if name in visiting:
+                cycle = visiting[visiting.index(name):] + [name]
+                raise DependencyException(f'Fields {" -> ".join(cycle)} reference each other')
+            visiting.append(name)
+            # Visit the dependencies in a fixed order, such that the order does not depend on hashing
+            for dependency in sorted(self.dependencies[name]):
+                visit(dependency)
+            visiting.pop()
+            done.add(name)
+            order.append(name)
+
+        for name in self.dependencies:
+            visit(name)
+        return order
@@ -1,11 +1,21 @@
-import re
+import asyncio
+import datetime
+import math
 import time
+from queue import SimpleQueue
 from random import Random
+from threading import RLock
 
 from observable import Observable
 
+from .dependencies import DependencyGraph, field_name
 from .field_values import FieldValueList
+from .hex_responder import HexResponder
+from .register_store import RegisterStore
+from .registers import RegisterIndex
 from ..events.event_queue import EventQueue
+from ..events.lazy_event_queue import LazyEventQueue
+from ..input.frame_splitter import HexFrameSplitter
 from ..scenarios.arithmetic import ArithmeticScenario
 from ..util import hex
 from ..util import text
@@ -14,13 +24,15 @@ from ..util.log import init_logger
 
 class Emulator:
     logger = None
-    run_time = 0  # Time in seconds the emulator is running
 
-    def __init__(self, config):
+    def __init__(self, config, scheduler=None):
         """
         Instantiate a new emulator
         :param config: config to use
         :type config: configuration.config.EmulatorConfig
+        :param scheduler: scheduler to execute timed events on, such as a scheduler shared by a fleet of emulators;
+        by default the event queue creates its own scheduler
+        :type scheduler: events.scheduler.Scheduler
         """
         self.logger = init_logger(__name__)
 
@@ -33,66 +45,88 @@ class Emulator:
         self.hex_scenarios = config.get_hex_scenarios()
         self.overwritten_text_scenarios = dict()
         self.overwritten_hex_scenarios = dict()
+        self.registers = RegisterIndex()
+        for key, scenarios in self.hex_scenarios.items():
+            self.registers.add(key, scenarios)
+        self.hex_handlers = {
+            b'0': self.__send_fixed_hex_response,  # Enter boot
+            b'1': self.__send_fixed_hex_response,  # Ping
+            b'3': self.__send_fixed_hex_response,  # App version
+            b'4': self.__send_fixed_hex_response,  # Product Id
+            b'6': self.__ignore_hex_message,  # Restart
+            b'7': self.__process_hex_get,
+            b'8': self.__process_hex_set,
+            b'A': self.__ignore_hex_message,  # Async
+        }
+        # The responses that do not depend on the state of the emulator are encoded once
+        version = hex.int_to_hex_bytes(config.get_firmware_version(), 2)
+        self.fixed_hex_responses = {
+            b'0': hex.build_frame(b'4', b'0000'),  # Not supported in emulator
+            b'1': hex.build_frame(b'5', version),
+            b'3': hex.build_frame(b'1', version),
+            b'4': hex.build_frame(b'1', hex.int_to_hex_bytes(config.get_product_id(), 2)),
+        }
+        self.checksum_error_response = hex.build_frame(b'4', b'AAAA')
         self.input = config.get_input()
         self.output = config.get_output()
         self.keys = list(self.text_scenarios.keys())
         self.field_values = FieldValueList()
+        self.dependencies = None  # DependencyGraph of the Arithmetic fields
+        self.text_order = []  # Text keys in the order in which their values are generated
+        self.__update_dependencies()
+        self.field_values.observable.on('update_field_value', self.__field_value_changed)
+        self.register_store = RegisterStore(self.field_values, config.get_clock(), config.get_register_hold_time(),
+                                            config.get_register_file())
         self.paused = False
         self.stopped = False
         self.status = 'initialized'
+        self.run_time = 0  # Time in seconds the emulator is running
+        self.ticks = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.overruns = 0  # Amount of ticks after which the next tick was already overdue
+        self.skipped = 0  # Amount of overdue ticks that have been skipped
+        self.lateness = 0.0  # Total time in seconds that ticks started after their deadline
+        self.max_lateness = 0.0
         self.bit_error_random = Random(config.get_default_seed())
+        self.text_encoder = text.TextFrameEncoder()
+        self.lock = RLock()  # Serializes ticks, responses to hex messages and writes to the output
+        self.frame_splitter = HexFrameSplitter()
+        self.hex_frames = SimpleQueue()  # Complete hex frames that have been received but not responded to yet
+        self.responder = None  # HexResponder when hex messages are answered as soon as they arrive
+        self.loop = None  # Event loop when running using arun()
+        self.writes = None  # Queue of messages to write when running using arun()
+        self.wakeup = None  # Event that wakes up arun() when the emulator is paused, resumed or stopped
         self.observable = Observable()
         self.timed = self.config.get_timed()
+        self.clock = self.config.get_clock()
         self.stop_condition = self.config.get_stop_condition()
-        if self.timed:
-            self.event_queue = EventQueue(self)
+        if self.timed and self.config.get_event_engine() == 'lazy':
+            self.event_queue = LazyEventQueue(self)
+        elif self.timed:
+            self.event_queue = EventQueue(self, self.config.get_event_engine(), scheduler)
 
     def __send_message(self, message):
         """
-        Send a text message
+        Send a text message, split into multiple frames if it has too many fields
         :param message: dict of message fields
         :type message: dict
         """
-        message_max_len = 21 # Max length is 22 including Checksum
-        if len(message) > message_max_len:
-            # We need to split up the message
-            # First we check if we can just move the H fields to a new message
-            h_message = {}
-            non_h_message = {}
-            h_pattern = re.compile('^H[0-9]+$')
-            for key, value in message.items():
-                if h_pattern.match(key):
-                    h_message[key] = value
-                else:
-                    non_h_message[key] = value
-
-            if 0 < len(h_message) < message_max_len:
-                self.logger.debug('Splitting message into part with non H and H fields')
-                self.__send_message(non_h_message)
-                self.__send_message(h_message)
-            else:
-                # Removing the H messages does not help, just split evenly
-                self.logger.debug('Splitting message into two halves')
-                split_index = len(message) // 2
-                dict_items = list(message.items())
-                self.__send_message(dict(dict_items[:split_index]))
-                self.__send_message(dict(dict_items[split_index:]))
-
-        else:
-            text_message = b''
-            for key, value in message.items():
-                text_message = text_message + b'\r\n' + bytes(str(key), 'utf-8') + b'\t' + bytes(str(value), 'utf-8')
-
-            if self.config.get_bit_error_rate() > 0.0 and self.config.get_bit_error_checksum() is False:
+        if self.config.get_bit_error_rate() > 0.0 and self.config.get_bit_error_checksum() is False:
+            for text_message in self.text_encoder.encode(message):
                 # Add bit errors, but do not add errors to the checksum
                 text_message = text.bit_error(text_message, self.config.get_bit_error_rate(), self.bit_error_random)
 
-            text_message = text.add_checksum(text_message)
-            if text.check_checksum(text_message):
-                # Write message to output without bit errors
+                text_message = text.add_checksum(text_message)
+                if text.check_checksum(text_message):
+                    # Write message to output without bit errors
+                    self.__print_bytes(text_message)
+                else:
+                    self.logger.error('Something went wrong, the checksum is not correct')
+        else:
+            # The encoder calculates the checksum from the sums of the lines of the fields
+            for text_message in self.text_encoder.encode(message, checksum=True):
                 self.__print_bytes(text_message)
-            else:
-                self.logger.error('Something went wrong, the checksum is not correct')
 
     def __print_bytes(self, message):
         """
@@ -101,12 +135,19 @@ class Emulator:
         :type message: bytes
         """
         self.logger.log(15, message)
-        if self.config.get_bit_error_rate() > 0.0 and self.config.get_bit_error_checksum() is True:
-            message = text.bit_error(message, self.config.get_bit_error_rate(), self.bit_error_random)
-        if self.output.available():
-            self.output.write(message)
-        else:
-            self.logger.error('Could not write message to output, it is not available')
+        with self.lock:
+            if self.config.get_bit_error_rate() > 0.0 and self.config.get_bit_error_checksum() is True:
+                message = text.bit_error(message, self.config.get_bit_error_rate(), self.bit_error_random)
+            if self.output.available():
+                if self.loop is not None:
+                    # The writer task of arun() writes the messages in order
+                    self.loop.call_soon_threadsafe(self.writes.put_nowait, message)
+                else:
+                    self.output.write(message)
+                self.messages_sent += 1
+                self.bytes_sent += len(message)
+            else:
+                self.logger.error('Could not write message to output, it is not available')
 
     def stop(self):
         """
@@ -114,6 +155,7 @@ class Emulator:
         """
         self.stopped = True
         self.status = 'stopping'
+        self.__wake_up()
 
     def pause(self):
         """
@@ -121,6 +163,7 @@ class Emulator:
         """
         self.paused = True
         self.status = 'pausing'
+        self.__wake_up()
 
     def resume(self):
         """
@@ -129,6 +172,14 @@ class Emulator:
         if self.status == 'pausing' or self.status == 'paused':
             self.paused = False
             self.status = 'resuming'
+            self.__wake_up()
+
+    def __wake_up(self):
+        """
+        Wake up arun() when it is waiting, such that it handles a change in status immediately
+        """
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.wakeup.set)
 
     def get_status(self):
         """
@@ -137,7 +188,7 @@ class Emulator:
         """
         return self.status
 
-    def __done(self):
+    def is_done(self):
         """
         Check if the emulator is done and should stop looping
         :return: true if it is done, false otherwise
@@ -182,34 +233,230 @@ class Emulator:
         """
         Start the emulation process
         """
+        self.prepare()
+        deadline = self.clock.now()
+        while not self.is_done():
+            if self.paused:
+                while self.paused:
+                    # Wait until unpaused
+                    self.status = 'paused'
+                    time.sleep(0.1)
+                # Continue the schedule from the moment the emulator is resumed
+                deadline = self.clock.now()
+
+            self.tick(deadline=deadline)
+
+            # Wait until the deadline of the next tick, such that the processing time of a tick does not cause drift
+            if self.config.get_delay() > 0:
+                deadline = self.next_deadline(deadline)
+                wait = (deadline - self.clock.now()).total_seconds()
+                if wait > 0:
+                    self.clock.sleep(wait)
+
+        self.finish()
+
+    async def arun(self):
+        """
+        Start the emulation process as a coroutine, such that many emulators can share a single event loop.
+        Messages are written using OutputInterface.awrite(). When the input has a file descriptor, incoming hex
+        messages are answered as soon as they arrive, otherwise the input is polled once per tick like in run().
+        A paused emulator waits until it is resumed or stopped, without polling.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.writes = asyncio.Queue()
+        self.wakeup = asyncio.Event()
+        self.prepare(start_responder=False)
+        writer = self.loop.create_task(self.__awrite_messages())
+        reader = None
+        if self.config.get_protocol() != 'text' and self.input is not None and self.input.fileno() is not None:
+            reader = self.loop.create_task(self.__aread_input())
+
+        try:
+            deadline = self.clock.now()
+            while not self.is_done():
+                if self.paused:
+                    self.status = 'paused'
+                    await self.__await_wake_up(None)
+                    # Continue the schedule from the moment the emulator is resumed
+                    deadline = self.clock.now()
+                    continue
+
+                self.tick(read_input=reader is None, deadline=deadline)
+
+                # Wait until the deadline of the next tick
+                wait = 0
+                if self.config.get_delay() > 0:
+                    deadline = self.next_deadline(deadline)
+                    wait = (deadline - self.clock.now()).total_seconds()
+                if wait > 0 and not self.clock.is_virtual():
+                    await self.__await_wake_up(self.clock.real_seconds(wait))
+                else:
+                    if wait > 0:
+                        self.clock.sleep(wait)
+                    await asyncio.sleep(0)  # Let other emulators on the event loop run
+        finally:
+            if reader is not None:
+                reader.cancel()
+            await self.writes.join()
+            writer.cancel()
+            await asyncio.gather(writer, *([reader] if reader is not None else []), return_exceptions=True)
+            self.loop = None
+            self.finish()
+
+    async def __await_wake_up(self, timeout):
+        """
+        Wait until the emulator is paused, resumed or stopped, or until a timeout has passed
+        :param timeout: maximum time to wait in seconds, None to wait until woken up
+        :type timeout: float or None
+        """
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.wakeup.clear()
+
+    async def __awrite_messages(self):
+        """
+        Write the queued messages of arun() to the output in order
+        """
+        while True:
+            message = await self.writes.get()
+            try:
+                await self.output.awrite(message)
+            except Exception as e:
+                self.logger.error(f'Could not write message to output: {e}')
+            finally:
+                self.writes.task_done()
+
+    async def __aread_input(self):
+        """
+        Respond to incoming hex messages as soon as the event loop reports that the input is readable
+        """
+        readable = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        fd = self.input.fileno()
+        loop.add_reader(fd, readable.set)
+        try:
+            while True:
+                await readable.wait()
+                readable.clear()
+                while self.input.has_data():
+                    data = await self.input.aread()
+                    if len(data) == 0:
+                        # End of the input, it will never become readable again
+                        self.logger.debug('Input has been closed')
+                        return
+                    self.__receive_input(data)
+        finally:
+            loop.remove_reader(fd)
+
+    def prepare(self, start_responder=True):
+        """
+        Prepare the emulator for emulation. This is done by run(), and only has to be called manually when
+        the emulator is driven by calling tick(), such as in a fleet.
+        :param start_responder: whether to answer hex messages as soon as they arrive using a HexResponder thread,
+        which is only possible when the input has a file descriptor. Otherwise, hex messages are answered once per tick.
+        :type start_responder: bool
+        """
         # Set listener for sending async hex messages on field change
         self.field_values.observable.on('put_hex_field_value', self.__send_async_hex_change)
         if self.timed:
             self.event_queue.start()
-        while not self.__done():
-            while self.paused:
-                # Wait until unpaused
-                self.status = 'paused'
-                time.sleep(0.1)
-
-            self.status = 'running'
+        if start_responder and self.config.get_protocol() != 'text' and self.input is not None \
+                and self.input.fileno() is not None:
+            self.responder = HexResponder(self.input, self.__receive_input)
+            self.responder.start()
+
+    def tick(self, read_input=None, deadline=None):
+        """
+        Execute a single iteration of the emulation: respond to incoming hex messages, send async hex messages and
+        send the text messages
+        :param read_input: whether to respond to incoming hex messages, which is not necessary when they are already
+        answered as soon as they arrive; by default only when no HexResponder is running
+        :type read_input: bool or None
+        :param deadline: the point in time at which the tick should have started, used to measure its lateness
+        :type deadline: datetime.datetime or None
+        """
+        if read_input is None:
+            read_input = self.responder is None
+        if deadline is not None:
+            lateness = max((self.clock.now() - deadline).total_seconds(), 0.0)
+            self.lateness += lateness
+            self.max_lateness = max(self.max_lateness, lateness)
+        self.status = 'running'
+        with self.lock:
             # Generate hex messages
             if self.config.get_protocol() != 'text':
-                self.__read_incoming_hex_messages()
+                if read_input:
+                    self.__read_incoming_hex_messages()
                 self.__generate_async_hex_messages()
             # Generate text messages
             self.__generate_text_messages()
 
-            # Wait a certain delay before sending the next message
-            if self.config.get_delay() > 0:
-                time.sleep(self.config.get_delay())
-                self.run_time += self.config.get_delay()
-            else:
-                # Still increase the passed time for async hex messages
-                self.run_time += 1
-
+        if self.config.get_delay() > 0:
+            self.run_time += self.config.get_delay()
+        else:
+            # Still increase the passed time for async hex messages
+            self.run_time += 1
+        self.ticks += 1
+
+    def next_deadline(self, deadline):
+        """
+        Determine the deadline of the next tick, one delay after the deadline of the current tick.
+        When that deadline has already passed, the tick has overrun, and the overrun policy of the config determines
+        whether the overdue ticks are caught up on or skipped.
+        :param deadline: the deadline of the current tick
+        :type deadline: datetime.datetime
+        :return: the deadline of the next tick
+        :rtype: datetime.datetime
+        """
+        now = self.clock.now()
+        if self.config.get_delay() <= 0:
+            # Without a delay the next tick is due immediately, so a tick can not overrun
+            return now
+        delay = datetime.timedelta(seconds=self.config.get_delay())
+        next_deadline = deadline + delay
+        if now > next_deadline:
+            self.overruns += 1
+            if self.config.get_overrun_policy() == 'skip':
+                # Continue at the first deadline after the current time
+                periods = math.ceil((now - deadline) / delay)
+                self.skipped += periods - 1
+                self.run_time += (periods - 1) * self.config.get_delay()
+                next_deadline = deadline + periods * delay
+        return next_deadline
+
+    def finish(self):
+        """
+        Finish the emulation, after which the emulator is stopped
+        """
+        if self.responder is not None:
+            self.responder.stop()
+            self.responder = None
+        if self.timed:
+            self.event_queue.stop()
+        self.register_store.close()
+        self.output.flush()
         self.status = 'stopped'
 
+    def get_statistics(self):
+        """
+        Get statistics about the emulation so far
+        :return: dict with the amount of ticks, messages and bytes that have been sent, the run time in seconds,
+        the amount of ticks that overran and that were skipped, and the mean and maximum lateness of ticks in seconds
+        :rtype: dict
+        """
+        return {
+            'ticks': self.ticks,
+            'messages': self.messages_sent,
+            'bytes': self.bytes_sent,
+            'run_time': self.run_time,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'lateness': self.lateness / self.ticks if self.ticks > 0 else 0.0,
+            'max_lateness': self.max_lateness,
+        }
+
     def __generate_next(self, protocol, field_key):
         """
         Generate the next value of a field using the specified generator list
@@ -240,7 +487,16 @@ class Emulator:
                 # There is no generator available for this field
                 return None, None
 
-            next_value = scenarios[field_key][0].generate_next(self.field_values), scenarios[field_key][0]
+            scenario = scenarios[field_key][0]
+            if isinstance(scenario, ArithmeticScenario) and not scenario.fuzzing and scenario.invalid is None:
+                # Fuzzed values and replaced invalid values do not only depend on the referenced fields
+                name = field_name(protocol, field_key)
+                if scenario.get_value() is not None and not self.dependencies.is_dirty(name):
+                    # None of the referenced fields has changed, so the value is still up to date
+                    return scenario.get_value(), scenario
+                self.dependencies.clean(name)
+
+            next_value = scenario.generate_next(self.field_values), scenario
 
             __clean_scenarios(scenarios)
 
@@ -263,27 +519,35 @@ class Emulator:
 
             # Check if there is anything to be read at the input
             while self.input.has_data() != 0:
-                message = self.input.readline()
-                message = message.replace(b'\x00', b'')
+                data = self.input.read()
+                if len(data) == 0:
+                    break
+                self.__receive_input(data)
 
-                if len(message) > 0:
-                    self.logger.debug('New input received')
+    def __receive_input(self, data):
+        """
+        Split data read from the input into hex frames, and respond to all complete frames
+        :param data: data read from the input
+        :type data: bytes
+        """
+        self.logger.debug(f'New input received: {data}')
+        for frame in self.frame_splitter.feed(data):
+            self.hex_frames.put(frame)
 
-                    self.logger.debug(message)
-                    if message[0] == ord(':'):
-                        # Hex message
-                        self.__process_hex_message(message)
+        # Respond to the whole burst of frames at once
+        with self.lock:
+            while not self.hex_frames.empty():
+                self.__process_hex_message(self.hex_frames.get())
 
     def __generate_async_hex_messages(self):
         """
         Generate asynchronous hex messages on interval where necessary
         """
         # Send async hex messages
-        for field_key in self.__list_union_unique(self.hex_scenarios, self.overwritten_hex_scenarios):
-            field = self.overwritten_hex_scenarios[field_key] if field_key in self.overwritten_hex_scenarios else \
-                self.hex_scenarios[field_key]
-            if len(field) > 0:
-                scenario = field[0]
+        for register in self.registers:
+            field_key = register.key
+            scenario = register.scenario()
+            if scenario is not None:
                 # TODO make sure that the 'async_interval' functionality works well.
                 #   Currently, self.run_time MUST be a multiple of 'async_interval'!
                 #   This requirement is not really desirable, and can easily be violated
@@ -297,9 +561,7 @@ class Emulator:
                         self.__generate_next('hex', field_key)
                         hex_value = self.field_values.get_hex_field_value(field_key)
                     if hex_value is not None:
-                        hex_key = hex.int_to_hex_string(field_key, 2)
-                        self.__print_bytes(
-                            hex.create_message('A', hex_key + '00' + hex_value))
+                        self.__print_bytes(hex.build_frame(b'A', register.id + b'00' + hex_value.encode('ascii')))
 
     def __generate_text_messages(self):
         """
@@ -321,7 +583,8 @@ class Emulator:
 
         # Generate values for each field
         if not self.timed:
-            for field_key in self.__list_union_unique(self.text_scenarios, self.overwritten_text_scenarios):
+            # Referenced fields are generated before the Arithmetic fields that reference them
+            for field_key in self.text_order:
                 (value, _) = self.__generate_next('text', field_key)
                 if value is not None:
                     self.logger.debug(f'New emulation for {field_key}: {value}')
@@ -347,11 +610,10 @@ class Emulator:
         :type old_value: str
         """
         if value != old_value:
-            field = self.overwritten_hex_scenarios[
-                key] if key in self.overwritten_hex_scenarios else self.hex_scenarios.get(key, None)
-            if field is not None and field.async_change:
-                hex_key = hex.int_to_hex_string(key, 2)
-                self.__print_bytes(hex.create_message('A', hex_key + '00' + value))
+            register = self.registers.get(key)
+            scenario = register.scenario() if register is not None else None
+            if scenario is not None and scenario.async_change:
+                self.__print_bytes(hex.build_frame(b'A', register.id + b'00' + value.encode('ascii')))
 
     def __process_hex_message(self, message):
         """
@@ -360,100 +622,116 @@ class Emulator:
         :type message: bytes
         """
         # Filter out all non-hex characters
-        message = ''.join([c for c in message[1:].decode('ascii', 'ignore').strip().upper() if c in '0123456789ABCDEF'])
+        digits = hex.clean_frame(message)
 
-        self.logger.debug(f'New hex message received: {message}')
+        self.logger.debug(f'New hex message received: {digits}')
 
         # Check checksum
-        checksum_valid = hex.check_checksum(message)
-        if not checksum_valid:
-            self.__print_bytes(hex.create_message(4, 'AAAA'))
+        if not hex.frame_checksum_valid(digits):
+            self.__print_bytes(self.checksum_error_response)
             return
 
-        # Check command
-        command = message[0:1]
-        if command == '0':
-            # Enter boot
-            self.__print_bytes(hex.create_message(4, '0000'))  # Not supported in emulator
-
-        elif command == '1':
-            # Ping
-            version = hex.int_to_hex_string(self.config.get_firmware_version(), 2)
-            self.__print_bytes(hex.create_message(5, version))
-
-        elif command == '3':
-            # App version
-            version = hex.int_to_hex_string(self.config.get_firmware_version(), 2)
-            self.__print_bytes(hex.create_message(1, version))
-
-        elif command == '4':
-            # Product Id
-            id = hex.int_to_hex_string(self.config.get_product_id(), 2)
-            self.__print_bytes(hex.create_message(1, id))
-
-        elif command == '6':
-            # Restart
-            pass  # The device restarts without a response
-
-        elif command == '7':
-            # Get
-            id = message[3:5] + message[1:3]  # The id a uint16 saved in little endian format so switch around the bytes
-            hex_id = int(id, 16)
+        command = digits[:1]
+        handler = self.hex_handlers.get(command, self.__process_unknown_hex_command)
+        handler(command, digits)
+
+    def __send_fixed_hex_response(self, command, digits):
+        """
+        Respond to a hex command of which the response does not depend on the state of the emulator
+        :param command: command of the message
+        :type command: bytes
+        :param digits: hex digits of the message
+        :type digits: bytes
+        """
+        self.__print_bytes(self.fixed_hex_responses[command])
+
+    def __ignore_hex_message(self, command, digits):
+        """
+        Ignore a hex command. The device restarts without a response, and it does not seem to respond with an error
+        when sending an async message to it.
+        :param command: command of the message
+        :type command: bytes
+        :param digits: hex digits of the message
+        :type digits: bytes
+        """
+        pass
+
+    def __process_unknown_hex_command(self, command, digits):
+        """
+        Respond to an unknown hex command
+        :param command: command of the message
+        :type command: bytes
+        :param digits: hex digits of the message
+        :type digits: bytes
+        """
+        self.__print_bytes(hex.build_frame(b'3', b'0' + command + b'00'))
+
+    def __process_hex_get(self, command, digits):
+        """
+        Respond to a hex Get message with the value of the register
+        :param command: command of the message
+        :type command: bytes
+        :param digits: hex digits of the message
+        :type digits: bytes
+        """
+        register = self.registers.get_by_id(digits[1:5])
+        value = None
+        if register is not None:
             if self.timed:
-                (value, field) = (self.field_values[hex_id], self.get_field_scenarios(hex_id)[0])
+                value = self.field_values.get_hex_field_value(register.key)
             else:
-                (value, field) = self.__generate_next('hex', hex_id)
+                (value, field) = self.__generate_next('hex', register.key)
 
-            if value is not None:
-                self.__print_bytes(
-                    hex.create_message(7, message[1:5] + '00' + self.field_values.get_hex_field_value(hex_id)))
-            else:
-                # Send a flag that indicates that the field is not valid
-                self.__print_bytes(hex.create_message(7, message[1:5] + '01'))
-
-        elif command == '8':
-            # Set
-            id = message[3:5] + message[1:3]  # The id is saved in little endian format so switch around the bytes
-            hex_id = int(id, 16)
-
-            if hex_id in self.hex_scenarios or hex_id in self.overwritten_hex_scenarios:
-                field = self.overwritten_hex_scenarios[hex_id][0] if hex_id in self.overwritten_hex_scenarios else \
-                    self.hex_scenarios[hex_id][0]
-                id_writable = field.writable
-                if id_writable is True:
-                    value = message[7:-2]
-                    bits_size = field.bits
-                    if bits_size is not None:
-                        # Check if the new value is not longer than the field size
-                        value_valid = bits_size >= len(value) * 4  # 4 bits per hex character
-                    else:
-                        value_valid = True
-                    if value_valid:
-                        # Send the new value
-                        self.__print_bytes(hex.create_message(8, message[1:5] + '00' + value))
-                    else:
-                        # Send a flag that indicates that the field value is not valid
-                        if not self.timed:
-                            self.__generate_next('hex', hex_id)
-                        hex_value = self.field_values.get_hex_field_value(hex_id)
-                        self.__print_bytes(hex.create_message(8, message[1:5] + '04' + hex_value))
+        if value is not None:
+            value = self.field_values.get_hex_field_value(register.key)
+            version = self.field_values.get_hex_field_version(register.key)
+            self.__print_bytes(register.get_response(value, version))
+        else:
+            # Send a flag that indicates that the field is not valid
+            self.__print_bytes(hex.build_frame(b'7', digits[1:5] + b'01'))
+
+    def __process_hex_set(self, command, digits):
+        """
+        Respond to a hex Set message
+        :param command: command of the message
+        :type command: bytes
+        :param digits: hex digits of the message
+        :type digits: bytes
+        """
+        register = self.registers.get_by_id(digits[1:5])
+        field = register.scenario() if register is not None else None
+        if field is None:
+            # Send a flag that indicates that the field is not valid
+            self.__print_bytes(hex.build_frame(b'8', digits[1:5] + b'01'))
+            return
 
-                else:
-                    # Send a flag that indicates that the field is not writable
-                    if not self.timed:
-                        self.__generate_next('hex', hex_id)
-                    hex_value = self.field_values.get_hex_field_value(hex_id)
-                    self.__print_bytes(hex.create_message(8, message[1:5] + '02' + hex_value))
+        if field.writable is True:
+            value = digits[7:-2]
+            bits_size = field.bits
+            if bits_size is not None:
+                # Check if the new value is not longer than the field size
+                value_valid = bits_size >= len(value) * 4  # 4 bits per hex character
             else:
-                # Send a flag that indicates that the field is not valid
-                self.__print_bytes(hex.create_message(8, message[1:5] + '01'))
-
-        elif command == 'A':
-            # Async
-            pass  # The device does not seem to respond with an error when sending this command to a device, so we just ignore it here too
+                value_valid = True
+            if value_valid:
+                # Store the new value and send it back
+                stored = value.decode('ascii')
+                if bits_size is not None:
+                    stored = stored.ljust(math.ceil(bits_size / 8) * 2, '0')
+                self.register_store.write(register.key, stored)
+                self.__print_bytes(hex.build_frame(b'8', register.id + b'00' + value))
+                return
+            # Send a flag that indicates that the field value is not valid
+            flags = b'04'
         else:
-            # Unknown command
-            self.__print_bytes(hex.create_message(3, f'0{command}00'))
+            # Send a flag that indicates that the field is not writable
+            flags = b'02'
+
+        if not self.timed:
+            self.__generate_next('hex', register.key)
+        hex_value = self.field_values.get_hex_field_value(register.key)
+        version = self.field_values.get_hex_field_version(register.key)
+        self.__print_bytes(register.set_rejected_response(flags, hex_value, version))
 
     def overwrite_text_scenarios(self, field, scenarios):
         """
@@ -470,6 +748,7 @@ class Emulator:
             for scenario in scenarios:
                 scenario.set_field_props(self.text_scenarios[field][0].get_field_props())
         self.overwritten_text_scenarios[field] = scenarios
+        self.__update_dependencies()
         self.observable.trigger('overwrite_generators', field)
 
     def overwrite_hex_scenarios(self, field, scenarios):
@@ -487,8 +766,33 @@ class Emulator:
             for scenario in scenarios:
                 scenario.set_field_props(self.hex_scenarios[field][0].get_field_props())
         self.overwritten_hex_scenarios[field] = scenarios
+        self.registers.add(field, scenarios, self.hex_scenarios.get(field, []))
+        self.__update_dependencies()
         self.observable.trigger('overwrite_hex_scenarios', field)
 
+    def __update_dependencies(self):
+        """
+        Build the dependency graph of the fields, and the order in which the text fields are generated
+        :exception DependencyException if fields reference each other
+        """
+        text_fields = {key: [self.overwritten_text_scenarios.get(key, []), self.text_scenarios.get(key, [])]
+                       for key in self.__list_union_unique(self.text_scenarios, self.overwritten_text_scenarios)}
+        hex_fields = {key: [self.overwritten_hex_scenarios.get(key, []), self.hex_scenarios.get(key, [])]
+                      for key in self.__list_union_unique(self.hex_scenarios, self.overwritten_hex_scenarios)}
+        self.dependencies = DependencyGraph.from_scenarios(text_fields, hex_fields)
+        self.text_order = [name for name in self.dependencies.order if name in text_fields]
+
+    def __field_value_changed(self, key, value, old_value):
+        """
+        Mark the Arithmetic fields that reference a field as dirty when its value changes
+        :param key: field key, or the name of a hex field
+        :type key: str
+        :param value: current value
+        :param old_value: old value
+        """
+        if value != old_value:
+            self.dependencies.changed(key)
+
     def __list_union_unique(self, *lists):
         """
         Combine multiple lists and remove duplicates while keeping list item order
@@ -6,9 +6,15 @@ class FieldValueList:
     List of field values
     """
 
-    field_values = dict()  # key is the normal field key
-    hex_formatted_field_values = dict()  # key is the normal hex field key. no special formatting.
-    observable = Observable()
+    def __init__(self):
+        """
+        Create an empty list of field values
+        """
+        self.field_values = dict()  # key is the normal field key
+        self.hex_formatted_field_values = dict()  # key is the normal hex field key. no special formatting.
+        self.hex_field_versions = dict()  # key is the normal hex field key, value is the amount of values put
+        self.register_store = None  # RegisterStore with written values that take precedence over put values
+        self.observable = Observable()
 
     def put_field_value(self, key, value):
         """
@@ -30,8 +36,12 @@ class FieldValueList:
         :param formatted_hex_value: the hex string formatted value of the field
         :type formatted_hex_value: str
         """
+        if self.register_store is not None and self.register_store.holds(key):
+            # A value written using a hex Set takes precedence
+            return
         old_value = self.hex_formatted_field_values.get(key, None)
         self.hex_formatted_field_values[key] = formatted_hex_value
+        self.hex_field_versions[key] = self.hex_field_versions.get(key, 0) + 1
         self.observable.trigger('update_hex_field_value', key, formatted_hex_value, old_value)
 
     def get_field_value(self, key):
@@ -42,6 +52,7 @@ class FieldValueList:
         :return: value of the field
         :rtype: str or int
         """
+        self.observable.trigger('get_field_value', key)
         return self.field_values.get(key, None)
 
     def get_hex_field_value(self, key):
@@ -52,8 +63,19 @@ class FieldValueList:
         :return: the hex string formatted value of the field
         :rtype: str
         """
+        self.observable.trigger('get_hex_field_value', key)
         return self.hex_formatted_field_values.get(key, None)
 
+    def get_hex_field_version(self, key):
+        """
+        Get the version of the value of a hex field, which increments every time a value is put
+        :param key: key of the field
+        :type key: int
+        :return: the version, 0 if no value has been put yet
+        :rtype: int
+        """
+        return self.hex_field_versions.get(key, 0)
+
     def get_field_values(self):
         """
         Get all the text field values
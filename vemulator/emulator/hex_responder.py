@@ -0,0 +1,64 @@
+import selectors
+from threading import Thread, Event
+
+from ..util.log import init_logger
+
+
+class HexResponder(Thread):
+    """
+    A thread that reads an input as soon as data arrives on it, such that incoming hex messages are answered within
+    milliseconds instead of once per text message. The input has to have a file descriptor, see InputInterface.fileno().
+    All data that is available is read at once, so a burst of hex messages is passed to the callback in one go.
+    """
+    logger = None
+    stop_interval = 0.1  # Maximum time in seconds before the thread notices that it has been stopped
+
+    def __init__(self, input, callback):
+        """
+        Create a hex responder
+        :param input: input to read from
+        :type input: input.inputinterface.InputInterface
+        :param callback: function that processes the data read from the input
+        :type callback: callable
+        """
+        super().__init__(daemon=True)
+        self.logger = init_logger(__name__)
+        self.input = input
+        self.callback = callback
+        self.stopped = Event()
+
+    def stop(self):
+        """
+        Stop the responder. Data that has not been read yet is not processed anymore.
+        """
+        self.stopped.set()
+
+    def run(self):
+        """
+        Wait until the input is readable and process all data that is available
+        """
+        with selectors.DefaultSelector() as selector:
+            try:
+                selector.register(self.input.fileno(), selectors.EVENT_READ)
+            except (OSError, ValueError):
+                self.logger.debug('Input has been closed')
+                return
+
+            while not self.stopped.is_set():
+                try:
+                    events = selector.select(self.stop_interval)
+                except (OSError, ValueError):
+                    self.logger.debug('Input has been closed')
+                    return
+                if len(events) == 0 or self.stopped.is_set():
+                    continue
+
+                data = self.input.read()
+                if len(data) == 0:
+                    # End of the input, it will never contain any new data
+                    self.logger.debug('Input has been closed')
+                    return
+                try:
+                    self.callback(data)
+                except Exception as e:
+                    self.logger.error(f'Could not process input {data}: {e}')
@@ -0,0 +1,171 @@
+import datetime
+import mmap
+import os
+import struct
+
+from ..util.log import init_logger
+
+RECORD = struct.Struct('<BHdB')  # In use, hex id, expiry as timestamp (0 if the value does not expire), value length
+RECORD_SIZE = 128
+VALUE_SIZE = RECORD_SIZE - RECORD.size  # Maximum amount of hex digits of a persisted value
+
+
+class RegisterStore:
+    """
+    Values that have been written to hex registers using a hex Set.
+    A written value takes precedence over the values generated by the scenarios of the register, until the hold time
+    has passed or another value is written to the register.
+
+    The values can be persisted in a memory mapped file, such that they survive a restart of the emulator. The file
+    consists of a fixed amount of records, one for every register that has been written to.
+
+    Example:
+    store = RegisterStore(field_values, Clock(), hold_time=60, path='registers.bin')
+    store.write(0xEDF0, '0A00')
+    """
+    capacity = 256  # Maximum amount of registers that can be persisted
+
+    def __init__(self, field_values, clock, hold_time=None, path=None):
+        """
+        Create a register store for the field values of an emulator
+        :param field_values: field values in which the written values are put
+        :type field_values: emulator.field_values.FieldValueList
+        :param clock: clock that determines when the hold time has passed
+        :type clock: util.clock.Clock
+        :param hold_time: time in seconds that a written value takes precedence over generated values; None to hold
+        the value until another value is written
+        :type hold_time: float or None
+        :param path: path to the file to persist the values in; None to not persist the values
+        :type path: str or None
+        """
+        self.logger = init_logger(__name__)
+        self.field_values = field_values
+        self.clock = clock
+        self.hold_time = hold_time
+        self.values = dict()  # key is the hex id, value is the hex value and the time at which it expires (or None)
+        self.slots = dict()  # key is the hex id, value is the index of its record in the file
+        self.file = None
+        self.map = None
+        field_values.register_store = self
+        if path is not None:
+            self.__open(path)
+
+    def write(self, key, value):
+        """
+        Write a value to a register
+        :param key: hex id of the register
+        :type key: int
+        :param value: hex value, as sent in a hex Set
+        :type value: str
+        """
+        expires_at = None
+        if self.hold_time is not None:
+            expires_at = self.clock.now() + datetime.timedelta(seconds=self.hold_time)
+        # Release the register first, such that the written value is put in the field values
+        self.values.pop(key, None)
+        self.field_values.put_hex_field_value(key, value)
+        self.values[key] = (value, expires_at)
+        if self.map is not None:
+            self.__persist(key, value, expires_at)
+
+    def holds(self, key):
+        """
+        Check if a written value of a register takes precedence over generated values
+        :param key: hex id of the register
+        :type key: int
+        :return: true if the register holds a written value, false otherwise
+        :rtype: bool
+        """
+        held = self.values.get(key, None)
+        if held is None:
+            return False
+        if held[1] is not None and held[1] <= self.clock.now():
+            self.release(key)
+            return False
+        return True
+
+    def get(self, key):
+        """
+        Get the written value of a register
+        :param key: hex id of the register
+        :type key: int
+        :return: the hex value, or None if the register does not hold a written value
+        :rtype: str or None
+        """
+        return self.values[key][0] if self.holds(key) else None
+
+    def release(self, key):
+        """
+        Release a register, such that its scenarios determine its value again
+        :param key: hex id of the register
+        :type key: int
+        """
+        self.values.pop(key, None)
+        if self.map is not None and key in self.slots:
+            offset = self.slots[key] * RECORD_SIZE
+            self.map[offset:offset + RECORD.size] = RECORD.pack(0, key, 0.0, 0)
+
+    def close(self):
+        """
+        Write the persisted values to the file and close it
+        """
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.file.close()
+            self.map = None
+            self.file = None
+
+    def __open(self, path):
+        """
+        Open the file to persist the values in, and restore the values that have not expired yet
+        :param path: path to the file
+        :type path: str
+        """
+        size = self.capacity * RECORD_SIZE
+        self.file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        if os.fstat(self.file.fileno()).st_size < size:
+            self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), size)
+
+        now = self.clock.now()
+        for slot in range(self.capacity):
+            offset = slot * RECORD_SIZE
+            used, key, timestamp, length = RECORD.unpack_from(self.map, offset)
+            if not used:
+                continue
+            self.slots[key] = slot
+            expires_at = datetime.datetime.fromtimestamp(timestamp) if timestamp > 0 else None
+            if expires_at is not None and expires_at <= now:
+                self.release(key)
+                continue
+            value = bytes(self.map[offset + RECORD.size:offset + RECORD.size + length]).decode('ascii')
+            self.field_values.put_hex_field_value(key, value)
+            self.values[key] = (value, expires_at)
+
+    def __persist(self, key, value, expires_at):
+        """
+        Write the value of a register to its record in the file
+        :param key: hex id of the register
+        :type key: int
+        :param value: hex value
+        :type value: str
+        :param expires_at: point in time at which the value expires, None if it does not expire
+        :type expires_at: datetime.datetime or None
+        """
+        if len(value) > VALUE_SIZE:
+            self.logger.warning(f'Value of register {key:#06x} is too long to persist')
+            return
+        if key not in self.slots:
+            if len(self.slots) >= self.capacity:
+                self.logger.warning(f'Register file is full, value of register {key:#06x} is not persisted')
+                return
+            used = set(self.slots.values())
+            self.slots[key] = next(slot for slot in range(self.capacity) if slot not in used)
+
+        offset = self.slots[key] * RECORD_SIZE
+        timestamp = expires_at.timestamp() if expires_at is not None else 0.0
+        encoded = value.encode('ascii')
+        self.map[offset + RECORD.size:offset + RECORD.size + len(encoded)] = encoded
+        # Write the header last, such that a record is only in use once its value is complete
+        self.map[offset:offset + RECORD.size] = RECORD.pack(1, key, timestamp, len(encoded))
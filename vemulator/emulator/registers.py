@@ -0,0 +1,145 @@
+from ..util import hex
+
+
+class Register:
+    """
+    A hex register of the emulated device, which refers to the scenarios that generate its value.
+    The id of the register is encoded once, in the little endian format used in hex frames.
+
+    The encoded responses to Get messages, and to Set messages that are rejected, are cached together with the version
+    of the field value they contain, such that polling an unchanged register does not encode the response again.
+    For registers of which all scenarios only generate a few known values, the Get responses of all these values are
+    encoded when the register is created.
+    """
+    precompute_limit = 256  # Maximum amount of Get responses that are encoded in advance
+
+    def __init__(self, key, scenario_lists):
+        """
+        Create a register
+        :param key: hex id of the register
+        :type key: int
+        :param scenario_lists: lists of scenarios of the register in order of precedence, i.e. the overwritten scenarios
+        before the scenarios of the config. The lists are shared with the emulator, so they may be consumed by it.
+        :type scenario_lists: list
+        """
+        self.key = key
+        self.id = hex.int_to_hex_bytes(key, 2)  # Hex digits of the id as sent in a frame
+        self.scenario_lists = scenario_lists
+        self.get_cache = (None, None)  # version of the field value and the encoded Get response
+        self.set_cache = dict()  # key is the flags of a rejected Set, value is the version and the encoded response
+        self.get_responses = self.__precompute()  # key is a hex value, value is the encoded Get response
+
+    def scenario(self):
+        """
+        Get the scenario that defines the properties of the register, such as whether it is writable
+        :return: the current scenario, or None if the register has no scenarios left
+        :rtype: scenarios.scenario.Scenario or None
+        """
+        for scenarios in self.scenario_lists:
+            if len(scenarios) > 0:
+                return scenarios[0]
+        return None
+
+    def get_response(self, value, version):
+        """
+        Get the encoded response to a Get message
+        :param value: hex value of the field
+        :type value: str
+        :param version: version of the value of the field, see FieldValueList.get_hex_field_version()
+        :type version: int
+        :return: the response
+        :rtype: bytes
+        """
+        cached_version, response = self.get_cache
+        if cached_version != version:
+            response = self.get_responses.get(value, None)
+            if response is None:
+                response = hex.build_frame(b'7', self.id + b'00' + value.encode('ascii'))
+            self.get_cache = (version, response)
+        return response
+
+    def set_rejected_response(self, flags, value, version):
+        """
+        Get the encoded response to a Set message that is rejected
+        :param flags: flags of the response that indicate why the Set is rejected
+        :type flags: bytes
+        :param value: hex value of the field
+        :type value: str
+        :param version: version of the value of the field, see FieldValueList.get_hex_field_version()
+        :type version: int
+        :return: the response
+        :rtype: bytes
+        """
+        cached_version, response = self.set_cache.get(flags, (None, None))
+        if cached_version != version:
+            response = hex.build_frame(b'8', self.id + flags + value.encode('ascii'))
+            self.set_cache[flags] = (version, response)
+        return response
+
+    def __precompute(self):
+        """
+        Encode the Get responses of all values the scenarios of the register can generate
+        :return: dict with the encoded response of every hex value, empty if the values are not known in advance
+        :rtype: dict
+        """
+        values = set()
+        for scenarios in self.scenario_lists:
+            for scenario in scenarios:
+                domain = scenario.get_hex_domain()
+                if domain is None:
+                    return dict()
+                values.update(domain)
+        if len(values) > self.precompute_limit:
+            return dict()
+        return {value: hex.build_frame(b'7', self.id + b'00' + value.encode('ascii')) for value in values}
+
+
+class RegisterIndex:
+    """
+    Index of the hex registers of an emulator, by hex id and by the hex digits of the id in a frame
+    """
+
+    def __init__(self):
+        self.registers = dict()  # key is the hex id of the register
+        self.ids = dict()  # key is the hex digits of the id, in upper case
+
+    def add(self, key, *scenario_lists):
+        """
+        Add a register to the index, or replace it if it already exists
+        :param key: hex id of the register
+        :type key: int
+        :param scenario_lists: lists of scenarios of the register in order of precedence
+        :type scenario_lists: list
+        :return: the register
+        :rtype: Register
+        """
+        register = Register(key, list(scenario_lists))
+        self.registers[key] = register
+        self.ids[register.id] = register
+        return register
+
+    def get(self, key):
+        """
+        Get a register by its hex id
+        :param key: hex id of the register
+        :type key: int
+        :return: the register, or None if it does not exist
+        :rtype: Register or None
+        """
+        return self.registers.get(key, None)
+
+    def get_by_id(self, id):
+        """
+        Get a register by the hex digits of its id in a frame
+        :param id: hex digits of the id, in upper case and little endian
+        :type id: bytes
+        :return: the register, or None if it does not exist
+        :rtype: Register or None
+        """
+        return self.ids.get(id, None)
+
+    def __iter__(self):
+        return iter(self.registers.values())
+
+    def __len__(self):
+        return len(self.registers)
@@ -1,26 +1,66 @@
-import datetime
 from threading import Timer
 
+from vemulator.util.clock import Clock
 
-class Event(Timer):
+
+class Event:
     """
     A class that represents an event which causes a task to execute at a defined length of time in the future.
     Events are stored in the EventQueue.
+    Depending on the event engine, an event is either executed by a shared Scheduler or by its own threading.Timer.
     """
-    task = None
+    task = None  # ScheduledTask when using a scheduler
+    timer = None  # Timer when not using a scheduler
 
-    def __init__(self, deadline=datetime.datetime.now()):
+    def __init__(self, deadline=None, scheduler=None, clock=None):
         """
         Create an Event which will try to execute a function as soon as possible after a specified deadline has passed.
-        :param deadline: a point in time until which the event has to wait with execution
+        :param deadline: a point in time until which the event has to wait with execution; now by default
+        :type deadline: datetime.datetime
+        :param scheduler: scheduler that executes the event; if None, a separate Timer thread is started for this event
+        :type scheduler: vemulator.events.scheduler.Scheduler
+        :param clock: clock that determines when the deadline has passed; real time by default
+        :type clock: vemulator.util.clock.Clock
+        """
+        self.clock = clock if clock is not None else Clock()
+        if deadline is None:
+            deadline = self.clock.now()
+        self.deadline = deadline
+        self.scheduler = scheduler
+        self.__start()
+
+    def __start(self):
+        """
+        Start waiting for the deadline of this event
+        """
+        if self.scheduler is not None:
+            self.task = self.scheduler.schedule(self.deadline, self._function)
+        else:
+            delay = (self.deadline - self.clock.now()).total_seconds()
+            # delay can be negative, but that means that this event is created too late.
+            # a Timer with a negative delay simply executes as soon as possible.
+            self.timer = Timer(self.clock.real_seconds(delay), self._function)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def cancel(self):
+        """
+        Cancel the event, such that it will not be executed. Cancelling an executed event has no effect.
+        """
+        if self.scheduler is not None:
+            self.scheduler.cancel(self.task)
+        elif self.timer is not None:
+            self.timer.cancel()
+
+    def reschedule(self, deadline):
+        """
+        Cancel the event and wait for a new deadline instead
+        :param deadline: the new deadline of the event
         :type deadline: datetime.datetime
         """
-        delay = (deadline - datetime.datetime.now()).total_seconds()
-        # delay can be negative, but that means that this event is created too late.
-        # a Timer with a negative delay simply executes as soon as possible.
-        super().__init__(delay, self._function)
+        self.cancel()
         self.deadline = deadline
-        self.start()
+        self.__start()
 
     def _function(self):
         """
@@ -1,44 +1,80 @@
-import datetime
-from threading import Thread, RLock
+from threading import RLock
 
 from vemulator.events.field_event import FieldEvent
+from vemulator.events.scheduler import Scheduler
 from vemulator.util.log import init_logger
 
 
-class EventQueue(Thread):
+class EventQueue:
     """
     A class that represents a time based event queue.
     An EventQueue is typically bound to an Emulator for which it will create and start events that will
     asynchronously generate and update values for the fields/generators present in the Emulator.
     """
-    events = {}
-    lock = RLock()
     logger = None
 
-    def __init__(self, emulator):
+    def __init__(self, emulator, engine='scheduler', scheduler=None):
         """
         Create an event queue that is tied to a specific emulator.
         :param emulator: The emulator used to launch the first few events.
         :type emulator: Emulator
+        :param engine: 'scheduler' (default) to execute all events on a single scheduler thread, or 'timer' to start
+        a separate threading.Timer for every event. When the emulator uses a virtual clock, the scheduler is always used.
+        :type engine: str
+        :param scheduler: scheduler shared with other event queues, which executes the events regardless of the engine.
+        A shared scheduler is not started or stopped by the event queue. By default, the queue creates its own scheduler.
+        :type scheduler: Scheduler
         """
-        super().__init__()
         self.emulator = emulator
-        self.emulator.observable.on('overwrite_generators', self.refresh_event)
-        self.emulator.observable.on('overwrite_hex_generators', self.refresh_event)
+        self.events = {}
+        self.lock = RLock()
+        self.clock = emulator.clock
         self.logger = init_logger(__name__)
+        if engine == 'timer' and self.clock.is_virtual():
+            self.logger.warning('The timer event engine can not be used with a virtual clock, using the scheduler instead')
+            engine = 'scheduler'
+        self.shared_scheduler = scheduler is not None
+        if scheduler is not None:
+            self.scheduler = scheduler
+        else:
+            self.scheduler = Scheduler(self.clock) if engine == 'scheduler' else None
+        self.emulator.observable.on('overwrite_generators', self.refresh_event)
+        self.emulator.observable.on('overwrite_hex_scenarios', self.refresh_event)
         self.generate_first_values()  # generate a first value for every key in the emulator
 
-    def run(self):
+    def start(self):
         """
         Start event queue by adding one event for all generators.
         """
         self.logger.debug(f'running event_queue')
+        if self.shared_scheduler:
+            pass  # The owner of the scheduler takes care of running it
+        elif self.scheduler is not None and self.clock.is_virtual():
+            # The virtual clock executes the events while it advances
+            self.clock.attach(self.scheduler)
+        elif self.scheduler is not None:
+            self.scheduler.start()
         with self.lock:
             for k in self.emulator.get_scenario_keys():
                 event = self.new_field_event(k)
                 self.add_event(k, event)
                 self.emulator.logger.debug(f'adding event {event}')
 
+    def stop(self):
+        """
+        Cancel all events in the event queue, such that no more values are generated
+        """
+        with self.lock:
+            for event in self.events.values():
+                event.cancel()
+            self.events.clear()
+        if self.shared_scheduler:
+            pass
+        elif self.scheduler is not None and self.clock.is_virtual():
+            self.clock.detach(self.scheduler)
+        elif self.scheduler is not None:
+            self.scheduler.stop()
+
     def add_event(self, key, event):
         """
         Add an event to the event queue
@@ -63,7 +99,7 @@ class EventQueue(Thread):
         """
         if event is not None:
             with self.lock:
-                current_event = self.events.get(self, key)
+                current_event = self.events.get(key, None)
                 if current_event == event:
                     self.events.pop(key).cancel()
 
@@ -76,7 +112,7 @@ class EventQueue(Thread):
         :type key: str or int
         """
         with self.lock:
-            event = self.events.get(key, None)
+            event = self.events.pop(key, None)
             if event is not None:
                 event.cancel()
             new_event = self.new_field_event(key)
@@ -92,8 +128,8 @@ class EventQueue(Thread):
         :rtype: ScenarioEvent
         """
         generator = self.emulator.get_field_scenarios(field_key)
-        if generator is not None:
-            return FieldEvent(field=generator, base_time=datetime.datetime.now(),
+        if generator is not None and len(generator) > 0:
+            return FieldEvent(field=generator, base_time=self.clock.now(),
                               event_queue=self, field_key=field_key)
         else:
             return
@@ -104,4 +140,5 @@ class EventQueue(Thread):
         """
         for k in self.emulator.get_scenario_keys():
             scenarios = self.emulator.get_field_scenarios(k)
-            scenarios[0].generate_next(self.emulator.get_field_values())
+            if len(scenarios) > 0:
+                scenarios[0].generate_next(self.emulator.field_values)
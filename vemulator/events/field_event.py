@@ -16,13 +16,12 @@ class FieldEvent(IntervalEvent):
         :param field_key: field key from the emulator with which this field event and its corresponding field can identified.
         """
         self.scenario = field[0]
+        self.field = field
         super().__init__(
             interval=self.scenario.interval,
             base_time=base_time,
             event_queue=event_queue,
             key=field_key)
-        self.field = field
-        self.event_queue = event_queue
 
     def _function(self):
         """
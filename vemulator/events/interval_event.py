@@ -18,10 +18,11 @@ class IntervalEvent(Event):
         :param event_queue: event queue of which this event will be a part.
         :param key: key from the event queue with which this event can be identified
         """
-        super().__init__(deadline=base_time + datetime.timedelta(seconds=interval))
         self.interval = interval  # seconds
         self.event_queue = event_queue
         self.key = key
+        super().__init__(deadline=base_time + datetime.timedelta(seconds=interval), scheduler=event_queue.scheduler,
+                         clock=event_queue.clock)
 
     def _function(self):
         """
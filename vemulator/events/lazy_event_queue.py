@@ -0,0 +1,110 @@
+import datetime
+from threading import RLock
+
+from vemulator.util.log import init_logger
+
+
+class LazyEventQueue:
+    """
+    A time based event queue that does not use any threads.
+    Instead of generating values for every field on its interval, the queue records when each field last generated a
+    value. As soon as the value of a field is read from the FieldValueList, the queue determines how many intervals
+    have passed since then and generates the values for those intervals in one batch, such that the field catches up
+    with its scenarios. Fields without an interval generate one value every time they are read. Fields that are never
+    read never generate any values.
+    Note that Arithmetic fields are calculated using the values of the referenced fields at the moment they catch up.
+    """
+    logger = None
+
+    def __init__(self, emulator):
+        """
+        Create a lazy event queue that is tied to a specific emulator.
+        :param emulator: The emulator whose fields are generated by this queue.
+        :type emulator: Emulator
+        """
+        self.emulator = emulator
+        self.lock = RLock()
+        self.generated_at = {}  # key is the field key, value is the deadline of the last generated value
+        self.emulator.observable.on('overwrite_generators', self.refresh_event)
+        self.emulator.observable.on('overwrite_hex_scenarios', self.refresh_event)
+        self.logger = init_logger(__name__)
+        self.generate_first_values()  # generate a first value for every key in the emulator
+
+    def start(self):
+        """
+        Start the queue. From this moment on, values are generated when fields are read.
+        """
+        self.logger.debug(f'starting lazy event_queue')
+        with self.lock:
+            now = self.emulator.clock.now()
+            for k in self.emulator.get_scenario_keys():
+                self.generated_at[k] = now
+        self.emulator.field_values.observable.on('get_field_value', self.catch_up)
+        self.emulator.field_values.observable.on('get_hex_field_value', self.catch_up)
+
+    def stop(self):
+        """
+        Stop the queue, such that no more values are generated
+        """
+        with self.lock:
+            self.generated_at.clear()
+        observable = self.emulator.field_values.observable
+        for event in ['get_field_value', 'get_hex_field_value']:
+            if observable.is_registered(event, self.catch_up):
+                observable.off(event, self.catch_up)
+
+    def refresh_event(self, key):
+        """
+        Refresh a field when its scenarios are overwritten in the emulator.
+        The interval of the new scenarios starts at the moment they are overwritten.
+        :param key: the field_key for which to refresh the event
+        :type key: str or int
+        """
+        with self.lock:
+            self.generated_at[key] = self.emulator.clock.now()
+
+    def catch_up(self, key):
+        """
+        Generate all the values of a field for the intervals that have passed since its last generated value
+        :param key: the field key to catch up
+        :type key: str or int
+        """
+        with self.lock:
+            generated_at = self.generated_at.get(key, None)
+            if generated_at is None:
+                return
+
+            scenarios = self.emulator.get_field_scenarios(key)
+            now = self.emulator.clock.now()
+            while scenarios is not None and len(scenarios) > 0:
+                scenario = scenarios[0]
+                if scenario.is_complete():
+                    scenarios.pop(0)
+                    continue
+                if scenario.interval <= 0:
+                    # Without an interval, one value is generated every time the field is read
+                    scenario.generate_batch(1, self.emulator.field_values)
+                    generated_at = now
+                    break
+
+                interval = datetime.timedelta(seconds=scenario.interval)
+                passed = int((now - generated_at) / interval)
+                if scenario.amount is not None:
+                    passed = min(passed, scenario.amount)
+                if passed <= 0:
+                    break
+                # Generate the values of all passed intervals at once
+                generated = len(scenario.generate_batch(passed, self.emulator.field_values))
+                generated_at += generated * interval
+                if not scenario.is_complete():
+                    break
+            self.generated_at[key] = generated_at
+
+    def generate_first_values(self):
+        """
+        Generate the first value for every key in the emulator.
+        """
+        for k in self.emulator.get_scenario_keys():
+            scenarios = self.emulator.get_field_scenarios(k)
+            if len(scenarios) > 0:
+                scenarios[0].generate_next(self.emulator.field_values)
@@ -0,0 +1,188 @@
+import heapq
+import itertools
+from threading import Thread, Condition
+
+from vemulator.util.clock import Clock
+from vemulator.util.log import init_logger
+
+
+class ScheduledTask:
+    """
+    A function that is scheduled to be executed by a Scheduler as soon as possible after its deadline has passed.
+    """
+    __slots__ = ('deadline', 'function', 'sequence', 'cancelled')
+
+    def __init__(self, deadline, function, sequence):
+        """
+        Create a ScheduledTask
+        :param deadline: point in time after which the task should be executed
+        :type deadline: datetime.datetime
+        :param function: function to execute
+        :type function: callable
+        :param sequence: sequence number, used to execute tasks with an equal deadline in the order they were scheduled
+        :type sequence: int
+        """
+        self.deadline = deadline
+        self.function = function
+        self.sequence = sequence
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.deadline, self.sequence) < (other.deadline, other.sequence)
+
+
+class Scheduler(Thread):
+    """
+    A single thread that executes scheduled tasks in order of their deadline.
+    Tasks are kept in a heap sorted on their deadline, such that any number of events can be handled without creating
+    a thread per event. Cancelled tasks are not removed from the heap directly, but are skipped once they reach the top.
+    When using a virtual clock, the scheduler thread is not started. Instead, the clock executes due tasks using
+    run_due() while it advances.
+    """
+    logger = None
+
+    def __init__(self, clock=None):
+        """
+        Create a scheduler. The scheduler only starts executing tasks after start() has been called.
+        :param clock: clock that determines when deadlines have passed; real time by default
+        :type clock: vemulator.util.clock.Clock
+        """
+        super().__init__(daemon=True)
+        self.logger = init_logger(__name__)
+        self.clock = clock if clock is not None else Clock()
+        self.condition = Condition()
+        self.tasks = []  # heap of ScheduledTask
+        self.sequence = itertools.count()
+        self.stopped = False
+
+    def schedule(self, deadline, function):
+        """
+        Schedule a function to be executed after a deadline has passed
+        :param deadline: point in time after which the function should be executed
+        :type deadline: datetime.datetime
+        :param function: function to execute, without any arguments
+        :type function: callable
+        :return: the scheduled task, which can be used to cancel or reschedule the function
+        :rtype: ScheduledTask
+        """
+        task = ScheduledTask(deadline, function, next(self.sequence))
+        with self.condition:
+            heapq.heappush(self.tasks, task)
+            if self.tasks[0] is task:
+                # The new task is due earlier than the task the scheduler is currently waiting for
+                self.condition.notify()
+        return task
+
+    def cancel(self, task):
+        """
+        Cancel a scheduled task. Cancelling a task that has already been executed has no effect.
+        :param task: task to cancel
+        :type task: ScheduledTask
+        """
+        if task is not None:
+            task.cancelled = True
+
+    def reschedule(self, task, deadline):
+        """
+        Cancel a scheduled task and schedule its function again with a new deadline
+        :param task: task to reschedule
+        :type task: ScheduledTask
+        :param deadline: new deadline of the task
+        :type deadline: datetime.datetime
+        :return: the newly scheduled task
+        :rtype: ScheduledTask
+        """
+        self.cancel(task)
+        return self.schedule(deadline, task.function)
+
+    def pending(self):
+        """
+        Get the amount of tasks that still have to be executed
+        :return: amount of pending tasks
+        :rtype: int
+        """
+        with self.condition:
+            return len([task for task in self.tasks if not task.cancelled])
+
+    def next_deadline(self):
+        """
+        Get the deadline of the first task that still has to be executed
+        :return: deadline of the first task, or None if there are no pending tasks
+        :rtype: datetime.datetime or None
+        """
+        with self.condition:
+            self.__drop_cancelled()
+            return self.tasks[0].deadline if len(self.tasks) > 0 else None
+
+    def run_due(self, now):
+        """
+        Execute all tasks whose deadline has passed on the calling thread, including tasks that become due while
+        executing them.
+        :param now: the current time
+        :type now: datetime.datetime
+        """
+        while True:
+            with self.condition:
+                self.__drop_cancelled()
+                if len(self.tasks) == 0 or self.tasks[0].deadline > now:
+                    return
+                task = heapq.heappop(self.tasks)
+            self.__execute(task)
+
+    def stop(self):
+        """
+        Stop the scheduler. Any pending tasks will not be executed.
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+    def run(self):
+        """
+        Execute tasks as soon as their deadline has passed, until the scheduler is stopped
+        """
+        while True:
+            task = self.__next_due_task()
+            if task is None:
+                return
+            self.__execute(task)
+
+    def __execute(self, task):
+        """
+        Execute a task, logging any exceptions it raises
+        :param task: task to execute
+        :type task: ScheduledTask
+        """
+        try:
+            task.function()
+        except Exception as e:
+            self.logger.error(f'Scheduled task {task.function} raised an exception: {e}')
+
+    def __drop_cancelled(self):
+        """
+        Remove cancelled tasks from the top of the heap. The lock of the condition must be held.
+        """
+        while len(self.tasks) > 0 and self.tasks[0].cancelled:
+            heapq.heappop(self.tasks)
+
+    def __next_due_task(self):
+        """
+        Wait until the first task in the heap is due and remove it from the heap
+        :return: the due task, or None if the scheduler has been stopped
+        :rtype: ScheduledTask or None
+        """
+        with self.condition:
+            while not self.stopped:
+                self.__drop_cancelled()
+                if len(self.tasks) == 0:
+                    self.condition.wait()
+                    continue
+
+                delay = (self.tasks[0].deadline - self.clock.now()).total_seconds()
+                if delay > 0:
+                    # Wait for the deadline, or until an earlier task is scheduled
+                    self.clock.wait(self.condition, delay)
+                    continue
+
+                return heapq.heappop(self.tasks)
+            return None
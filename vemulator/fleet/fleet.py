@@ -0,0 +1,205 @@
+import datetime
+import time
+from functools import partial
+from threading import Event, RLock
+
+from ..emulator.emulator import Emulator
+from ..events.scheduler import Scheduler
+from ..util.clock import Clock
+from ..util.log import init_logger
+
+
+class Fleet:
+    """
+    A fleet of emulators that all run in a single process.
+    Instead of running every emulator in its own loop, the ticks of all emulators and the events of emulators in timed
+    mode are executed by a single shared scheduler, in order of their deadline. Every emulator has its own config,
+    field values and output.
+
+    Example:
+    fleet = Fleet()
+    for i in range(100):
+        config = EmulatorConfig()
+        config.set_config_file('configs/mppt_text.yaml')
+        config.set_default_seed(i)
+        config.create_scenarios()
+        fleet.add_emulator(f'mppt{i}', config, FileOutput(f'mppt{i}.txt'))
+    fleet.run()
+    print(fleet.get_report())
+    """
+    pause_interval = 0.1  # Time in seconds between checks whether a paused emulator has been resumed
+
+    def __init__(self, clock=None):
+        """
+        Create an empty fleet
+        :param clock: clock that is shared by all emulators in the fleet; real time by default
+        :type clock: util.clock.Clock
+        """
+        self.logger = init_logger(__name__)
+        self.clock = clock if clock is not None else Clock()
+        self.scheduler = Scheduler(self.clock)
+        self.emulators = dict()  # key is the name of the emulator
+        self.tasks = dict()  # key is the name of the emulator, value is the scheduled task of its next tick
+        self.lock = RLock()
+        self.finished = Event()
+        self.started_at = None
+        self.finished_at = None
+
+    def add_emulator(self, name, config, output=None):
+        """
+        Add an emulator to the fleet. Emulators can only be added before the fleet is run.
+        :param name: unique name of the emulator
+        :type name: str
+        :param config: config of the emulator, of which the scenarios have already been created.
+        The clock of the config is replaced by the clock of the fleet.
+        :type config: configuration.config.EmulatorConfig
+        :param output: output of the emulator; the output of the config by default
+        :type output: output.outputinterface.OutputInterface
+        :return: the created emulator
+        :rtype: emulator.emulator.Emulator
+        """
+        if name in self.emulators:
+            raise Exception(f'An emulator with name {name} already exists in the fleet')
+
+        config.set_clock(self.clock)
+        if output is not None:
+            config.set_output(output)
+        emulator = Emulator(config, self.scheduler)
+        self.emulators[name] = emulator
+        return emulator
+
+    def get_emulator(self, name):
+        """
+        Get an emulator of the fleet
+        :param name: name of the emulator
+        :type name: str
+        :return: the emulator, or None if it does not exist
+        :rtype: emulator.emulator.Emulator or None
+        """
+        return self.emulators.get(name, None)
+
+    def run(self):
+        """
+        Run all emulators until they are done or the fleet is stopped
+        """
+        self.started_at = time.monotonic()
+        with self.lock:
+            now = self.clock.now()
+            for name, emulator in self.emulators.items():
+                emulator.prepare()
+                self.tasks[name] = self.scheduler.schedule(now, partial(self.__tick, name, now))
+            if len(self.tasks) == 0:
+                self.finished.set()
+
+        if self.clock.is_virtual():
+            # Advance the virtual clock until the next deadline, which executes all ticks and events on this thread
+            self.clock.attach(self.scheduler)
+            while not self.finished.is_set():
+                deadline = self.scheduler.next_deadline()
+                if deadline is None:
+                    break
+                self.clock.sleep(max((deadline - self.clock.now()).total_seconds(), 0))
+            self.clock.detach(self.scheduler)
+        else:
+            self.scheduler.start()
+            self.finished.wait()
+            self.scheduler.stop()
+        self.finished_at = time.monotonic()
+
+    def __tick(self, name, deadline):
+        """
+        Execute a tick of an emulator and schedule its next tick
+        :param name: name of the emulator
+        :type name: str
+        :param deadline: the deadline of this tick
+        :type deadline: datetime.datetime
+        """
+        emulator = self.emulators[name]
+        if emulator.is_done():
+            emulator.finish()
+            with self.lock:
+                self.tasks.pop(name, None)
+                if len(self.tasks) == 0:
+                    self.finished.set()
+            return
+
+        if emulator.paused:
+            emulator.status = 'paused'
+            next_deadline = self.clock.now() + datetime.timedelta(seconds=self.pause_interval)
+        else:
+            try:
+                emulator.tick(deadline=deadline)
+            except Exception as e:
+                self.logger.error(f'Emulator {name} raised an exception and is stopped: {e}')
+                emulator.stop()
+            # Schedule relative to the deadline instead of the current time, such that ticks do not drift
+            next_deadline = emulator.next_deadline(deadline)
+
+        with self.lock:
+            self.tasks[name] = self.scheduler.schedule(next_deadline, partial(self.__tick, name, next_deadline))
+
+    def stop(self, name=None):
+        """
+        Stop an emulator, or all emulators in the fleet
+        :param name: name of the emulator to stop; None to stop all emulators
+        :type name: str or None
+        """
+        for emulator in self.__select(name):
+            emulator.stop()
+
+    def pause(self, name=None):
+        """
+        Pause an emulator, or all emulators in the fleet
+        :param name: name of the emulator to pause; None to pause all emulators
+        :type name: str or None
+        """
+        for emulator in self.__select(name):
+            emulator.pause()
+
+    def resume(self, name=None):
+        """
+        Resume an emulator, or all emulators in the fleet
+        :param name: name of the emulator to resume; None to resume all emulators
+        :type name: str or None
+        """
+        for emulator in self.__select(name):
+            emulator.resume()
+
+    def __select(self, name):
+        """
+        Select one or all emulators
+        :param name: name of the emulator; None to select all emulators
+        :type name: str or None
+        :return: list of selected emulators
+        :rtype: list
+        """
+        if name is None:
+            return list(self.emulators.values())
+        return [self.emulators[name]] if name in self.emulators else []
+
+    def get_report(self):
+        """
+        Get a report of the throughput of the fleet
+        :return: dict with the statistics of every emulator in 'emulators' (see Emulator.get_statistics(), extended with
+        the status), and the total ticks, messages and bytes of all emulators, and the rates per second of real time
+        :rtype: dict
+        """
+        emulators = {}
+        for name, emulator in self.emulators.items():
+            emulators[name] = emulator.get_statistics()
+            emulators[name]['status'] = emulator.get_status()
+
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at if self.finished_at is not None else time.monotonic()) - self.started_at
+
+        report = {
+            'emulators': emulators,
+            'elapsed': elapsed,
+        }
+        for statistic in ['ticks', 'messages', 'bytes']:
+            total = sum(statistics[statistic] for statistics in emulators.values())
+            report[statistic] = total
+            report[f'{statistic}_per_second'] = total / elapsed if elapsed > 0 else 0.0
+        return report
@@ -0,0 +1,351 @@
+import copy
+import datetime
+import os
+import time
+from multiprocessing import Array, Process
+
+from .fleet import Fleet
+from ..configuration.config import EmulatorConfig
+from ..output.fileoutput import FileOutput
+from ..scenarios.intfixed import IntFixedScenario
+from ..scenarios.stringfixed import StringFixedScenario
+from ..util.clock import Clock
+from ..util.log import init_logger
+
+# Statistics that every worker writes to shared memory for each of its devices
+STATISTICS = ['ticks', 'messages', 'bytes', 'messages_per_second', 'bytes_per_second', 'overruns', 'status']
+# Statuses of an emulator, the index of a status is stored in shared memory
+STATUSES = ['initialized', 'running', 'stopping', 'stopped', 'pausing', 'paused', 'resuming']
+# Commands that the parent can send to a device through shared memory
+COMMANDS = ['resume', 'pause', 'stop']
+
+
+class DeviceSpec:
+    """
+    Description of a single device that is emulated by a FleetPool.
+    A device spec is sent to a worker process, so all of its attributes have to be picklable.
+    """
+
+    def __init__(self, name, config, seed=None, fields=None, settings=None, output=None):
+        """
+        Create a device spec
+        :param name: unique name of the device
+        :type name: str
+        :param config: path to a yaml config file, a yaml string or a deserialized yaml config
+        :type config: str or dict
+        :param seed: default seed of the device; the default seed of the config by default
+        :type seed: int or None
+        :param fields: fixed values of fields, such as the serial number, which replace the scenarios of these fields.
+        The key is the text key (str) or the hex id (int) of the field.
+        :type fields: dict
+        :param settings: settings of the config, the key is the name of the setter without 'set_', e.g. {'delay': 0.5}
+        :type settings: dict
+        :param output: function without arguments that creates the output of the device in the worker process, e.g.
+        functools.partial(FileOutput, 'device.txt'). Output is discarded by default.
+        :type output: callable
+        """
+        self.name = name
+        self.config = config
+        self.seed = seed
+        self.fields = fields if fields is not None else dict()
+        self.settings = settings if settings is not None else dict()
+        self.output = output
+
+    def create_config(self):
+        """
+        Create the config of the device, including its scenarios
+        :return: the config
+        :rtype: configuration.config.EmulatorConfig
+        """
+        config = EmulatorConfig()
+        if isinstance(self.config, dict):
+            config.set_config_dict(copy.deepcopy(self.config))
+        elif os.path.isfile(self.config):
+            config.set_config_file(self.config)
+        else:
+            config.set_config(self.config)
+        for setting, value in self.settings.items():
+            getattr(config, f'set_{setting}')(value)
+        if self.seed is not None:
+            config.set_default_seed(self.seed)
+        config.create_scenarios()
+        self.__apply_fields(config)
+        return config
+
+    def create_output(self):
+        """
+        Create the output of the device
+        :return: the output
+        :rtype: output.outputinterface.OutputInterface
+        """
+        if self.output is None:
+            return FileOutput(os.devnull)
+        return self.output()
+
+    def __apply_fields(self, config):
+        """
+        Replace the scenarios of the fixed fields of the device. The fixed value is generated as often as the original
+        scenarios of the field would have been, such that the stop condition of the emulator is unaffected.
+        :param config: config of the device, of which the scenarios have already been created
+        :type config: configuration.config.EmulatorConfig
+        """
+        for key, value in self.fields.items():
+            scenarios = config.get_hex_scenarios() if isinstance(key, int) else config.get_text_scenarios()
+            if key not in scenarios or len(scenarios[key]) == 0:
+                raise Exception(f'Device {self.name} has no field {key} to overwrite')
+            props = {'value': value}
+            amounts = [scenario.amount for scenario in scenarios[key]]
+            if None not in amounts:
+                props['amount'] = sum(amounts)
+            field_props = scenarios[key][0].get_field_props()
+            if isinstance(value, int):
+                scenarios[key] = [IntFixedScenario(props, field_props)]
+            else:
+                scenarios[key] = [StringFixedScenario(props, field_props)]
+
+
+def run_worker(devices, indices, statistics, commands, clock_factory, report_interval):
+    """
+    Run the devices of a single worker process in a fleet.
+    Every report_interval seconds of real time, the statistics of every device are written to shared memory.
+    Every Fleet.pause_interval seconds of clock time, the commands of the parent are read from shared memory.
+    :param devices: devices to emulate in this worker
+    :type devices: list
+    :param indices: index of every device in the shared memory
+    :type indices: list
+    :param statistics: shared memory with len(STATISTICS) values per device
+    :type statistics: multiprocessing.Array
+    :param commands: shared memory with one command (index in COMMANDS) per device
+    :type commands: multiprocessing.Array
+    :param clock_factory: function without arguments that creates the clock of the worker
+    :type clock_factory: callable
+    :param report_interval: interval in seconds of real time between updates of the statistics
+    :type report_interval: float
+    """
+    logger = init_logger(__name__)
+    fleet = Fleet(clock_factory())
+    for device in devices:
+        fleet.add_emulator(device.name, device.create_config(), device.create_output())
+    names = {device.name: index for device, index in zip(devices, indices)}
+    applied = {name: 0 for name in names}
+    last_report = {'time': time.monotonic(), 'statistics': {}}
+
+    def report():
+        now = time.monotonic()
+        elapsed = now - last_report['time']
+        emulators = fleet.get_report()['emulators']
+        for name, index in names.items():
+            current = emulators[name]
+            previous = last_report['statistics'].get(name, current)
+            values = {
+                'ticks': current['ticks'],
+                'messages': current['messages'],
+                'bytes': current['bytes'],
+                'messages_per_second': (current['messages'] - previous['messages']) / elapsed if elapsed > 0 else 0.0,
+                'bytes_per_second': (current['bytes'] - previous['bytes']) / elapsed if elapsed > 0 else 0.0,
+                'overruns': current['overruns'],
+                'status': STATUSES.index(current['status']),
+            }
+            offset = index * len(STATISTICS)
+            with statistics.get_lock():
+                for i, statistic in enumerate(STATISTICS):
+                    statistics[offset + i] = values[statistic]
+        last_report['time'] = now
+        last_report['statistics'] = emulators
+
+    def control():
+        for name, index in names.items():
+            command = commands[index]
+            if command != applied[name]:
+                getattr(fleet, COMMANDS[command])(name)
+                applied[name] = command
+        if time.monotonic() - last_report['time'] >= report_interval:
+            report()
+        if not fleet.finished.is_set():
+            fleet.scheduler.schedule(fleet.clock.now() + datetime.timedelta(seconds=fleet.pause_interval), control)
+
+    fleet.scheduler.schedule(fleet.clock.now(), control)
+    try:
+        fleet.run()
+    except Exception as e:
+        logger.error(f'Worker with devices {list(names)} raised an exception: {e}')
+    report()
+
+
+class FleetPool:
+    """
+    A fleet of emulators that is spread over multiple processes, such that it can use all CPU cores.
+    The devices are divided over the worker processes, each of which runs its devices as a Fleet. The workers report
+    the statistics of their devices to the parent through shared memory, and the parent controls the devices through
+    shared memory as well.
+
+    Example:
+    devices = FleetPool.devices_from_config('configs/mppt_text.yaml',
+                                            [{'seed': i, 'fields': {'SER#': f'HQ{i:08}'}} for i in range(1000)])
+    pool = FleetPool(devices)
+    pool.start()
+    pool.pause('device3')
+    pool.join()
+    print(pool.get_report())
+    """
+
+    def __init__(self, devices, processes=None, clock_factory=Clock, report_interval=1.0):
+        """
+        Create a pool of worker processes for a list of devices
+        :param devices: devices to emulate
+        :type devices: list
+        :param processes: amount of worker processes; the amount of CPU cores by default
+        :type processes: int or None
+        :param clock_factory: picklable function without arguments that creates the clock of a worker, e.g. VirtualClock
+        :type clock_factory: callable
+        :param report_interval: interval in seconds between updates of the statistics of the workers
+        :type report_interval: float
+        """
+        self.logger = init_logger(__name__)
+        names = [device.name for device in devices]
+        if len(set(names)) != len(names):
+            raise Exception('Every device in the pool should have a unique name')
+        self.devices = devices
+        self.indices = {name: index for index, name in enumerate(names)}
+        processes = processes if processes is not None else os.cpu_count() or 1
+        self.processes = max(min(processes, len(devices)), 1)
+        self.clock_factory = clock_factory
+        self.report_interval = report_interval
+        self.statistics = Array('d', len(devices) * len(STATISTICS))
+        self.commands = Array('b', len(devices))
+        self.workers = []
+        self.started_at = None
+        self.finished_at = None
+
+    @staticmethod
+    def devices_from_config(config, overrides, **kwargs):
+        """
+        Create device specs for a number of devices that share one config
+        :param config: path to a yaml config file, a yaml string or a deserialized yaml config
+        :type config: str or dict
+        :param overrides: one dict per device, with any of the keyword arguments of DeviceSpec. If it does not contain a
+        name, the device is named 'device{index}'.
+        :type overrides: list
+        :param kwargs: keyword arguments of DeviceSpec that apply to all devices
+        :return: list of device specs
+        :rtype: list
+        """
+        devices = []
+        for index, override in enumerate(overrides):
+            arguments = dict(kwargs)
+            arguments.update(override)
+            arguments.setdefault('name', f'device{index}')
+            devices.append(DeviceSpec(config=config, **arguments))
+        return devices
+
+    def start(self):
+        """
+        Start the worker processes. The devices are distributed round robin over the workers.
+        """
+        self.started_at = time.monotonic()
+        for worker in range(self.processes):
+            devices = self.devices[worker::self.processes]
+            indices = [self.indices[device.name] for device in devices]
+            process = Process(target=run_worker, daemon=True,
+                              args=(devices, indices, self.statistics, self.commands, self.clock_factory,
+                                    self.report_interval))
+            process.start()
+            self.workers.append(process)
+
+    def join(self, timeout=None):
+        """
+        Wait until all workers are done
+        :param timeout: maximum time in seconds to wait for every worker, None to wait until they are done
+        :type timeout: float or None
+        :return: true if all workers are done, false otherwise
+        :rtype: bool
+        """
+        for worker in self.workers:
+            worker.join(timeout)
+        done = not self.is_alive()
+        if done and self.finished_at is None:
+            self.finished_at = time.monotonic()
+        return done
+
+    def run(self):
+        """
+        Run all devices until they are done
+        """
+        self.start()
+        self.join()
+
+    def is_alive(self):
+        """
+        Check if any worker is still running
+        :return: true if a worker is running, false otherwise
+        :rtype: bool
+        """
+        return any(worker.is_alive() for worker in self.workers)
+
+    def stop(self, name=None):
+        """
+        Stop a device, or all devices in the pool
+        :param name: name of the device to stop; None to stop all devices
+        :type name: str or None
+        """
+        self.__command(name, 'stop')
+
+    def pause(self, name=None):
+        """
+        Pause a device, or all devices in the pool
+        :param name: name of the device to pause; None to pause all devices
+        :type name: str or None
+        """
+        self.__command(name, 'pause')
+
+    def resume(self, name=None):
+        """
+        Resume a device, or all devices in the pool
+        :param name: name of the device to resume; None to resume all devices
+        :type name: str or None
+        """
+        self.__command(name, 'resume')
+
+    def __command(self, name, command):
+        """
+        Send a command to one or all devices. A stopped device can not be paused or resumed anymore.
+        :param name: name of the device; None for all devices
+        :type name: str or None
+        :param command: command in COMMANDS
+        :type command: str
+        """
+        indices = self.indices.values() if name is None else [self.indices[name]]
+        for index in indices:
+            if self.commands[index] != COMMANDS.index('stop'):
+                self.commands[index] = COMMANDS.index(command)
+
+    def get_report(self):
+        """
+        Get a report of the throughput of the pool, as last reported by the workers
+        :return: dict with the statistics of every device in 'emulators' (see STATISTICS), and the total ticks,
+        messages, bytes, rates and overruns of all devices
+        :rtype: dict
+        """
+        with self.statistics.get_lock():
+            values = list(self.statistics)
+        emulators = {}
+        for name, index in self.indices.items():
+            offset = index * len(STATISTICS)
+            statistics = dict(zip(STATISTICS, values[offset:offset + len(STATISTICS)]))
+            for statistic in ['ticks', 'messages', 'bytes', 'overruns']:
+                statistics[statistic] = int(statistics[statistic])
+            statistics['status'] = STATUSES[int(statistics['status'])]
+            emulators[name] = statistics
+
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at if self.finished_at is not None else time.monotonic()) - self.started_at
+
+        report = {
+            'emulators': emulators,
+            'elapsed': elapsed,
+        }
+        for statistic in ['ticks', 'messages', 'bytes', 'messages_per_second', 'bytes_per_second', 'overruns']:
+            report[statistic] = sum(statistics[statistic] for statistics in emulators.values())
+        return report
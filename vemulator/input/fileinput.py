@@ -1,19 +1,34 @@
+import os
+import time
+from collections import deque
+
 from .inputinterface import InputInterface
 
 
 class FileInput(InputInterface):
+    read_size = 1 << 20  # Maximum amount of bytes read at once
+    flush_time = 1.0  # Seconds after which a last line without a newline is returned, when the file has not grown
+
     def __init__(self, file_path):
         """
         Reads input from a file.
         New text can be written to the file while the emulator is running,
         it will process any new lines as soon as they are written.
+        The file is tailed: new bytes are read in bulk when the file has grown, and only complete lines are returned,
+        such that a line that is still being written is returned once its newline has been written.
+        A last line without a newline, such as the last command of a replay file, is returned with a newline once the
+        file has not grown for flush_time seconds, such that it is processed like the other lines.
         :param file_path: path of the file to read from
         :type file_path: str
         """
         try:
-            self.file = open(file_path, 'rb')
+            self.file = open(file_path, 'rb', buffering=0)
         except FileNotFoundError:
             self.file = None
+        self.position = 0  # Amount of bytes read from the file
+        self.partial = b''  # Start of a line of which the newline has not been read yet
+        self.lines = deque()  # Complete lines that have been read but not returned yet
+        self.grown_at = time.monotonic()  # Point in time at which the file has grown for the last time
 
     def available(self) -> bool:
         return self.file is not None
@@ -21,11 +36,49 @@ class FileInput(InputInterface):
     def has_data(self) -> bool:
         if not self.available():
             return False
-
-        cursor = self.file.tell()
-        has_line = bool(self.file.readline())
-        self.file.seek(cursor)
-        return has_line
+        if len(self.lines) == 0:
+            self.__read_new_data()
+        return len(self.lines) > 0
 
     def readline(self) -> bytes:
-        return self.file.readline()
+        if not self.has_data():
+            return b''
+        return self.lines.popleft()
+
+    def read(self) -> bytes:
+        if not self.has_data():
+            return b''
+        data = b''.join(self.lines)
+        self.lines.clear()
+        return data
+
+    def close(self):
+        """
+        Close the input
+        """
+        if self.file is not None:
+            self.file.close()
+
+    def __read_new_data(self):
+        """
+        Read the bytes that have been written to the file since the last read, if the file has grown
+        """
+        size = os.fstat(self.file.fileno()).st_size
+        if size < self.position:
+            # The file has been truncated, so start reading from the beginning again
+            self.file.seek(0)
+            self.position = 0
+            self.partial = b''
+        if size == self.position:
+            if len(self.partial) > 0 and time.monotonic() - self.grown_at >= self.flush_time:
+                # The line is not being written anymore
+                self.lines.append(self.partial + b'\n')
+                self.partial = b''
+            return
+
+        data = self.file.read(min(size - self.position, self.read_size))
+        self.position += len(data)
+        self.grown_at = time.monotonic()
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        self.lines.extend(line + b'\n' for line in lines)
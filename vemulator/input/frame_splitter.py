@@ -0,0 +1,49 @@
+class HexFrameSplitter:
+    """
+    Splits the data read from an input into hex frames, which start with a colon and end with a newline.
+    Data can be fed in chunks of any size: a frame that is not complete yet is kept until the rest of it arrives.
+    Data outside of frames is discarded, and a colon inside a frame starts a new frame, such that the splitter
+    recovers from a frame that was cut off.
+
+    Example:
+    splitter = HexFrameSplitter()
+    splitter.feed(b':15')  # []
+    splitter.feed(b'4\n:352\n')  # [b':154\n', b':352\n']
+    """
+    max_length = 1024  # Maximum length of a frame, longer partial frames are discarded
+
+    def __init__(self):
+        self.partial = b''  # Start of a frame of which the newline has not been received yet
+
+    def feed(self, data):
+        """
+        Feed data read from the input
+        :param data: data read from the input
+        :type data: bytes
+        :return: list of complete frames, including the colon and the newline
+        :rtype: list
+        """
+        data = data.replace(b'\x00', b'')
+        if len(self.partial) > 0:
+            data = self.partial + data
+            self.partial = b''
+
+        frames = []
+        start = data.find(b':')
+        while start >= 0:
+            end = data.find(b'\n', start)
+            if end < 0:
+                # Keep the last frame until the rest of it arrives
+                partial = data[data.rfind(b':'):]
+                if len(partial) <= self.max_length:
+                    self.partial = partial
+                break
+            frames.append(data[data.rfind(b':', start, end):end + 1])
+            start = data.find(b':', end + 1)
+        return frames
+
+    def reset(self):
+        """
+        Discard the partial frame
+        """
+        self.partial = b''
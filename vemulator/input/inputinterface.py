@@ -26,3 +26,44 @@ class InputInterface:
         :rtype: bytes
         """
         raise NotImplementedError
+
+    def read(self) -> bytes:
+        """
+        Read all data that is available at the input, which may end with an incomplete line.
+        By default this reads lines until has_data() is false.
+        :return: read data, which is empty at the end of the input
+        :rtype: bytes
+        """
+        data = []
+        while self.has_data():
+            line = self.readline()
+            if len(line) == 0:
+                break
+            data.append(line)
+        return b''.join(data)
+
+    def fileno(self):
+        """
+        Get the file descriptor of the input, which an event loop can watch for incoming data
+        :return: file descriptor, or None if the input can not be watched, in which case it is polled instead
+        :rtype: int or None
+        """
+        return None
+
+    async def areadline(self) -> bytes:
+        """
+        Read line as binary data from the input, from within an event loop.
+        By default this calls readline(), so it should only be awaited when has_data() is true.
+        :return: read data
+        :rtype: bytes
+        """
+        return self.readline()
+
+    async def aread(self) -> bytes:
+        """
+        Read all data that is available at the input, from within an event loop.
+        By default this calls read(), so it should only be awaited when has_data() is true.
+        :return: read data
+        :rtype: bytes
+        """
+        return self.read()
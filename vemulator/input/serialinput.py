@@ -27,8 +27,21 @@ class SerialInput(InputInterface):
         except OSError:
             return False
 
+    def fileno(self):
+        if not self.available() or not hasattr(self.serial, 'fileno'):
+            # Serial ports on Windows do not have a file descriptor
+            return None
+        return self.serial.fileno()
+
     def readline(self) -> bytes:
         try:
             return self.serial.readline()
         except SerialException:
             return b''
+
+    def read(self) -> bytes:
+        # Drain everything the driver has received in a single read
+        try:
+            return self.serial.read(max(self.serial.in_waiting, 1))
+        except (SerialException, OSError):
+            return b''
@@ -0,0 +1,43 @@
+import os
+import select
+
+from .inputinterface import InputInterface
+
+
+class StreamInput(InputInterface):
+    read_size = 65536  # Maximum amount of bytes read at once
+
+    def __init__(self, stream):
+        """
+        Reads input from a stream with a file descriptor, such as a pipe, a pty or a socket.
+        The stream is read unbuffered, such that no data is hidden in a buffer when checking for new data.
+        :param stream: file descriptor, or an object with a fileno() method such as a socket
+        :type stream: int or object
+        """
+        fd = stream if isinstance(stream, int) else stream.fileno()
+        self.file = os.fdopen(os.dup(fd), 'rb', buffering=0)
+
+    def available(self) -> bool:
+        return not self.file.closed
+
+    def has_data(self) -> bool:
+        if not self.available():
+            return False
+        readable, _, _ = select.select([self.file], [], [], 0)
+        return len(readable) > 0
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def readline(self) -> bytes:
+        return self.file.readline()
+
+    def read(self) -> bytes:
+        # The file is unbuffered, so this returns whatever is available in a single read
+        return self.file.read(self.read_size)
+
+    def close(self):
+        """
+        Close the input
+        """
+        self.file.close()
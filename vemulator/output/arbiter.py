@@ -0,0 +1,204 @@
+import datetime
+from collections import OrderedDict, deque
+from threading import Condition, Thread
+
+from .outputinterface import OutputInterface
+from .pacer import Link
+from ..util.log import init_logger
+
+# Priorities of the messages, a lower number is written first
+RESPONSE = 0
+ASYNC = 1
+TEXT = 2
+
+
+class OutputArbiter(OutputInterface):
+    """
+    Output that schedules the messages of an emulator on a link with a limited baud rate, like a real device does.
+    Messages are classified by their content: hex responses are written first, then async hex messages, and then text
+    frames. A message that is being transmitted is never interrupted, so text frames are always written whole.
+    Async hex messages can be rate limited, and a queued async message of a register is replaced by a newer one.
+
+    The messages are written by a separate thread, which waits until the link has transmitted the previous message
+    before it picks the next message. With a virtual clock, messages are written immediately in the order they arrive,
+    since waiting for the link is not possible. The transmission of the messages is accounted on a Link, which reports
+    the utilisation of the link and can be shared with the outputs of other emulators.
+
+    Example:
+    config.set_output(OutputArbiter(SerialOutput('/dev/ttyUSB0'), async_rate=5))
+    """
+
+    def __init__(self, output, baud_rate=None, async_rate=None, clock=None, link=None):
+        """
+        Create an arbiter that writes to an output
+        :param output: output to write the messages to
+        :type output: OutputInterface
+        :param baud_rate: baud rate of the link; the baud rate of the output, or 19200 if it does not have one.
+        Ignored when a link is given
+        :type baud_rate: int or None
+        :param async_rate: maximum amount of async hex messages per second; None for no limit
+        :type async_rate: float or None
+        :param clock: clock that determines when messages have been transmitted; real time by default. Ignored when a
+        link is given
+        :type clock: util.clock.Clock
+        :param link: link that the output writes to; by default a link at the baud rate, using the clock
+        :type link: pacer.Link
+        """
+        self.logger = init_logger(__name__)
+        self.output = output
+        if link is None:
+            link = Link(baud_rate if baud_rate is not None else getattr(output, 'baud_rate', 19200), clock=clock)
+        self.link = link
+        self.clock = link.clock
+        self.async_interval = 1 / async_rate if async_rate else 0.0
+        self.condition = Condition()
+        self.responses = deque()
+        self.async_messages = OrderedDict()  # key is the register of the message, such that newer messages replace older
+        self.text_messages = deque()
+        self.last_async_at = None  # point in time at which the last async message has been written
+        self.writing = False
+        self.messages = [0, 0, 0]  # amount of messages written per priority
+        self.replaced = 0  # amount of async messages that have been replaced by a newer message
+        if not self.clock.is_virtual():
+            Thread(target=self.__run, daemon=True).start()
+
+    @staticmethod
+    def classify(data):
+        """
+        Determine the priority of a message
+        :param data: message
+        :type data: bytes
+        :return: RESPONSE, ASYNC or TEXT
+        :rtype: int
+        """
+        if data[:2] == b':A':
+            return ASYNC
+        elif data[:1] == b':':
+            return RESPONSE
+        return TEXT
+
+    def transmission_time(self, data):
+        """
+        Calculate the time it takes to transmit a message on the link
+        :param data: message
+        :type data: bytes
+        :return: time in seconds
+        :rtype: float
+        """
+        return len(data) / self.link.capacity()
+
+    def available(self) -> bool:
+        return self.output.available()
+
+    def write(self, data) -> bool:
+        priority = self.classify(data)
+        with self.condition:
+            if self.clock.is_virtual():
+                self.__account(data, priority)
+                return self.output.write(data)
+
+            if priority == RESPONSE:
+                self.responses.append(data)
+            elif priority == ASYNC:
+                register = data[2:6]
+                if register in self.async_messages:
+                    self.replaced += 1
+                self.async_messages[register] = data
+            else:
+                self.text_messages.append(data)
+            self.condition.notify_all()
+        return True
+
+    def flush(self):
+        """
+        Wait until all queued messages have been written
+        """
+        with self.condition:
+            while self.writing or len(self.responses) + len(self.async_messages) + len(self.text_messages) > 0:
+                self.condition.wait()
+
+    def get_statistics(self):
+        """
+        Get statistics about the link
+        :return: dict with the amount of responses, async messages and text frames that have been written,
+        the amount of async messages that have been replaced by a newer message, and the statistics of the link
+        (see Link.get_statistics())
+        :rtype: dict
+        """
+        with self.condition:
+            statistics = {
+                'responses': self.messages[RESPONSE],
+                'async': self.messages[ASYNC],
+                'text': self.messages[TEXT],
+                'replaced': self.replaced,
+            }
+        statistics.update(self.link.get_statistics())
+        return statistics
+
+    def __next_message(self, now):
+        """
+        Take the next message that may be written. The lock of the condition must be held.
+        :param now: the current time
+        :type now: datetime.datetime
+        :return: the message and its priority, or None and the time in seconds until an async message may be written
+        :rtype: tuple
+        """
+        if len(self.responses) > 0:
+            return self.responses.popleft(), RESPONSE
+
+        wait = None
+        if len(self.async_messages) > 0:
+            if self.last_async_at is None:
+                wait = 0
+            else:
+                wait = self.async_interval - (now - self.last_async_at).total_seconds()
+            if wait <= 0:
+                return self.async_messages.popitem(last=False)[1], ASYNC
+
+        if len(self.text_messages) > 0:
+            return self.text_messages.popleft(), TEXT
+        return None, wait
+
+    def __account(self, data, priority):
+        """
+        Account the transmission of a message on the link. The lock of the condition must be held.
+        :param data: message
+        :type data: bytes
+        :param priority: priority of the message
+        :type priority: int
+        """
+        with self.link.lock:
+            if priority == ASYNC:
+                # The message is transmitted once the link has transmitted the backlog
+                self.last_async_at = self.clock.now() + datetime.timedelta(seconds=self.link.backlog())
+            self.link.offer(len(data))
+        self.messages[priority] += 1
+
+    def __run(self):
+        """
+        Write the queued messages, one at a time, as soon as the link is free
+        """
+        while True:
+            with self.condition:
+                while True:
+                    backlog = self.link.backlog()
+                    if backlog > 0:
+                        # The previous message is still being transmitted
+                        self.clock.wait(self.condition, backlog)
+                        continue
+                    data, priority = self.__next_message(self.clock.now())
+                    if data is not None:
+                        break
+                    self.clock.wait(self.condition, priority)
+                self.writing = True
+                self.__account(data, priority)
+
+            try:
+                # Write outside of the lock, such that the emulator can queue new messages in the meantime
+                self.output.write(data)
+            except Exception as e:
+                self.logger.error(f'Could not write message to output: {e}')
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
@@ -0,0 +1,43 @@
+from .outputinterface import OutputInterface
+
+
+class ImpairedOutput(OutputInterface):
+    """
+    Output that impairs messages before writing them, like a noisy link would. Text frames and hex messages (starting
+    with ':') each have their own impairment. Unlike the bit error rate of the config, the impairment applies to whole
+    messages, including their checksum.
+
+    Example:
+    config.set_output(ImpairedOutput(SerialOutput('/dev/ttyUSB0'),
+                                     text=Impairment(burst_start=1e-4, burst_end=0.1, drop_rate=1e-4),
+                                     hex=Impairment(truncate_rate=0.01)))
+    """
+
+    def __init__(self, output, text=None, hex=None):
+        """
+        Create an impaired output
+        :param output: output to write the impaired messages to
+        :type output: OutputInterface
+        :param text: impairment of text frames; None to write them unimpaired
+        :type text: util.impairment.Impairment
+        :param hex: impairment of hex messages; None to write them unimpaired
+        :type hex: util.impairment.Impairment
+        """
+        self.output = output
+        self.text = text
+        self.hex = hex
+
+    def available(self) -> bool:
+        return self.output.available()
+
+    def write(self, data) -> bool:
+        impairment = self.hex if data[:1] == b':' else self.text
+        if impairment is not None:
+            data = impairment.apply(data)
+            if len(data) == 0:
+                # The whole message has been lost
+                return True
+        return self.output.write(data)
+
+    def flush(self):
+        self.output.flush()
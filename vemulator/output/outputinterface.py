@@ -20,3 +20,19 @@ class OutputInterface:
         :rtype: bool
         """
         raise NotImplementedError
+
+    def flush(self):
+        """
+        Wait until all written data has been sent. By default, data is sent as soon as it is written.
+        """
+        pass
+
+    async def awrite(self, data) -> bool:
+        """
+        Write bytes to the output, from within an event loop. By default this calls write().
+        :param data: data to write
+        :type data: bytes
+        :return: true if the data was successfully written, false otherwise
+        :rtype: bool
+        """
+        return self.write(data)
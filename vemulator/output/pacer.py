@@ -0,0 +1,209 @@
+import datetime
+from collections import deque
+from threading import RLock
+
+from .outputinterface import OutputInterface
+from ..util.clock import Clock
+from ..util.log import init_logger
+
+
+class Link:
+    """
+    A serial link with a limited baud rate, which keeps track of the bytes that are offered to and transmitted on it.
+    A link can be shared by the pacers of several emulators, such as devices behind a single serial multiplexer.
+    """
+    bits_per_byte = 10  # 8 data bits, a start bit and a stop bit
+
+    def __init__(self, baud_rate=19200, window=10.0, clock=None):
+        """
+        Create a link
+        :param baud_rate: baud rate of the link
+        :type baud_rate: int
+        :param window: duration in seconds over which the utilisation of the link is measured
+        :type window: float
+        :param clock: clock that determines when bytes have been transmitted; real time by default
+        :type clock: util.clock.Clock
+        """
+        self.logger = init_logger(__name__)
+        self.baud_rate = baud_rate
+        self.window = window
+        self.clock = clock if clock is not None else Clock()
+        self.lock = RLock()
+        self.free_at = None  # point in time at which the link has transmitted all bytes
+        self.history = deque()  # (time, offered bytes, transmitted bytes) within the window
+        self.started_at = None
+        self.saturated = False
+        self.offered = 0
+        self.transmitted = 0
+
+    def capacity(self):
+        """
+        Get the amount of bytes the link can transmit per second
+        :return: bytes per second
+        :rtype: float
+        """
+        return self.baud_rate / self.bits_per_byte
+
+    def backlog(self):
+        """
+        Get the time until the link has transmitted all bytes
+        :return: time in seconds
+        :rtype: float
+        """
+        with self.lock:
+            if self.free_at is None:
+                return 0.0
+            return max((self.free_at - self.clock.now()).total_seconds(), 0.0)
+
+    def offer(self, size, transmit=True):
+        """
+        Offer bytes to the link
+        :param size: amount of bytes
+        :type size: int
+        :param transmit: whether the bytes are transmitted, or dropped instead
+        :type transmit: bool
+        """
+        with self.lock:
+            now = self.clock.now()
+            if self.started_at is None:
+                self.started_at = now
+            self.offered += size
+            if transmit:
+                self.transmitted += size
+                start = now if self.free_at is None or self.free_at < now else self.free_at
+                self.free_at = start + datetime.timedelta(seconds=size / self.capacity())
+            self.history.append((now, size, size if transmit else 0))
+            self.__check_saturation(now)
+
+    def get_statistics(self):
+        """
+        Get statistics about the link
+        :return: dict with the utilisation of the link (fraction of the time it is transmitting) and the offered load
+        (bytes offered relative to the capacity) during the window, whether the link is saturated, and the total amount
+        of bytes offered and transmitted
+        :rtype: dict
+        """
+        with self.lock:
+            offered_load, utilisation = self.__load(self.clock.now())
+            return {
+                'utilisation': utilisation,
+                'offered_load': offered_load,
+                'saturated': self.saturated,
+                'offered': self.offered,
+                'transmitted': self.transmitted,
+            }
+
+    def __load(self, now):
+        """
+        Calculate the load of the link during the window. The lock must be held.
+        :param now: the current time
+        :type now: datetime.datetime
+        :return: offered load and utilisation, relative to the capacity of the link
+        :rtype: tuple
+        """
+        while len(self.history) > 0 and (now - self.history[0][0]).total_seconds() > self.window:
+            self.history.popleft()
+        if self.started_at is None:
+            return 0.0, 0.0
+        duration = min((now - self.started_at).total_seconds(), self.window)
+        if duration <= 0:
+            return 0.0, 0.0
+        offered = sum(item[1] for item in self.history)
+        transmitted = sum(item[2] for item in self.history)
+        capacity = self.capacity() * duration
+        return offered / capacity, min(transmitted / capacity, 1.0)
+
+    def __check_saturation(self, now):
+        """
+        Log a warning when more bytes are offered to the link than it can transmit. The lock must be held.
+        :param now: the current time
+        :type now: datetime.datetime
+        """
+        if (now - self.started_at).total_seconds() < self.window:
+            # Not enough data to determine the load yet
+            return
+        offered_load, _ = self.__load(now)
+        if offered_load > 1.0 and not self.saturated:
+            self.logger.warning(f'Link at {self.baud_rate} baud is saturated, {offered_load:.0%} of its capacity is offered')
+        self.saturated = offered_load > 1.0
+
+
+class OutputPacer(OutputInterface):
+    """
+    Output that paces messages to the capacity of a serial link. When a message is written while the link is still
+    transmitting earlier messages, the policy determines what happens:
+    - delay: wait until the link is free before writing the message (not possible with a virtual clock, in which case
+      the message is only accounted as delayed)
+    - drop: drop the message when the link needs more than max_backlog seconds to become free
+    - none: write the message immediately, and only measure the utilisation of the link
+
+    Example:
+    link = Link(19200)  # shared by all devices on a multiplexer
+    config.set_output(OutputPacer(SerialOutput('/dev/ttyUSB0'), link, policy='drop'))
+    link.get_statistics()
+    """
+    policies = ['delay', 'drop', 'none']
+
+    def __init__(self, output, link=None, policy='delay', max_backlog=0.0):
+        """
+        Create a pacer that writes to an output
+        :param output: output to write the messages to
+        :type output: OutputInterface
+        :param link: link that the output writes to; by default a link at the baud rate of the output, or 19200 if
+        it does not have one
+        :type link: Link
+        :param policy: 'delay', 'drop' or 'none'
+        :type policy: str
+        :param max_backlog: maximum time in seconds the link may need to become free before a message is dropped
+        :type max_backlog: float
+        """
+        if policy not in self.policies:
+            raise ValueError(f'Unknown pacing policy {policy}, it should be one of {self.policies}')
+        self.output = output
+        self.link = link if link is not None else Link(getattr(output, 'baud_rate', 19200))
+        self.policy = policy
+        self.max_backlog = max_backlog
+        self.delayed = 0
+        self.dropped = 0
+        self.delay = 0.0  # total time in seconds that messages have been delayed
+
+    def available(self) -> bool:
+        return self.output.available()
+
+    def write(self, data) -> bool:
+        # Check the backlog and offer the message at once, such that pacers that share the link can not both decide
+        # to transmit based on the same backlog
+        with self.link.lock:
+            backlog = self.link.backlog()
+            if self.policy == 'drop' and backlog > self.max_backlog:
+                self.dropped += 1
+                self.link.offer(len(data), transmit=False)
+                return False
+
+            if backlog > 0:
+                self.delayed += 1
+                self.delay += backlog
+            # The message is transmitted once the link has transmitted the backlog
+            self.link.offer(len(data))
+
+        if backlog > 0 and self.policy == 'delay' and not self.link.clock.is_virtual():
+            self.link.clock.sleep(backlog)
+        return self.output.write(data)
+
+    def flush(self):
+        self.output.flush()
+
+    def get_statistics(self):
+        """
+        Get statistics about the pacing of this output
+        :return: dict with the amount of messages that have been delayed and dropped, the total delay in seconds,
+        and the statistics of the link (see Link.get_statistics())
+        :rtype: dict
+        """
+        statistics = {
+            'delayed': self.delayed,
+            'dropped': self.dropped,
+            'delay': self.delay,
+        }
+        statistics.update(self.link.get_statistics())
+        return statistics
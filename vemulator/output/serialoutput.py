@@ -13,6 +13,7 @@ class SerialOutput(OutputInterface):
         :param baud_rate: baud rate to write at; 19200 by default
         :type baud_rate: int
         """
+        self.baud_rate = baud_rate
         try:
             self.serial = Serial(port, baud_rate)
         except SerialException:
@@ -1,10 +1,12 @@
 from .scenario import Scenario
+from ..util.expression import Expression
 
 
 class ArithmeticScenario(Scenario):
     """
     Scenario for calculating a value based on other field values.
-    The value is evaluated using eval() so any Python functions or operators can be used.
+    The value is an expression that is compiled once, see util.expression.Expression for the operators and functions
+    that can be used. The keys of other fields are the variables of the expression.
 
     Example:
     - type: Arithmetic
@@ -17,10 +19,12 @@ class ArithmeticScenario(Scenario):
         # however, it should never break if the config checker has
         # been used to verify that the config conforms to the specification.
         self.arithmetic_value = props['value']
+        self.expression = Expression(self.arithmetic_value)
 
     def _generate(self, field_values):
         try:
-            self.value = eval(self.arithmetic_value, field_values.get_field_values())
+            # The expression only reads the fields it references from the field values, without copying them
+            self.value = self.expression.evaluate(field_values.get_field_values())
         except MemoryError as e:
             self.logger.error("Values calculated in eval too large for memory.")
 
@@ -16,6 +16,9 @@ class FixedScenario(Scenario):
         self.fixed_value = props.get('value', default_value)
         self.fixed_value_fuzzed = None
 
+    def get_domain(self):
+        return [self.fixed_value]
+
     def _generate(self, field_values):
         self.value = self.fixed_value
 
@@ -1,4 +1,5 @@
-from .scenario import Scenario
+from .scenario import Scenario, np
+from ..util.expression import Expression
 
 predefined_gradients = {
     'linear': 'x',
@@ -13,7 +14,9 @@ predefined_gradient_types = predefined_gradients.keys()
 
 class GradientScenario(Scenario):
     """
-    Scenario that generates values based on a mathematical function of time
+    Scenario that generates values based on a mathematical function of time.
+    The function is compiled once, see util.expression.Expression. When the amount of values is known, the whole
+    sequence is computed the first time a value is generated.
 
     Example:
     - type: Gradient
@@ -22,6 +25,8 @@ class GradientScenario(Scenario):
     """
 
     _x = 0
+    precompute_limit = 1 << 16  # Maximum length of a sequence that is computed in advance
+    int_limit = float(1 << 62)  # Maximum magnitude of intermediate results computed using NumPy integers
 
     def __init__(self, props={}, field_props={}):
         super().__init__(props=props, field_props=field_props)
@@ -32,14 +37,89 @@ class GradientScenario(Scenario):
         global predefined_gradient_types
         if self.gradient_type in predefined_gradient_types:
             self.gradient_type = predefined_gradients[self.gradient_type]
+        self.expression = Expression(self.gradient_type, ['x'])
 
         if self.amount is None:
             self.amount = int((self.max - self.min) / self.step_size)
+        self.length = self.amount  # Length of the sequence
+        self.index = 0  # Index of the next value in the sequence
+        self.sequence = None  # The values of the whole sequence, once computed
 
     def _generate(self, field_values):
+        sequence = self.__get_sequence()
+        index, x = self.index, self._x
+        self.index += 1
         self._x += self.step_size
-        self.value = eval(self.gradient_type, {'x': self._x - self.step_size})
+        if sequence is not None and index < len(sequence):
+            self.value = sequence[index]
+        else:
+            self.value = self.expression.evaluate({'x': x})
+
+    def _generate_batch(self, n):
+        sequence = self.__get_sequence()
+        if sequence is not None and self.index + n <= len(sequence):
+            values = np.array(sequence[self.index:self.index + n])
+        else:
+            values = self.__evaluate_array(self.index, n)
+        if values is None or values.dtype.kind not in 'iuf':
+            # The values overflowed or have a type NumPy can not compute with
+            return None
+        self.index += n
+        self._x += self.step_size * n
+        return values
 
     def reset(self):
         super().reset()
         self._x = 0
+        self.index = 0
+
+    def __get_sequence(self):
+        """
+        Get the values of the whole sequence, which are computed the first time
+        :return: list of values, or None if the sequence is too long or can not be computed in advance
+        :rtype: list or None
+        """
+        if self.sequence is None and self.length is not None and 0 < self.length <= self.precompute_limit:
+            values = self.__evaluate_array(0, self.length) if np is not None else None
+            if values is not None and values.dtype.kind in 'iuf':
+                self.sequence = values.tolist()
+            else:
+                try:
+                    self.sequence = [self.expression.evaluate({'x': self.step_size * index})
+                                     for index in range(self.length)]
+                except Exception:
+                    # Errors are raised when the value that causes them is generated
+                    self.length = None
+        return self.sequence
+
+    def __evaluate_array(self, start, n):
+        """
+        Evaluate the function for n values of x at once using NumPy
+        :param start: index of the first value in the sequence
+        :type start: int
+        :param n: amount of values
+        :type n: int
+        :return: the values, or None if the function can not be evaluated on an array or overflows
+        :rtype: numpy.ndarray or None
+        """
+        x = self.step_size * np.arange(start, start + n, dtype=np.int64)
+        largest = [0.0]  # Largest magnitude of an intermediate result
+
+        def trace(value):
+            largest[0] = max(largest[0], float(np.max(np.abs(np.asarray(value, dtype=np.float64)))))
+            return value
+
+        try:
+            with np.errstate(all='ignore'):
+                values = np.broadcast_to(self.expression.evaluate({'x': x}), (n,))
+                # Integers wrap around silently when they overflow, which can happen in any intermediate result, so
+                # the magnitudes of the intermediate results are computed again using floats
+                self.expression.evaluate_traced({'x': x.astype(np.float64)}, trace)
+        except Exception:
+            return None
+        if not largest[0] < self.int_limit:
+            return None
+        if values.dtype.kind == 'f' and not np.isfinite(values).all():
+            # Such as a division by zero, which raises an error when the value is generated on its own
+            return None
+        return values
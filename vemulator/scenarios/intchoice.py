@@ -1,4 +1,4 @@
-from .scenario import Scenario
+from .scenario import Scenario, np
 
 
 class IntChoiceScenario(Scenario):
@@ -13,9 +13,21 @@ class IntChoiceScenario(Scenario):
         super().__init__(props=props, field_props=field_props)
         self.choices = props.get('choices', [0])
 
+    def get_domain(self):
+        return list(self.choices)
+
     def _generate(self, field_values):
         self.value = self.rand.choice(self.choices)
 
+    def _generate_batch(self, n):
+        if not all(isinstance(choice, int) for choice in self.choices):
+            return None
+        try:
+            choices = np.array(self.choices, dtype=np.int64)
+        except OverflowError:
+            return None
+        return self._batch_random().choice(choices, size=n)
+
     def _fuzz(self, field_values):
         # Just pick a value from the choices using _generate
         pass
\ No newline at end of file
@@ -1,4 +1,5 @@
 from .fixed import FixedScenario
+from .scenario import np
 
 
 class IntFixedScenario(FixedScenario):
@@ -11,3 +12,11 @@ class IntFixedScenario(FixedScenario):
     """
     def __init__(self, props={}, field_props={}):
         super().__init__(props=props, field_props=field_props, default_value=0)
+
+    def _generate_batch(self, n):
+        if not isinstance(self.fixed_value, int):
+            return None
+        try:
+            return np.full(n, self.fixed_value, dtype=np.int64)
+        except (OverflowError, TypeError, ValueError):
+            return None
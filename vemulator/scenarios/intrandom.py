@@ -1,6 +1,6 @@
 import sys
 
-from .scenario import Scenario
+from .scenario import Scenario, np
 
 
 class IntRandomScenario(Scenario):
@@ -20,6 +20,11 @@ class IntRandomScenario(Scenario):
     def _generate(self, field_values):
         self.value = self.rand.randint(self.min, self.max)
 
+    def _generate_batch(self, n):
+        if self.min < np.iinfo(np.int64).min or self.max > np.iinfo(np.int64).max:
+            return None
+        return self._batch_random().integers(self.min, self.max, size=n, endpoint=True)
+
     def _fuzz(self, field_values):
         self.min = self.props.get('min', -sys.maxsize - 1)
         self.max = self.props.get('max', sys.maxsize)
@@ -22,6 +22,17 @@ class IntRangeScenario(Scenario):
     def _generate(self, field_values):
         self.value = self.intrandom.generate_next(field_values)
 
+    def generate_batch(self, n, field_values):
+        if self.fuzzing:
+            return super().generate_batch(n, field_values)
+        # The values are generated, and counted, by the IntRandom scenario, which puts the last value in the field values
+        values = self.intrandom.generate_batch(n, field_values)
+        if self.amount is not None:
+            self.amount -= len(values)
+        if len(values) > 0:
+            self.value = self.intrandom.value
+        return values
+
     def _fuzz(self, field_values):
         self.value = self.boundaryint.generate_next(field_values)
 
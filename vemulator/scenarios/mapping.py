@@ -1,4 +1,4 @@
-from .scenario import Scenario
+from .scenario import Scenario, np
 
 
 class MappingScenario(Scenario):
@@ -19,9 +19,24 @@ class MappingScenario(Scenario):
             self.rand.shuffle(self.dict)
         self.fuzzing_index = -1
 
+    def get_domain(self):
+        return list(self.dict)
+
     def _generate(self, field_values):
         self.value = self.rand.choice(self.dict)
 
+    def _generate_batch(self, n):
+        if len(set(type(value) for value in self.dict)) != 1:
+            # NumPy would convert values of different types to a common type
+            return None
+        try:
+            values = np.array(self.dict)
+        except (OverflowError, ValueError):
+            return None
+        if values.ndim != 1 or values.size == 0:
+            return None
+        return self._batch_random().choice(values, size=n)
+
     def _fuzz(self, field_values):
         self.fuzzing_index += 1
         if self.fuzzing_index < len(self.dict):
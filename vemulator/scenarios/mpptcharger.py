@@ -0,0 +1,134 @@
+import math
+
+from .scenario import Scenario
+
+# Values of the CS field of a charger
+OFF = 0
+BULK = 3
+ABSORPTION = 4
+FLOAT = 5
+
+# Quantities the model generates: battery voltage (mV), battery current (mA), charge power (W),
+# panel voltage (mV), panel power (W), charge state and load current (mA)
+quantities = ['V', 'I', 'P', 'VPV', 'PPV', 'CS', 'IL']
+# Key of the field of every quantity that is generated by default, the fields of a VE.Direct solar charger
+default_outputs = {'V': 'V', 'I': 'I', 'VPV': 'VPV', 'PPV': 'PPV', 'CS': 'CS'}
+
+
+class MpptChargerScenario(Scenario):
+    """
+    Scenario that models a solar charger (MPPT) charging a battery, and generates the values of several fields at once.
+    The sun rises and sets over a day, and the charger converts the available panel power into charge current until
+    the battery is full, going through the bulk, absorption and float stages.
+    For every value, all quantities are computed in one pass from the same state, so the fields are consistent within a
+    message. The value of the field that has the scenario is the quantity of its own key, and the other quantities are
+    put in the field values under their keys, so the fields of these keys need no scenarios of their own.
+    The scenario can only be used in text fields.
+
+    Example:
+    - type: MpptCharger
+      outputs: {V: V, I: I, VPV: VPV, PPV: PPV, CS: CS} # Default; key of the field of every quantity that is generated, quantities are V, I, P, VPV, PPV, CS and IL
+      day_length: 86400 # Default; length of a day and night in seconds
+      start: 0 # Default is 0, sunrise; time of the day in seconds of the first value
+      step_size: 1 # Default; seconds between two values
+      panel_power: 300 # Default; panel power in W in full sun
+      panel_voltage: 36000 # Default; panel voltage in mV at the maximum power point in full sun
+      battery_voltage: 12000 # Default; nominal battery voltage in mV
+      battery_capacity: 100 # Default; battery capacity in Ah
+      state_of_charge: 0.5 # Default; state of charge of the battery at the first value, between 0 and 1
+      max_current: 20000 # Default; maximum charge current in mA
+      load: 0 # Default; current in mA that a load draws from the battery
+      noise: 0.05 # Default; relative variation of the sun, for example caused by clouds
+    """
+
+    efficiency = 0.97  # Part of the panel power that is converted into charge power
+    absorption_charge = 0.85  # State of charge at which the charger switches from bulk to absorption
+    float_charge = 0.99  # State of charge at which the charger switches from absorption to float
+
+    def __init__(self, props={}, field_props={}):
+        super().__init__(props=props, field_props=field_props)
+        self.outputs = props.get('outputs', default_outputs)
+        self.day_length = props.get('day_length', 86400)
+        self.start = props.get('start', 0)
+        self.step_size = props.get('step_size', 1)
+        self.panel_power = props.get('panel_power', 300)
+        self.panel_voltage = props.get('panel_voltage', 36000)
+        self.battery_voltage = props.get('battery_voltage', 12000)
+        self.battery_capacity = props.get('battery_capacity', 100)
+        self.initial_charge = props.get('state_of_charge', 0.5)
+        self.max_current = props.get('max_current', 20000)
+        self.noise = props.get('noise', 0.05)
+        self.load = props.get('load', 0)
+        self.absorption_voltage = self.battery_voltage * 1.2
+        self.float_voltage = self.battery_voltage * 1.15
+        self.time = self.start  # Time of the day in seconds of the next value
+        self.charge = self.initial_charge  # State of charge of the battery
+        self.values = dict()  # key is a quantity, value is its value at the last generated value
+
+    def generate_next(self, field_values):
+        # Advance the model once per value, also when the value of the own field is generated again because it is
+        # invalid, and put the other quantities in the field values once
+        self.values = self.__step()
+        for key, quantity in self.outputs.items():
+            if key != self.key:
+                field_values.put_field_value(key, self.values[quantity])
+        return super().generate_next(field_values)
+
+    def _generate(self, field_values):
+        self.value = self.values.get(self.outputs.get(self.key, None), None)
+
+    def reset(self):
+        super().reset()
+        self.time = self.start
+        self.charge = self.initial_charge
+        self.values = dict()
+
+    def __step(self):
+        """
+        Compute the values of all quantities at the current time, and advance the time and the state of charge
+        :return: dict with the value of every quantity
+        :rtype: dict
+        """
+        sun = max(0.0, math.sin(2 * math.pi * self.time / self.day_length))
+        if sun > 0 and self.noise > 0:
+            sun = max(0.0, sun * (1 + self.rand.uniform(-self.noise, self.noise)))
+        available = self.panel_power * sun * self.efficiency  # Charge power in W the panel can deliver
+        # Open circuit voltage of the battery, which rises with its state of charge
+        rest_voltage = self.battery_voltage * (0.95 + 0.1 * self.charge)
+
+        if available < 1:
+            state, voltage, current = OFF, rest_voltage, 0.0
+        elif self.charge < self.absorption_charge:
+            state = BULK
+            voltage = rest_voltage + (self.absorption_voltage - rest_voltage) * self.charge / self.absorption_charge
+            current = min(available * 1e6 / voltage, self.max_current)
+        elif self.charge < self.float_charge:
+            state, voltage = ABSORPTION, self.absorption_voltage
+            # The current tapers off as the battery gets full
+            taper = (1 - self.charge) / (1 - self.absorption_charge)
+            current = min(available * 1e6 / voltage, self.max_current * taper)
+        else:
+            state, voltage, current = FLOAT, self.float_voltage, 0.0
+
+        power = voltage * current / 1e6
+        panel_power = power / self.efficiency
+        if sun > 0:
+            # The panel voltage moves towards the open circuit voltage when less power is drawn than available
+            unused = 1 - power / available if available > 0 else 1
+            panel_voltage = self.panel_voltage * (0.9 + 0.1 * sun + 0.2 * unused)
+        else:
+            panel_voltage = 0.0
+
+        charged = (current - self.load) * self.step_size / 3600 / 1000 / self.battery_capacity
+        self.charge = min(1.0, max(0.0, self.charge + charged))
+        self.time = (self.time + self.step_size) % self.day_length
+
+        return {
+            'V': round(voltage),
+            'I': round(current),
+            'P': round(power),
+            'VPV': round(panel_voltage),
+            'PPV': round(panel_power),
+            'CS': state,
+            'IL': round(self.load),
+        }
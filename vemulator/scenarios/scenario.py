@@ -5,6 +5,11 @@ from random import Random
 
 from ..util import hex, log
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class Scenario:
     """
@@ -60,13 +65,60 @@ class Scenario:
             # if still invalid, simply assume the previous value.
             self.logger.warning(f'could not generate valid value. Invalid value: {self.value}')
             self.value = old_value
+        self.__put_value(field_values)
+        return self.get_value()
+
+    def generate_batch(self, n, field_values):
+        """
+        Generate the next n values in a sequence defined by this Scenario at once.
+        Only the last value is put in the field values. If the scenario has an amount, at most the remaining amount of
+        values is generated.
+        Scenarios that implement _generate_batch() generate the values using NumPy, with a NumPy generator seeded
+        from the seed of the scenario, so the values differ from the values generate_next() would generate.
+        Other scenarios, and scenarios that fuzz or have invalid values, call generate_next() for every value.
+        :param n: amount of values to generate
+        :type n: int
+        :param field_values: values of other fields
+        :type: FieldValueList
+        :return: the new values
+        :rtype: numpy.ndarray or list
+        """
+        if self.amount is not None:
+            n = max(min(n, self.amount), 0)
+        values = None
+        if np is not None and n > 0 and not self.fuzzing and self.invalid is None:
+            values = self._generate_batch(n)
+        if values is None:
+            return [self.generate_next(field_values) for _ in range(n)]
+
+        if self.amount is not None:
+            self.amount -= n
+        self.value = values[-1].item()
+        self.__put_value(field_values)
+        return values
+
+    def _batch_random(self):
+        """
+        Get the NumPy generator of the scenario, which is seeded from the seed of the scenario
+        :return: the generator
+        :rtype: numpy.random.Generator
+        """
+        if self.batch_rand is None:
+            self.batch_rand = np.random.default_rng(self.seed % 2 ** 64)
+        return self.batch_rand
+
+    def __put_value(self, field_values):
+        """
+        Put the value of the scenario in the field values
+        :param field_values: values of other fields
+        :type: FieldValueList
+        """
         if self.protocol == 'text':
             field_values.put_field_value(self.key, self.value)
         elif self.protocol == 'hex':
             key_string = hex.int_to_hex_string(self.key, 2, little_endian=False)
             field_values.put_field_value('H0x' + key_string, self.value)
             field_values.put_hex_field_value(self.key, self.get_hex_value())
-        return self.get_value()
 
     def set_field_props(self, field_props):
         """
@@ -110,6 +162,7 @@ class Scenario:
         self.async_change = props.get('async_change', False)
         self.writable = props.get('writable', False)
         self.rand = Random(self.seed)
+        self.batch_rand = None
         self.initial_amount = self.amount
         self.protocol = props.get('protocol', 'text')
         self.invalid = props.get('invalid', None)
@@ -144,6 +197,30 @@ class Scenario:
         return hex.value_to_hex_string(self.value, math.ceil(self.bits / 8),
                                        self.signed) if self.value is not None else None
 
+    def get_domain(self):
+        """
+        Get all values the scenario can generate, for scenarios that only generate a few known values.
+        Sub classes that choose from a fixed set of values should override this method.
+        :return: list of values, or None if the values are not known in advance
+        :rtype: list or None
+        """
+        return None
+
+    def get_hex_domain(self):
+        """
+        Get all hex values the scenario can generate
+        :return: list of hex encoded values, or None if the values are not known in advance
+        :rtype: list or None
+        """
+        domain = self.get_domain()
+        if domain is None or self.bits is None:
+            return None
+        try:
+            return [hex.value_to_hex_string(value, math.ceil(self.bits / 8), self.signed) for value in domain]
+        except OverflowError:
+            # A value does not fit in the field, which is reported when it is generated
+            return None
+
     def _generate(self, field_values):
         """
         Internal method which should be implemented by sub classes.
@@ -168,6 +245,17 @@ class Scenario:
         # self.rand = Random(self.seed)  # this is probably not desirable, but if necessary, this can be reset.
         self.value = None
 
+    def _generate_batch(self, n):
+        """
+        Internal method which can be implemented by sub classes to generate n values at once using NumPy.
+        It is only called when NumPy is available.
+        :param n: amount of values to generate, at least 1
+        :type n: int
+        :return: the values, or None if the values can not be generated at once
+        :rtype: numpy.ndarray or None
+        """
+        return None
+
     def _fuzz(self, field_values):
         """
         Replace the value of the Scenario with a fuzzed value. Fuzzing includes values that are either
@@ -14,6 +14,9 @@ class StringChoiceScenario(Scenario):
         super().__init__(props=props, field_props=field_props)
         self.choices = props.get('choices', [''])
 
+    def get_domain(self):
+        return list(self.choices)
+
     def _generate(self, field_values):
         self.value = self.rand.choice(self.choices)
 
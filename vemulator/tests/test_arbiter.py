@@ -0,0 +1,92 @@
+import time
+import unittest
+
+from vemulator.output.arbiter import OutputArbiter
+from vemulator.output.outputinterface import OutputInterface
+from vemulator.output.pacer import Link
+from vemulator.util.clock import VirtualClock
+
+
+class ListOutput(OutputInterface):
+    def __init__(self):
+        """
+        Output that stores the written messages in a list
+        """
+        self.messages = []
+
+    def available(self) -> bool:
+        return True
+
+    def write(self, data) -> bool:
+        self.messages.append(data)
+        return True
+
+
+class ArbiterTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.output = ListOutput()
+        # At 1000 baud, a message of 10 bytes takes 0.1 seconds to transmit
+        self.arbiter = OutputArbiter(self.output, baud_rate=1000)
+
+    def write_first(self, data):
+        """
+        Write a message and wait until the arbiter is transmitting it
+        :param data: message
+        :type data: bytes
+        """
+        self.arbiter.write(data)
+        while len(self.output.messages) == 0:
+            time.sleep(0.001)
+
+    def test_priority(self):
+        """
+        Test that hex responses are written before queued text frames, without interrupting the current frame
+        """
+        self.write_first(b'\r\nV\t1\r\nA\t1')
+        self.arbiter.write(b'\r\nV\t2\r\nA\t2')
+        self.arbiter.write(b':154\n')
+        self.arbiter.write(b':A01020003\n')
+        self.arbiter.flush()
+
+        self.assertEqual([b'\r\nV\t1\r\nA\t1', b':154\n', b':A01020003\n', b'\r\nV\t2\r\nA\t2'], self.output.messages)
+        statistics = self.arbiter.get_statistics()
+        self.assertEqual(2, statistics['text'])
+        self.assertEqual(1, statistics['responses'])
+        self.assertEqual(1, statistics['async'])
+        self.assertEqual(36, statistics['transmitted'])
+        self.assertGreater(statistics['utilisation'], 0)
+
+    def test_replace_async(self):
+        """
+        Test that a queued async message is replaced by a newer message for the same register
+        """
+        self.write_first(b'\r\nV\t1\r\nA\t1')
+        self.arbiter.write(b':A01020001\n')
+        self.arbiter.write(b':A01020002\n')
+        self.arbiter.write(b':A03040001\n')
+        self.arbiter.flush()
+
+        self.assertEqual([b'\r\nV\t1\r\nA\t1', b':A01020002\n', b':A03040001\n'], self.output.messages)
+        self.assertEqual(1, self.arbiter.get_statistics()['replaced'])
+
+    def test_virtual_clock(self):
+        """
+        Test that messages are written immediately when using a virtual clock
+        """
+        arbiter = OutputArbiter(self.output, baud_rate=1000, clock=VirtualClock())
+        arbiter.write(b'\r\nV\t1\r\nA\t1')
+        arbiter.write(b':154\n')
+        self.assertEqual([b'\r\nV\t1\r\nA\t1', b':154\n'], self.output.messages)
+
+    def test_shared_link(self):
+        """
+        Test that the messages of the arbiter are accounted on a given link, once
+        """
+        clock = VirtualClock()
+        link = Link(1000, clock=clock)
+        arbiter = OutputArbiter(self.output, link=link)
+        arbiter.write(b'\r\nV\t1\r\nA\t1')
+        arbiter.write(b':154\n')
+        self.assertEqual(15, link.get_statistics()['transmitted'])
+        self.assertAlmostEqual(15 * 10 / 1000, link.backlog())  # 15 bytes of 10 bits at 1000 baud
+        self.assertEqual(15, arbiter.get_statistics()['transmitted'])
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import unittest
+
+from vemulator.configuration.config import EmulatorConfig
+from vemulator.emulator.emulator import Emulator
+from vemulator.input.streaminput import StreamInput
+from vemulator.output.outputinterface import OutputInterface
+
+
+class ListOutput(OutputInterface):
+    def __init__(self):
+        """
+        Output that stores the written messages in a list
+        """
+        self.messages = []
+
+    def available(self) -> bool:
+        return True
+
+    def write(self, data) -> bool:
+        self.messages.append(data)
+        return True
+
+
+class AsyncEmulatorTestCase(unittest.TestCase):
+    emulator_config = """
+    device: Device
+    name: AsyncTest
+    protocol: text_hex
+    version: 0x1234
+    product_id: 0x5678
+    fields:
+      - name: Voltage
+        key: V
+        values:
+          - type: IntFixed
+            value: 1
+    hex_fields:
+      - name: Voltage
+        key: 0x1234
+        values:
+          - type: IntFixed
+            value: 0xF00F
+            bits: 16
+    """
+
+    def setUp(self) -> None:
+        self.config = EmulatorConfig()
+        self.config.set_config(self.emulator_config)
+        self.config.set_delay(10)
+        self.config.set_stop_condition('none')
+        self.config.create_scenarios()
+
+        self.read_fd, self.write_fd = os.pipe()
+        self.input = StreamInput(self.read_fd)
+        self.config.set_input(self.input)
+        self.output = ListOutput()
+        self.config.set_output(self.output)
+        self.emulator = Emulator(self.config)
+
+    def tearDown(self) -> None:
+        self.input.close()
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+    def test_respond_between_ticks(self):
+        """
+        Test that a hex message is answered as soon as it arrives, instead of at the next tick
+        """
+        async def scenario():
+            task = asyncio.create_task(self.emulator.arun())
+            await asyncio.sleep(0.05)
+            self.assertEqual(1, len(self.output.messages))  # The first text frame
+
+            os.write(self.write_fd, b':154\n')  # Ping
+            await asyncio.sleep(0.05)
+            self.emulator.stop()
+            await asyncio.wait_for(task, 1)
+
+        asyncio.run(scenario())
+        self.assertEqual(2, len(self.output.messages))
+        self.assertEqual(b':53412', self.output.messages[1][:6])
+        self.assertEqual(1, self.emulator.ticks)
+        self.assertEqual('stopped', self.emulator.get_status())
+
+    def test_pause(self):
+        """
+        Test that a paused emulator on an event loop waits until it is resumed
+        """
+        async def scenario():
+            self.emulator.pause()
+            task = asyncio.create_task(self.emulator.arun())
+            await asyncio.sleep(0.05)
+            self.assertEqual('paused', self.emulator.get_status())
+            self.assertEqual(0, len(self.output.messages))
+
+            self.emulator.resume()
+            await asyncio.sleep(0.05)
+            self.assertEqual(1, len(self.output.messages))
+            self.emulator.stop()
+            await asyncio.wait_for(task, 1)
+
+        asyncio.run(scenario())
+        self.assertEqual('stopped', self.emulator.get_status())
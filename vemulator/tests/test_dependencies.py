@@ -0,0 +1,105 @@
+import unittest
+
+from vemulator.emulator.dependencies import DependencyGraph, DependencyException, field_dependencies, field_name
+from vemulator.scenarios.arithmetic import ArithmeticScenario
+from vemulator.scenarios.loop import LoopParentScenario
+from vemulator.scenarios.mpptcharger import MpptChargerScenario
+from vemulator.util.config_checker import check_config_dependencies, ConfigException
+
+
+class DependencyGraphTestCase(unittest.TestCase):
+    def test_order(self):
+        """
+        Test that fields are ordered after the fields they reference, and otherwise keep their order
+        """
+        graph = DependencyGraph({'P': {'V', 'I'}, 'V': set(), 'CS': set(), 'I': set()})
+        self.assertEqual(['I', 'V', 'P', 'CS'], graph.order)
+        graph = DependencyGraph({'V': set(), 'I': set(), 'P': {'V', 'I'}, 'E': {'P'}})
+        self.assertEqual(['V', 'I', 'P', 'E'], graph.order)
+
+    def test_self_reference(self):
+        """
+        Test that a field that references its own previous value is not a cycle
+        """
+        graph = DependencyGraph({'E': {'E', 'P'}, 'P': set()})
+        self.assertEqual(['P', 'E'], graph.order)
+
+    def test_cycle(self):
+        """
+        Test that fields that reference each other are rejected
+        """
+        with self.assertRaises(DependencyException) as context:
+            DependencyGraph({'A': {'B'}, 'B': {'C'}, 'C': {'A'}})
+        self.assertIn('A -> B -> C -> A', str(context.exception))
+
+    def test_dirty(self):
+        """
+        Test that derived fields are dirty until computed, and again once a referenced field changes
+        """
+        graph = DependencyGraph({'V': set(), 'I': set(), 'P': {'V', 'I'}, 'E': {'P'}})
+        self.assertTrue(graph.is_dirty('P'))
+        self.assertFalse(graph.is_dirty('V'))
+        graph.clean('P')
+        graph.clean('E')
+        self.assertFalse(graph.is_dirty('P'))
+        graph.changed('V')
+        self.assertTrue(graph.is_dirty('P'))
+        self.assertFalse(graph.is_dirty('E'))
+        graph.changed('P')
+        self.assertTrue(graph.is_dirty('E'))
+
+    def test_written_fields(self):
+        """
+        Test that fields of which the value is put by the scenario of another field are ordered after that field
+        """
+        text_fields = {
+            'W': [[], [ArithmeticScenario({'value': 'V * I'}, {'key': 'W'})]],
+            'I': [[], []],
+            'V': [[], [MpptChargerScenario({'outputs': {'V': 'V', 'I': 'I'}}, {'key': 'V'})]],
+        }
+        graph = DependencyGraph.from_scenarios(text_fields, {})
+        self.assertEqual(['V', 'I', 'W'], graph.order)
+
+    def test_config_dependencies(self):
+        """
+        Test that the scenario dicts of a config and the scenarios created from them result in the same dependencies
+        """
+        config_fields = [
+            ('W', [{'type': 'Loop', 'amount': 1, 'values': [{'type': 'Arithmetic', 'value': 'V * I'}]}]),
+            ('I', []),
+            ('V', [{'type': 'MpptCharger', 'outputs': {'V': 'V', 'I': 'I'}}]),
+        ]
+        scenario_fields = [
+            ('W', [LoopParentScenario({'amount': 1, 'values': [ArithmeticScenario({'value': 'V * I'}, {'key': 'W'})]},
+                                      {'key': 'W'})]),
+            ('I', []),
+            ('V', [MpptChargerScenario({'outputs': {'V': 'V', 'I': 'I'}}, {'key': 'V'})]),
+        ]
+        expected = {'W': {'V', 'I'}, 'I': {'V'}, 'V': set()}
+        self.assertEqual(expected, field_dependencies([(name, [values]) for name, values in config_fields]))
+        self.assertEqual(expected, field_dependencies([(name, [values]) for name, values in scenario_fields]))
+
+    def test_field_name(self):
+        """
+        Test the names by which Arithmetic expressions reference text and hex fields
+        """
+        self.assertEqual('V', field_name('text', 'V'))
+        self.assertEqual('H0xEDF0', field_name('hex', 0xEDF0))
+
+    def test_config_cycle(self):
+        """
+        Test that the config checker rejects Arithmetic fields that reference each other
+        """
+        config = {
+            'fields': [
+                {'key': 'A', 'values': [{'type': 'Arithmetic', 'value': 'B + 1'}]},
+                {'key': 'B', 'values': [{'type': 'Arithmetic', 'value': 'A + 1'}]},
+            ]
+        }
+        self.assertRaises(ConfigException, check_config_dependencies, 'test.yaml', config)
+        config['fields'][1]['values'][0]['value'] = 'B + 1'
+        check_config_dependencies('test.yaml', config)
+
+
+if __name__ == '__main__':
+    unittest.main()
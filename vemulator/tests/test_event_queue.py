@@ -0,0 +1,177 @@
+import datetime
+import unittest
+from unittest import mock
+
+from vemulator.configuration.config import EmulatorConfig
+from vemulator.emulator.emulator import Emulator
+from vemulator.output.outputinterface import OutputInterface
+from vemulator.util.clock import VirtualClock
+
+
+class LazyEventQueueTestCase(unittest.TestCase):
+    emulator_config = """
+    device: Device
+    name: LazyTest
+    protocol: text_hex
+    version: 0x1234
+    product_id: 0x5678
+    fields:
+      - name: Gradient
+        key: G
+        interval: 2
+        values:
+          - type: Gradient
+            min: 0
+            max: 100
+      - name: Random
+        key: R
+        interval: 1
+        values:
+          - type: IntRandom
+            min: 0
+            max: 10
+    hex_fields:
+      - name: Gradient
+        key: 0x1234
+        values:
+          - type: Gradient
+            min: 0
+            max: 100
+            bits: 16
+    """
+
+    def setUp(self) -> None:
+        self.config = EmulatorConfig()
+        self.config.set_config(self.emulator_config)
+        self.config.set_timed(True)
+        self.config.set_event_engine('lazy')
+        self.config.create_scenarios()
+
+        self.output = mock.create_autospec(OutputInterface)
+        self.output.available.return_value = True
+        self.config.set_output(self.output)
+
+        self.emulator = Emulator(self.config)
+        self.event_queue = self.emulator.event_queue
+        self.event_queue.start()
+
+    def tearDown(self) -> None:
+        self.event_queue.stop()
+
+    def __pass_time(self, key, seconds):
+        """
+        Pretend that the last value of a field has been generated some time ago
+        :param key: field key
+        :type key: str or int
+        :param seconds: time in seconds
+        :type seconds: float
+        """
+        self.event_queue.generated_at[key] -= datetime.timedelta(seconds=seconds)
+
+    def test_catch_up_on_read(self):
+        """
+        Test that a field generates the values of all passed intervals as soon as it is read
+        """
+        self.assertEqual(0, self.emulator.field_values.get_field_value('G'))
+        self.__pass_time('G', 7)
+        self.assertEqual(3, self.emulator.field_values.get_field_value('G'))  # 3 intervals of 2 seconds have passed
+        self.assertEqual(3, self.emulator.field_values.get_field_value('G'))
+
+    def test_idle_fields_do_not_generate(self):
+        """
+        Test that fields that are not read do not generate values, and that hex reads catch up hex fields
+        """
+        self.__pass_time('G', 4)
+        self.__pass_time(0x1234, 4)
+        self.assertEqual('0000', self.emulator.field_values.hex_formatted_field_values[0x1234])
+        self.assertEqual('0400', self.emulator.field_values.get_hex_field_value(0x1234))
+        self.assertEqual(0, self.emulator.field_values.field_values['G'])
+
+    def test_long_idle_gap(self):
+        """
+        Test that a field that has not been read for a long time generates the values of the passed intervals at once,
+        and at most the remaining amount of values
+        """
+        self.__pass_time('G', 10 ** 6)
+        self.assertEqual(99, self.emulator.field_values.get_field_value('G'))
+        self.assertEqual([], self.emulator.get_field_scenarios('G'))
+
+        scenario = self.emulator.get_field_scenarios('R')[0]
+        self.__pass_time('R', 10 ** 6)
+        with mock.patch.object(scenario, 'generate_next', wraps=scenario.generate_next) as generate_next:
+            self.assertIn(self.emulator.field_values.get_field_value('R'), range(0, 11))
+        generate_next.assert_not_called()
+        behind = self.emulator.clock.now() - self.event_queue.generated_at['R']
+        self.assertLess(behind, datetime.timedelta(seconds=1))
+
+    def test_no_interval(self):
+        """
+        Test that a field without an interval and without an amount generates one value every time it is read
+        """
+        self.event_queue.stop()
+        config = EmulatorConfig()
+        config.set_config("""
+            device: Device
+            name: NoIntervalTest
+            protocol: text
+            fields:
+              - name: Counter
+                key: C
+                interval: 0
+                values:
+                  - type: Gradient
+                    min: 0
+                    max: 1000000
+            """)
+        config.set_timed(True)
+        config.set_event_engine('lazy')
+        config.create_scenarios()
+        config.set_output(self.output)
+        emulator = Emulator(config)
+        self.event_queue = emulator.event_queue
+        self.event_queue.start()
+
+        first = emulator.field_values.get_field_value('C')
+        self.assertEqual(first + 1, emulator.field_values.get_field_value('C'))
+        self.assertEqual(first + 2, emulator.field_values.get_field_value('C'))
+
+
+class VirtualClockTestCase(unittest.TestCase):
+    def test_timed_virtual_clock(self):
+        """
+        Test that timed mode with a virtual clock produces the values of 19 seconds of emulation without waiting
+        """
+        config = EmulatorConfig()
+        config.set_config("""
+            device: Device
+            name: VirtualClockTest
+            protocol: text
+            fields:
+              - name: Gradient
+                key: G
+                interval: 2
+                values:
+                  - type: Gradient
+                    min: 0
+                    max: 10
+              - name: Voltage
+                key: V
+                values:
+                  - type: IntFixed
+                    amount: 20
+                    value: 1
+            """)
+        config.set_delay(1)
+        config.set_timed(True)
+        config.set_clock(VirtualClock())
+        config.create_scenarios()
+        output = mock.create_autospec(OutputInterface)
+        output.available.return_value = True
+        config.set_output(output)
+
+        emulator = Emulator(config)
+        emulator.run()
+
+        values = [args.args[0].split(b'\r\n')[1] for args in output.write.call_args_list]
+        self.assertEqual([b'G\t%d' % (second // 2) for second in range(19)], values)
+        self.assertEqual(19, emulator.run_time)
@@ -0,0 +1,37 @@
+import unittest
+
+from vemulator.util.expression import Expression, ExpressionException
+
+
+class ExpressionTestCase(unittest.TestCase):
+    def test_evaluate(self):
+        """
+        Test evaluating an expression, which only reads the variables it references
+        """
+        expression = Expression('V * I / 1000 + max(0, round(sqrt(x)))')
+        self.assertEqual(['I', 'V', 'x'], expression.names)
+        variables = {'V': 12000, 'I': 500, 'x': 16, 'CS': 3}
+        self.assertEqual(6004.0, expression.evaluate(variables))
+        self.assertEqual({'V': 12000, 'I': 500, 'x': 16, 'CS': 3}, variables)
+        self.assertRaises(NameError, expression.evaluate, {'V': 1})
+
+    def test_evaluate_traced(self):
+        """
+        Test that every intermediate result of an expression is traced
+        """
+        intermediate = []
+
+        def trace(value):
+            intermediate.append(value)
+            return value
+
+        self.assertEqual(10, Expression('abs(-x) * 2 + 4').evaluate_traced({'x': 3}, trace))
+        self.assertEqual([-3, 3, 6, 10], intermediate)
+
+    def test_unsafe(self):
+        """
+        Test that expressions that could do more than arithmetic are rejected
+        """
+        for source in ['__import__("os")', 'x.__class__', '(lambda: 1)()', '[1][0]', '_x', 'open("file")', 'x +']:
+            self.assertRaises(ExpressionException, Expression, source)
+        self.assertRaises(ExpressionException, Expression, 'y * 2', ['x'])
@@ -19,3 +19,13 @@ class FieldValueListTestCase(unittest.TestCase):
 
         values.put_hex_field_value('A', '0A')
         self.assertEqual('0A', values.get_hex_field_value('A'))
+
+    def test_hex_field_version(self):
+        """
+        Test that the version of a hex field increments every time a value is put
+        """
+        values = FieldValueList()
+        self.assertEqual(0, values.get_hex_field_version(0x0100))
+        values.put_hex_field_value(0x0100, '0A')
+        values.put_hex_field_value(0x0100, '0A')
+        self.assertEqual(2, values.get_hex_field_version(0x0100))
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from vemulator.input.fileinput import FileInput
+
+
+class FileInputTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'input.txt')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def append(self, data):
+        with open(self.path, 'ab') as file:
+            file.write(data)
+
+    def test_missing_file(self):
+        """
+        Test that a file that does not exist is not available
+        """
+        file_input = FileInput(self.path)
+        self.assertFalse(file_input.available())
+        self.assertFalse(file_input.has_data())
+
+    def test_tail(self):
+        """
+        Test that lines written while the file is read are returned once they are complete
+        """
+        self.append(b':154\n:35')
+        file_input = FileInput(self.path)
+        self.assertTrue(file_input.has_data())
+        self.assertEqual(b':154\n', file_input.readline())
+        self.assertFalse(file_input.has_data())
+
+        self.append(b'2\n:451\n')
+        self.assertEqual(b':352\n:451\n', file_input.read())
+        self.assertFalse(file_input.has_data())
+        self.assertEqual(b'', file_input.readline())
+        file_input.close()
+
+    def test_truncate(self):
+        """
+        Test that the file is read from the beginning again after it has been truncated
+        """
+        self.append(b':154\n:352\n')
+        file_input = FileInput(self.path)
+        self.assertEqual(b':154\n:352\n', file_input.read())
+        with open(self.path, 'wb') as file:
+            file.write(b':451\n')
+        self.assertEqual(b':451\n', file_input.readline())
+        file_input.close()
+
+    def test_last_line_without_newline(self):
+        """
+        Test that a last line without a newline is returned, with a newline, once the file has not grown for a while
+        """
+        self.append(b':154\n:352')
+        file_input = FileInput(self.path)
+        file_input.flush_time = 0
+        self.assertEqual(b':154\n', file_input.read())
+        self.assertEqual(b':352\n', file_input.read())
+        self.assertFalse(file_input.has_data())
+        file_input.close()
@@ -0,0 +1,96 @@
+import threading
+import unittest
+from unittest import mock
+
+from vemulator.configuration.config import EmulatorConfig
+from vemulator.fleet.fleet import Fleet
+from vemulator.output.outputinterface import OutputInterface
+from vemulator.util.clock import Clock, VirtualClock
+
+
+class FleetTestCase(unittest.TestCase):
+    emulator_config = """
+    device: Device
+    name: FleetTest
+    protocol: text
+    fields:
+      - name: Voltage
+        key: V
+        values:
+          - type: IntRandom
+            amount: 10
+            min: 0
+            max: 1000
+    """
+
+    def setUp(self) -> None:
+        self.fleet = Fleet(VirtualClock())
+        self.outputs = []
+        for i in range(3):
+            config = EmulatorConfig()
+            config.set_config(self.emulator_config)
+            config.set_delay(1)
+            config.set_default_seed(i)
+            config.create_scenarios()
+            output = mock.create_autospec(OutputInterface)
+            output.available.return_value = True
+            self.outputs.append(output)
+            self.fleet.add_emulator(f'device{i}', config, output)
+
+    def test_fleet(self):
+        """
+        Test that every emulator in a fleet writes its own messages to its own output
+        """
+        self.fleet.run()
+
+        messages = [[args.args[0] for args in output.write.call_args_list] for output in self.outputs]
+        for device_messages in messages:
+            self.assertEqual(10, len(device_messages))
+        self.assertNotEqual(messages[0], messages[1])  # Every emulator has its own field values
+
+        report = self.fleet.get_report()
+        self.assertEqual(30, report['messages'])
+        self.assertEqual(sum(len(message) for device_messages in messages for message in device_messages),
+                         report['bytes'])
+        for name in ['device0', 'device1', 'device2']:
+            self.assertEqual('stopped', report['emulators'][name]['status'])
+            self.assertEqual(10, report['emulators'][name]['run_time'])
+
+    def test_stop_emulator(self):
+        """
+        Test that a single emulator in a fleet can be stopped
+        """
+        self.fleet.stop('device1')
+        self.fleet.run()
+        self.assertEqual(0, self.outputs[1].write.call_count)
+        self.assertEqual(10, self.outputs[0].write.call_count)
+
+    def test_fleet_without_delay(self):
+        """
+        Test that a fleet of emulators without a delay, which skip overdue ticks, runs until all values are generated
+        """
+        # A real clock advances while a tick executes, such that every next tick is overdue
+        fleet = Fleet(Clock())
+        outputs = []
+        for i in range(2):
+            config = EmulatorConfig()
+            config.set_config(self.emulator_config)
+            config.set_delay(0)
+            config.set_overrun_policy('skip')
+            config.set_default_seed(i)
+            config.create_scenarios()
+            output = mock.create_autospec(OutputInterface)
+            output.available.return_value = True
+            outputs.append(output)
+            fleet.add_emulator(f'device{i}', config, output)
+
+        thread = threading.Thread(target=fleet.run, daemon=True)
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+        report = fleet.get_report()
+        for i, name in enumerate(['device0', 'device1']):
+            self.assertEqual(10, outputs[i].write.call_count)
+            self.assertEqual(0, report['emulators'][name]['overruns'])
+            self.assertEqual(0, report['emulators'][name]['skipped'])
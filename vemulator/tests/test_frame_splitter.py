@@ -0,0 +1,32 @@
+import unittest
+
+from vemulator.input.frame_splitter import HexFrameSplitter
+
+
+class HexFrameSplitterTestCase(unittest.TestCase):
+    def test_split(self):
+        """
+        Test splitting a burst of frames that arrives in a single chunk
+        """
+        splitter = HexFrameSplitter()
+        self.assertEqual([b':154\n', b':352\n', b':451\n'], splitter.feed(b':154\n:352\n:451\n'))
+
+    def test_partial(self):
+        """
+        Test that a frame which arrives in multiple chunks is kept until it is complete
+        """
+        splitter = HexFrameSplitter()
+        self.assertEqual([], splitter.feed(b':7341'))
+        self.assertEqual([], splitter.feed(b'2000'))
+        self.assertEqual([b':734120008\n', b':154\n'], splitter.feed(b'8\n:154\n:35'))
+        self.assertEqual([b':352\n'], splitter.feed(b'2\n'))
+
+    def test_noise(self):
+        """
+        Test that data outside of frames and null bytes are discarded, and that a cut off frame is skipped
+        """
+        splitter = HexFrameSplitter()
+        self.assertEqual([b':154\n'], splitter.feed(b'noise\n:1\x005\x004\n'))
+        self.assertEqual([b':352\n'], splitter.feed(b':73412:352\n'))
+        splitter.feed(b':' + b'0' * (HexFrameSplitter.max_length + 1))
+        self.assertEqual([], splitter.feed(b'\n'))
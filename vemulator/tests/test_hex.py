@@ -45,4 +45,31 @@ class HexTestCase(unittest.TestCase):
         Test the hex.string_to_hex_string function
         """
         self.assertEqual(hex.string_to_hex_string('Test'), '54657374')
-        self.assertEqual(hex.string_to_hex_string('Test', 6), '546573740000')
\ No newline at end of file
+        self.assertEqual(hex.string_to_hex_string('Test', 6), '546573740000')
+
+    def test_clean_frame(self):
+        """
+        Test the hex.clean_frame function
+        """
+        self.assertEqual(hex.clean_frame(b':7f0ed0071\r\n'), b'7F0ED0071')
+        self.assertEqual(hex.clean_frame(memoryview(b':1 54\n')), b'154')
+
+    def test_frame_checksum_valid(self):
+        """
+        Test the hex.frame_checksum_valid function
+        """
+        self.assertTrue(hex.frame_checksum_valid(b'154'))
+        self.assertTrue(hex.frame_checksum_valid(b'12340F'))
+        self.assertFalse(hex.frame_checksum_valid(b'12340E'))
+        self.assertFalse(hex.frame_checksum_valid(b'5'))
+        for digits in ['154', '7F0ED0071', 'A0102000543', '55', '5']:
+            self.assertEqual(hex.frame_checksum_valid(digits.encode()), hex.check_checksum(digits))
+
+    def test_build_frame(self):
+        """
+        Test the hex.build_frame function
+        """
+        self.assertEqual(hex.build_frame(b'1'), b':154\n')
+        self.assertEqual(hex.build_frame(b'7', b'F0ED00'), hex.create_message(7, 'F0ED00'))
+        self.assertEqual(hex.int_to_hex_bytes(0xAB12, 4), b'12AB0000')
+        self.assertEqual(hex.int_to_hex_bytes(-2, 2, signed=True), b'FEFF')
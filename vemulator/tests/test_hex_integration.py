@@ -1,10 +1,15 @@
+import os
+import time
 import unittest
+from threading import Thread
 from unittest import mock
 
 from vemulator.configuration.config import EmulatorConfig
 from vemulator.emulator.emulator import Emulator
+from vemulator.input.streaminput import StreamInput
 from vemulator.input.testinput import TestInput
 from vemulator.output.outputinterface import OutputInterface
+from vemulator.scenarios.intfixed import IntFixedScenario
 
 
 class HexIntegrationTestCase(unittest.TestCase):
@@ -110,6 +115,17 @@ class HexIntegrationTestCase(unittest.TestCase):
         self.emulator.run()
         self.output.write.assert_any_call(b':73412000FF009\n')
 
+    def test_get_cached(self):
+        """
+        Try getting a field twice, which responds with the cached response the second time
+        """
+        self.input.writeline(b':734120008\n')
+        self.input.writeline(b':734120008\n')
+        self.emulator.run()
+        responses = [call.args[0] for call in self.output.write.call_args_list if call.args[0][:2] == b':7']
+        self.assertEqual([b':73412000FF009\n'] * 2, responses)
+        self.assertIs(responses[0], self.emulator.registers.get(0x1234).get_responses['0FF0'])
+
     def test_get_not_exists(self):
         """
         Try getting a non-existing field
@@ -118,6 +134,24 @@ class HexIntegrationTestCase(unittest.TestCase):
         self.emulator.run()
         self.output.write.assert_any_call(b':712340107\n')
 
+    def test_set_lower_case(self):
+        """
+        Try setting a writable field using lower case hex digits
+        """
+        self.input.writeline(b':8351200abcd8e\n')
+        self.emulator.run()
+        self.output.write.assert_any_call(b':8351200ABCD8E\n')
+
+    def test_get_overwritten_field(self):
+        """
+        Try getting a field that only exists because its scenarios have been overwritten
+        """
+        scenario = IntFixedScenario({'value': 0xAB, 'amount': 1}, {'key': 0x1240, 'protocol': 'hex', 'bits': 8})
+        self.emulator.overwrite_hex_scenarios(0x1240, [scenario])
+        self.input.writeline(b':7401200FC\n')
+        self.emulator.run()
+        self.output.write.assert_any_call(b':7401200AB51\n')
+
     def test_set_writable(self):
         """
         Try writing to a writable hex field
@@ -126,6 +160,15 @@ class HexIntegrationTestCase(unittest.TestCase):
         self.emulator.run()
         self.output.write.assert_any_call(b':83512001234C0\n')
 
+    def test_set_then_get(self):
+        """
+        Try getting a field after setting it, which responds with the value that has been set
+        """
+        self.input.writeline(b':83512001234C0\n')
+        self.input.writeline(b':735120007\n')
+        self.emulator.run()
+        self.output.write.assert_any_call(b':73512001234C1\n')
+
     def test_set_not_writable(self):
         """
         Try writing to a read-only hex field
@@ -208,3 +251,65 @@ class HexIntegrationTestCase(unittest.TestCase):
         self.input.writeline(b':734120008\n')
         emulator.run()
         self.output.write.assert_any_call(b':73412000FF009\n')
+
+    def test_respond_between_text_messages(self):
+        """
+        Test that hex messages on an input with a file descriptor are answered as soon as they arrive,
+        instead of once per text message
+        """
+        read_fd, write_fd = os.pipe()
+        stream_input = StreamInput(read_fd)
+        self.config.set_input(stream_input)
+        self.config.set_delay(0.5)
+        self.config.set_stop_condition('none')
+        emulator = Emulator(self.config)
+
+        thread = Thread(target=emulator.run, daemon=True)
+        thread.start()
+        time.sleep(0.05)
+        os.write(write_fd, b':154\n')  # Ping
+        for _ in range(100):
+            if self.output.write.call_count >= 2:
+                break
+            time.sleep(0.01)
+        emulator.stop()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+
+        self.output.write.assert_any_call(b':534120A\n')
+        self.assertEqual(1, emulator.ticks)  # Answered before the second text message
+        stream_input.close()
+        os.close(read_fd)
+        os.close(write_fd)
+
+    def test_respond_to_burst(self):
+        """
+        Test that a burst of hex messages is answered, also when a message arrives in multiple parts
+        """
+        read_fd, write_fd = os.pipe()
+        stream_input = StreamInput(read_fd)
+        self.config.set_input(stream_input)
+        self.config.set_delay(0.5)
+        self.config.set_stop_condition('none')
+        emulator = Emulator(self.config)
+
+        thread = Thread(target=emulator.run, daemon=True)
+        thread.start()
+        time.sleep(0.05)
+        os.write(write_fd, b':154\n:451\n:35')  # Ping, product id and the start of app version
+        time.sleep(0.05)
+        os.write(write_fd, b'2\n')
+        for _ in range(100):
+            if self.output.write.call_count >= 4:
+                break
+            time.sleep(0.01)
+        emulator.stop()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+
+        self.output.write.assert_any_call(b':534120A\n')
+        self.output.write.assert_any_call(b':1785686\n')
+        self.output.write.assert_any_call(b':134120E\n')
+        stream_input.close()
+        os.close(read_fd)
+        os.close(write_fd)
@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+from vemulator.output.impairedoutput import ImpairedOutput
+from vemulator.output.outputinterface import OutputInterface
+from vemulator.util import impairment
+from vemulator.util.impairment import Impairment
+
+
+class ImpairmentTestCase(unittest.TestCase):
+    frame = b'\r\nV\t12800\r\nI\t-10\r\nPID\t0xA053\r\nChecksum\t\x00' * 10
+
+    def test_bit_errors(self):
+        """
+        Test that independent bit errors are reproducible and occur at the bit error rate, with and without NumPy
+        """
+        for numpy in [impairment.np, None]:
+            with mock.patch.object(impairment, 'np', numpy):
+                frames = [Impairment(bit_error_rate=0.01, seed=1).apply(self.frame) for _ in range(2)]
+                self.assertEqual(frames[0], frames[1])
+                self.assertEqual(len(self.frame), len(frames[0]))
+
+                link = Impairment(bit_error_rate=0.01, seed=1)
+                for _ in range(100):
+                    link.apply(self.frame)
+                flipped = link.get_statistics()['flipped']
+                self.assertTrue(0.008 < flipped / (100 * len(self.frame) * 8) < 0.012)
+
+    def test_bursts(self):
+        """
+        Test that errors are clustered in bursts using the Gilbert-Elliott model
+        """
+        link = Impairment(burst_start=0.001, burst_end=0.05, burst_error_rate=0.5, seed=2)
+        corrupted = [link.apply(self.frame) != self.frame for _ in range(200)]
+        # Bursts of about 20 bits every 1000 bits corrupt only a part of the frames of about 3300 bits
+        self.assertTrue(any(corrupted))
+        self.assertTrue(0.5 < link.get_statistics()['flipped'] / (200 * len(self.frame) * 8 * 0.02 * 0.5) < 2)
+
+    def test_drop_insert_truncate(self):
+        """
+        Test that bytes are dropped and inserted, and that frames are truncated
+        """
+        link = Impairment(drop_rate=0.01, seed=3)
+        lengths = [len(link.apply(self.frame)) for _ in range(100)]
+        self.assertEqual(100 * len(self.frame) - link.get_statistics()['dropped'], sum(lengths))
+        self.assertGreater(link.get_statistics()['dropped'], 0)
+
+        link = Impairment(insert_rate=0.01, seed=3)
+        lengths = [len(link.apply(self.frame)) for _ in range(100)]
+        self.assertEqual(100 * len(self.frame) + link.get_statistics()['inserted'], sum(lengths))
+        self.assertGreater(link.get_statistics()['inserted'], 0)
+
+        link = Impairment(truncate_rate=1.0, seed=3)
+        self.assertLess(len(link.apply(self.frame)), len(self.frame))
+        self.assertEqual(1, link.get_statistics()['truncated'])
+
+    def test_impaired_output(self):
+        """
+        Test that text frames and hex messages are impaired by their own impairment
+        """
+        output = mock.create_autospec(OutputInterface)
+        impaired_output = ImpairedOutput(output, text=Impairment(bit_error_rate=1.0))
+        impaired_output.write(b':154\n')
+        impaired_output.write(b'\r\nV\t1')
+        output.write.assert_has_calls([mock.call(b':154\n'), mock.call(bytes(byte ^ 0xFF for byte in b'\r\nV\t1'))])
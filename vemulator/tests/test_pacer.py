@@ -0,0 +1,91 @@
+import datetime
+import threading
+import unittest
+from unittest import mock
+
+from vemulator.output.outputinterface import OutputInterface
+from vemulator.output.pacer import Link, OutputPacer
+from vemulator.util.clock import VirtualClock
+
+
+class PacerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = VirtualClock()
+        # At 1000 baud, the link transmits 100 bytes per second
+        self.link = Link(1000, window=1.0, clock=self.clock)
+        self.output = mock.create_autospec(OutputInterface)
+        self.output.available.return_value = True
+
+    def write_frames(self, pacer, amount, size, interval):
+        """
+        Write frames to a pacer at a fixed interval of virtual time
+        :param pacer: pacer to write to
+        :param amount: amount of frames
+        :param size: size of every frame in bytes
+        :param interval: interval between frames in seconds
+        """
+        for _ in range(amount):
+            pacer.write(b'x' * size)
+            self.clock.time += datetime.timedelta(seconds=interval)
+
+    def test_fits(self):
+        """
+        Test that frames that fit on the link are neither delayed nor dropped
+        """
+        pacer = OutputPacer(self.output, self.link, policy='drop')
+        self.write_frames(pacer, 20, 20, 0.25)
+
+        statistics = pacer.get_statistics()
+        self.assertEqual(0, statistics['dropped'])
+        self.assertEqual(0, statistics['delayed'])
+        self.assertAlmostEqual(0.8, statistics['utilisation'])
+        self.assertFalse(statistics['saturated'])
+
+    def test_drop(self):
+        """
+        Test that frames are dropped when the link is saturated
+        """
+        pacer = OutputPacer(self.output, self.link, policy='drop')
+        self.write_frames(pacer, 20, 50, 0.25)
+
+        statistics = pacer.get_statistics()
+        self.assertEqual(10, statistics['dropped'])
+        self.assertEqual(10, self.output.write.call_count)
+        self.assertAlmostEqual(2.0, statistics['offered_load'])
+        self.assertAlmostEqual(1.0, statistics['utilisation'])
+        self.assertTrue(statistics['saturated'])
+
+    def test_shared_link(self):
+        """
+        Test that pacers of multiple outputs share the capacity of a link
+        """
+        pacers = [OutputPacer(self.output, self.link, policy='none') for _ in range(2)]
+        for _ in range(8):
+            for pacer in pacers:
+                pacer.write(b'x' * 20)
+            self.clock.time += datetime.timedelta(seconds=0.25)
+
+        self.assertEqual(8, pacers[1].get_statistics()['delayed'])
+        self.assertTrue(self.link.get_statistics()['saturated'])
+
+    def test_shared_link_concurrent(self):
+        """
+        Test that pacers writing to a shared link at the same time do not exceed its budget together
+        """
+        pacers = [OutputPacer(self.output, self.link, policy='drop') for _ in range(8)]
+        barrier = threading.Barrier(len(pacers))
+
+        def write(pacer):
+            barrier.wait()
+            pacer.write(b'x' * 20)
+
+        threads = [threading.Thread(target=write, args=(pacer,)) for pacer in pacers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # The clock does not advance, so only the first frame fits
+        self.assertEqual(1, self.output.write.call_count)
+        self.assertEqual(7, sum(pacer.get_statistics()['dropped'] for pacer in pacers))
+        self.assertEqual(20, self.link.get_statistics()['transmitted'])
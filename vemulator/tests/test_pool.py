@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from functools import partial
+
+from vemulator.fleet.pool import FleetPool
+from vemulator.output.fileoutput import FileOutput
+from vemulator.util.clock import VirtualClock
+
+
+class FleetPoolTestCase(unittest.TestCase):
+    emulator_config = """
+    device: Device
+    name: PoolTest
+    protocol: text
+    fields:
+      - name: Voltage
+        key: V
+        values:
+          - type: IntRandom
+            amount: 10
+            min: 0
+            max: 1000
+      - name: Serial number
+        key: SER#
+        values:
+          - type: StringFixed
+            amount: 10
+            value: HQ00000000
+    """
+
+    def test_pool(self):
+        """
+        Test that the devices of a pool are run by the workers, and that they report their statistics to the parent
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, f'device{i}.txt') for i in range(4)]
+            devices = FleetPool.devices_from_config(self.emulator_config, [
+                {'seed': i, 'fields': {'SER#': f'HQ{i:08}'}, 'output': partial(FileOutput, paths[i])} for i in range(4)
+            ])
+            pool = FleetPool(devices, processes=2, clock_factory=VirtualClock)
+            pool.run()
+
+            report = pool.get_report()
+            self.assertEqual(40, report['messages'])
+            self.assertEqual(40, report['ticks'])
+            for i in range(4):
+                statistics = report['emulators'][f'device{i}']
+                self.assertEqual('stopped', statistics['status'])
+                self.assertEqual(10, statistics['messages'])
+                with open(paths[i], 'rb') as file:
+                    output = file.read()
+                self.assertEqual(len(output), statistics['bytes'])
+                self.assertEqual(10, output.count(f'SER#\tHQ{i:08}'.encode()))
+
+    def test_stop_device(self):
+        """
+        Test that the parent can stop a single device
+        """
+        devices = FleetPool.devices_from_config(self.emulator_config, [{} for _ in range(2)])
+        pool = FleetPool(devices, processes=2, clock_factory=VirtualClock)
+        pool.stop('device1')
+        pool.run()
+
+        report = pool.get_report()
+        self.assertEqual(10, report['emulators']['device0']['messages'])
+        self.assertEqual(0, report['emulators']['device1']['messages'])
+        self.assertEqual('stopped', report['emulators']['device1']['status'])
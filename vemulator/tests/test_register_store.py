@@ -0,0 +1,64 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from vemulator.emulator.field_values import FieldValueList
+from vemulator.emulator.register_store import RegisterStore
+from vemulator.util.clock import VirtualClock
+
+
+class RegisterStoreTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = VirtualClock()
+        self.field_values = FieldValueList()
+
+    def test_write_takes_precedence(self):
+        """
+        Test that a written value is not replaced by generated values until another value is written
+        """
+        store = RegisterStore(self.field_values, self.clock)
+        self.field_values.put_hex_field_value(0xEDF0, '0100')
+        store.write(0xEDF0, '0A00')
+        self.field_values.put_hex_field_value(0xEDF0, '0200')
+        self.assertEqual('0A00', self.field_values.get_hex_field_value(0xEDF0))
+        store.write(0xEDF0, '0B00')
+        self.assertEqual('0B00', self.field_values.get_hex_field_value(0xEDF0))
+
+    def test_hold_time(self):
+        """
+        Test that generated values are used again once the hold time has passed
+        """
+        store = RegisterStore(self.field_values, self.clock, hold_time=10)
+        store.write(0xEDF0, '0A00')
+        self.clock.time += datetime.timedelta(seconds=5)
+        self.field_values.put_hex_field_value(0xEDF0, '0200')
+        self.assertEqual('0A00', self.field_values.get_hex_field_value(0xEDF0))
+        self.clock.time += datetime.timedelta(seconds=5)
+        self.field_values.put_hex_field_value(0xEDF0, '0200')
+        self.assertEqual('0200', self.field_values.get_hex_field_value(0xEDF0))
+        self.assertIsNone(store.get(0xEDF0))
+
+    def test_persist(self):
+        """
+        Test that written values survive a restart, unless they have expired
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'registers.bin')
+            store = RegisterStore(self.field_values, self.clock, hold_time=10, path=path)
+            store.write(0xEDF0, '0A00')
+            store.write(0x0100, '41424344')
+            store.release(0x0100)
+            store.close()
+
+            field_values = FieldValueList()
+            store = RegisterStore(field_values, self.clock, path=path)
+            self.assertEqual('0A00', field_values.get_hex_field_value(0xEDF0))
+            self.assertIsNone(field_values.get_hex_field_value(0x0100))
+            store.close()
+
+            self.clock.time += datetime.timedelta(seconds=10)
+            field_values = FieldValueList()
+            store = RegisterStore(field_values, self.clock, path=path)
+            self.assertIsNone(field_values.get_hex_field_value(0xEDF0))
+            store.close()
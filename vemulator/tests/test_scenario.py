@@ -9,6 +9,7 @@ from vemulator.scenarios.intfixed import IntFixedScenario
 from vemulator.scenarios.intrandom import IntRandomScenario
 from vemulator.scenarios.intrange import IntRangeScenario
 from vemulator.scenarios.mapping import MappingScenario
+from vemulator.scenarios.mpptcharger import MpptChargerScenario, OFF, BULK, ABSORPTION, FLOAT
 from vemulator.scenarios.regex import RegexScenario
 from vemulator.scenarios.selectrandom import SelectRandomParentScenario
 from vemulator.scenarios.stringboundary import StringBoundaryScenario
@@ -16,6 +17,9 @@ from vemulator.scenarios.stringchoice import StringChoiceScenario
 from vemulator.scenarios.stringfixed import StringFixedScenario
 from vemulator.scenarios.stringrandom import StringRandomScenario
 from vemulator.scenarios.stringunicode import StringUnicodeScenario
+from vemulator.util.config_checker import check_config_hex_value, check_config_mppt_charger_key, \
+    check_config_written_fields, ConfigException
+from vemulator.util.expression import ExpressionException
 
 
 class ScenarioTester(unittest.TestCase):
@@ -121,6 +125,9 @@ class ScenarioTester(unittest.TestCase):
         scenario = ArithmeticScenario({'value': 'V * A'})
         scenario.generate_next(field_values)
         self.assertEqual(scenario.get_value(), 15)
+        self.assertNotIn('__builtins__', field_values.get_field_values())
+
+        self.assertRaises(ExpressionException, ArithmeticScenario, {'value': '__import__("os").getcwd()'})
 
     def test_gradient_scenario(self):
         """
@@ -332,3 +339,100 @@ class ScenarioTester(unittest.TestCase):
 
         self.assertTrue(not any([r in invalid for r in results1]))
         self.assertTrue(any([r in invalid for r in results2]))
+
+    def test_generate_batch(self):
+        """
+        Test generating a batch of values, which advances the amount and only puts the last value in the field values
+        """
+        field_values = FieldValueList()
+        field_props = {'key': 'V', 'protocol': 'text'}
+        scenarios = [
+            (IntRandomScenario({'min': 1, 'max': 10, 'amount': 100}, field_props), range(1, 11)),
+            (IntRangeScenario({'min': 1, 'max': 10, 'amount': 100}, field_props), range(1, 11)),
+            (IntChoiceScenario({'choices': [2, 4, 6], 'amount': 100}, field_props), [2, 4, 6]),
+            (IntFixedScenario({'value': 5, 'amount': 100}, field_props), [5]),
+            (MappingScenario({'dict': {'one': 1, 'two': 2}, 'amount': 100}, field_props), [1, 2]),
+            (StringChoiceScenario({'choices': ['a', 'b'], 'amount': 100}, field_props), ['a', 'b']),
+        ]
+        for scenario, domain in scenarios:
+            values = scenario.generate_batch(60, field_values)
+            self.assertEqual(60, len(values))
+            self.assertTrue(all(value in domain for value in values))
+            self.assertEqual(scenario.get_value(), field_values.get_field_value('V'))
+            self.assertEqual(40, len(scenario.generate_batch(60, field_values)))
+            self.assertTrue(scenario.is_complete())
+            self.assertEqual(0, scenario.amount)
+
+    def test_generate_batch_gradient(self):
+        """
+        Test that a batch of gradient values equals the values generated one at a time
+        """
+        field_values = FieldValueList()
+        scenario = GradientScenario({'gradient_type': 'square', 'step_size': 2, 'amount': 20})
+        single = GradientScenario({'gradient_type': 'square', 'step_size': 2, 'amount': 20})
+        expected = [single.generate_next(field_values) for _ in range(20)]
+        self.assertEqual(expected[:5], list(scenario.generate_batch(5, field_values)))
+        self.assertEqual(expected[5:], list(scenario.generate_batch(20, field_values)))
+
+        # The sequence is too long to compute in advance, and intermediate results overflow 64 bit integers
+        scenario = GradientScenario({'gradient_type': '(x ** 7 % 3 == 0) * x', 'amount': 100000})
+        values = scenario.generate_batch(2000, field_values)
+        self.assertEqual([(x ** 7 % 3 == 0) * x for x in range(2000)], list(values))
+
+    def test_gradient_scenario_sequence(self):
+        """
+        Test that a precomputed gradient sequence equals the values computed one at a time
+        """
+        field_values = FieldValueList()
+        scenario = GradientScenario({'gradient_type': 'x / 4 + 1', 'step_size': 3, 'amount': 10})
+        values = [scenario.generate_next(field_values) for _ in range(12)]
+        self.assertEqual([x / 4 + 1 for x in range(0, 36, 3)], values)
+
+        scenario = GradientScenario({'gradient_type': '1 / x', 'amount': 10})
+        self.assertRaises(ZeroDivisionError, scenario.generate_next, field_values)
+        self.assertEqual(1.0, scenario.generate_next(field_values))
+
+        # Intermediate results that do not fit in 64 bit integers are computed using Python integers
+        scenario = GradientScenario({'gradient_type': '(x ** 5 > 0) + 0', 'max': 20000})
+        values = [scenario.generate_next(field_values) for _ in range(20000)]
+        self.assertEqual(0, values[0])
+        self.assertEqual(19999, sum(values))
+
+    def test_mppt_charger_scenario(self):
+        """
+        Test that the MpptCharger scenario puts the values of all its quantities in the field values at once, and
+        charges the battery through the bulk, absorption and float stages
+        """
+        field_values = FieldValueList()
+        scenario = MpptChargerScenario({'day_length': 400, 'battery_capacity': 0.5, 'noise': 0}, {'key': 'V'})
+        states = []
+        for _ in range(200):
+            voltage = scenario.generate_next(field_values)
+            self.assertEqual(voltage, field_values.get_field_value('V'))
+            self.assertEqual(scenario.values['I'], field_values.get_field_value('I'))
+            self.assertEqual(scenario.values['PPV'], field_values.get_field_value('PPV'))
+            self.assertAlmostEqual(voltage * field_values.get_field_value('I') / 1e6, scenario.values['P'], delta=1)
+            states.append(field_values.get_field_value('CS'))
+        self.assertEqual(OFF, states[0])
+        self.assertEqual([OFF, BULK, ABSORPTION, FLOAT], sorted(set(states)))
+        charging = [state for state in states if state != OFF]
+        self.assertEqual(sorted(charging), charging)
+        self.assertNotIn('P', field_values.get_field_values())
+
+        self.assertRaises(ConfigException, check_config_hex_value, 'test.yaml', {'type': 'MpptCharger'})
+        self.assertRaises(ConfigException, check_config_mppt_charger_key, 'test.yaml', 'W', {'type': 'MpptCharger'})
+        check_config_mppt_charger_key('test.yaml', 'W', {'type': 'MpptCharger', 'outputs': {'W': 'P'}})
+
+        # An invalid value is generated again without advancing the model again
+        scenario = MpptChargerScenario({'invalid': [12000], 'noise': 0}, {'key': 'V'})
+        scenario.generate_next(field_values)
+        self.assertEqual(1, scenario.time)
+        self.assertEqual(0.5, scenario.charge)
+
+        config = {'fields': [
+            {'key': 'V', 'values': [{'type': 'MpptCharger', 'outputs': {'V': 'V', 'I': 'I'}}]},
+            {'key': 'I', 'values': [{'type': 'IntFixed', 'value': 1}]},
+        ]}
+        self.assertRaises(ConfigException, check_config_written_fields, 'test.yaml', config)
+        config['fields'][1]['values'] = []
+        check_config_written_fields('test.yaml', config)
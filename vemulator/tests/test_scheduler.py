@@ -0,0 +1,57 @@
+import datetime
+import threading
+import unittest
+
+from vemulator.events.scheduler import Scheduler
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = Scheduler()
+        self.executed = []
+        self.done = threading.Event()
+
+    def tearDown(self) -> None:
+        self.scheduler.stop()
+
+    def __task(self, name):
+        """
+        Create a task that registers its execution
+        :param name: name of the task
+        :type name: str
+        :return: task function
+        :rtype: callable
+        """
+        def function():
+            self.executed.append(name)
+            if name == 'last':
+                self.done.set()
+        return function
+
+    def test_deadline_order(self):
+        """
+        Test that tasks are executed in order of their deadline, and in order of scheduling for equal deadlines
+        """
+        now = datetime.datetime.now()
+        self.scheduler.schedule(now + datetime.timedelta(milliseconds=20), self.__task('last'))
+        self.scheduler.schedule(now + datetime.timedelta(milliseconds=10), self.__task('second'))
+        self.scheduler.schedule(now, self.__task('first'))
+        self.scheduler.schedule(now + datetime.timedelta(milliseconds=10), self.__task('third'))
+        self.scheduler.start()
+        self.assertTrue(self.done.wait(1))
+        self.assertEqual(['first', 'second', 'third', 'last'], self.executed)
+
+    def test_cancel_and_reschedule(self):
+        """
+        Test that cancelled tasks are not executed and rescheduled tasks are executed at their new deadline
+        """
+        now = datetime.datetime.now()
+        cancelled = self.scheduler.schedule(now, self.__task('cancelled'))
+        rescheduled = self.scheduler.schedule(now, self.__task('last'))
+        self.scheduler.schedule(now + datetime.timedelta(milliseconds=10), self.__task('middle'))
+        self.scheduler.cancel(cancelled)
+        self.scheduler.reschedule(rescheduled, now + datetime.timedelta(milliseconds=20))
+        self.assertEqual(2, self.scheduler.pending())
+        self.scheduler.start()
+        self.assertTrue(self.done.wait(1))
+        self.assertEqual(['middle', 'last'], self.executed)
@@ -1,4 +1,6 @@
 import unittest
+from random import Random
+from unittest import mock
 
 from vemulator.util import text
 
@@ -16,3 +18,71 @@ class TextTestCase(unittest.TestCase):
         """
         self.assertTrue(text.check_checksum(b'\r\nField\tValue\r\nChecksum\t\xAC'))
         self.assertFalse(text.check_checksum(b'\r\nField\tValue\r\nChecksum\t0'))
+
+    def test_encode_frame(self):
+        """
+        Test that the TextFrameEncoder encodes a message into a single frame
+        """
+        encoder = text.TextFrameEncoder()
+        self.assertEqual([b'\r\nV\t12800\r\nPID\t0xA053'], encoder.encode({'V': '12800', 'PID': '0xA053'}))
+        self.assertEqual([b'\r\nV\t12900\r\nPID\t0xA053'], encoder.encode({'V': '12900', 'PID': '0xA053'}))
+        self.assertEqual(1, len(encoder.plans))  # The plan is reused for the same keys
+
+    def test_encode_split_frames(self):
+        """
+        Test that the TextFrameEncoder moves the H fields to their own frame when a message has too many fields
+        """
+        encoder = text.TextFrameEncoder()
+        message = {f'F{i}': str(i) for i in range(10)}
+        message.update({f'H{i}': str(i) for i in range(1, 15)})
+        frames = encoder.encode(message)
+
+        self.assertEqual(2, len(frames))
+        self.assertEqual(b''.join(b'\r\nF%d\t%d' % (i, i) for i in range(10)), frames[0])
+        self.assertEqual(b''.join(b'\r\nH%d\t%d' % (i, i) for i in range(1, 15)), frames[1])
+
+        # Without H fields, the message is split evenly
+        frames = encoder.encode({f'F{i}': str(i) for i in range(30)})
+        self.assertEqual([15, 15], [frame.count(b'\r\n') for frame in frames])
+
+    def test_encode_checksum(self):
+        """
+        Test that the TextFrameEncoder adds the same checksum as text.add_checksum, while only encoding changed fields
+        """
+        encoder = text.TextFrameEncoder()
+        pid_line = None
+        for voltage in ['12800', '12900', '7']:
+            message = {'V': voltage, 'PID': '0xA053', 'SER#': 'HQ1328A1B2C'}
+            frames = encoder.encode(message, checksum=True)
+            self.assertEqual([text.add_checksum(encoder.encode(message)[0])], frames)
+            self.assertTrue(text.check_checksum(frames[0]))
+            if pid_line is not None:
+                self.assertIs(pid_line, encoder.lines['PID'])  # Constant lines are not encoded again
+            pid_line = encoder.lines['PID']
+
+    def test_bit_error(self):
+        """
+        Test that text.bit_error flips bits at the bit error rate, reproducibly and without changing the length
+        """
+        message = b'\x00\x00' + b'\r\nV\t12800' * 100
+        corrupted = text.bit_error(message, 0.01, Random(1))
+        self.assertEqual(len(message), len(corrupted))
+        self.assertEqual(corrupted, text.bit_error(message, 0.01, Random(1)))
+
+        flipped = sum(bin(a ^ b).count('1') for a, b in zip(message, corrupted))
+        self.assertTrue(40 < flipped < 120)  # About 1% of 8016 bits
+
+        self.assertEqual(message, text.bit_error(message, 0.0, Random(1)))
+        self.assertEqual(bytes(byte ^ 0xFF for byte in message), text.bit_error(message, 1.0, Random(1)))
+
+    def test_bit_error_batch(self):
+        """
+        Test that text.bit_error_batch adds bit errors to every message, with and without NumPy
+        """
+        messages = [b'\r\nV\t12800' * 10, b'\r\nI\t-10' * 20]
+        for numpy in [text.np, None]:
+            with mock.patch.object(text, 'np', numpy):
+                corrupted = text.bit_error_batch(messages, 0.5, Random(1))
+                self.assertEqual([len(message) for message in messages], [len(message) for message in corrupted])
+                self.assertNotEqual(messages, corrupted)
+                self.assertEqual(corrupted, text.bit_error_batch(messages, 0.5, Random(1)))
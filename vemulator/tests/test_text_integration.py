@@ -1,9 +1,11 @@
+import datetime
 import unittest
 from unittest import mock
 
 from vemulator.configuration.config import EmulatorConfig
 from vemulator.emulator.emulator import Emulator
 from vemulator.output.outputinterface import OutputInterface
+from vemulator.util.clock import VirtualClock
 from vemulator.util.text import check_checksum
 
 
@@ -16,6 +18,65 @@ class TextIntegrationTestCase(unittest.TestCase):
         self.output.available.return_value = True
         self.config.set_output(self.output)
 
+    def __run_with_slow_first_tick(self, overrun_policy):
+        """
+        Run an emulator with a delay of 1 second on a virtual clock, of which the first tick takes 2.5 seconds
+        :param overrun_policy: overrun policy of the config
+        :type overrun_policy: str
+        :return: the emulator after running
+        :rtype: Emulator
+        """
+        self.config.set_config("""
+            device: Device
+            name: TextTest
+            protocol: text
+            fields:
+              - name: Voltage
+                key: V
+                values:
+                  - type: IntFixed
+                    amount: 5
+                    value: 1
+            """)
+        clock = VirtualClock()
+        self.config.set_clock(clock)
+        self.config.set_delay(1)
+        self.config.set_overrun_policy(overrun_policy)
+        self.config.create_scenarios()
+
+        def slow_write(data):
+            if self.output.write.call_count == 1:
+                clock.time += datetime.timedelta(seconds=2.5)
+            return True
+        self.output.write.side_effect = slow_write
+
+        emulator = Emulator(self.config)
+        emulator.run()
+        return emulator
+
+    def test_overrun_catch_up(self):
+        """
+        Test that overdue ticks are executed as soon as possible when a tick overruns
+        """
+        statistics = self.__run_with_slow_first_tick('catch-up').get_statistics()
+        self.assertEqual(5, statistics['ticks'])
+        self.assertEqual(5, statistics['run_time'])
+        self.assertEqual(2, statistics['overruns'])  # The ticks of second 1 and 2 are both overdue
+        self.assertEqual(0, statistics['skipped'])
+        self.assertAlmostEqual(1.5, statistics['max_lateness'])
+        self.assertAlmostEqual((1.5 + 0.5) / 5, statistics['lateness'])
+
+    def test_overrun_skip(self):
+        """
+        Test that overdue ticks are skipped when a tick overruns, while the run time follows the clock
+        """
+        statistics = self.__run_with_slow_first_tick('skip').get_statistics()
+        self.assertEqual(5, statistics['ticks'])
+        self.assertEqual(7, statistics['run_time'])
+        self.assertEqual(1, statistics['overruns'])
+        self.assertEqual(2, statistics['skipped'])
+        self.assertAlmostEqual(0.0, statistics['max_lateness'])
+
     def test_int_fixed_in_message(self):
         """
         Test the IntFixed scenario in an integration test
@@ -139,6 +200,119 @@ class TextIntegrationTestCase(unittest.TestCase):
                 message_occurrences += 1
         self.assertEqual(message_occurrences, 3)
 
+    def test_arithmetic_before_referenced_fields(self):
+        """
+        Test that an Arithmetic field is computed from the values of the same message, also when it is listed before
+        the fields it references
+        """
+        self.config.set_config("""
+            device: Device
+            name: TextTest
+            protocol: text
+            fields:
+              - name: Power
+                key: W
+                values:
+                  - type: Arithmetic
+                    value: V * A
+              - name: Voltage
+                key: V
+                values:
+                  - type: IntFixed
+                    amount: 2
+                    value: 2
+                  - type: IntFixed
+                    amount: 2
+                    value: 4
+              - name: Amperage
+                key: A
+                values:
+                  - type: IntFixed
+                    amount: 4
+                    value: 3
+            """)
+        self.config.create_scenarios()
+        emulator = Emulator(self.config)
+        emulator.run()
+
+        messages = self.__get_outputted_messages()
+        self.assertEqual(2, sum(1 for message in messages if b'\r\nW\t6' in message))
+        self.assertEqual(2, sum(1 for message in messages if b'\r\nW\t12' in message))
+
+    def test_fuzzed_arithmetic_in_message(self):
+        """
+        Test that a fuzzed Arithmetic field is fuzzed again in every message, also when the referenced fields do not
+        change
+        """
+        self.config.set_config("""
+            device: Device
+            name: TextTest
+            protocol: text
+            fields:
+              - name: Voltage
+                key: V
+                values:
+                  - type: IntFixed
+                    amount: 5
+                    value: 2
+              - name: Power
+                key: W
+                values:
+                  - type: Arithmetic
+                    value: V * 3
+                    generation: fuzzing
+            """)
+        self.config.create_scenarios()
+        emulator = Emulator(self.config)
+        emulator.run()
+
+        values = [message.split(b'\r\nW\t')[1].split(b'\r\n')[0] for message in self.__get_outputted_messages()]
+        self.assertEqual(5, len(values))
+        self.assertEqual(5, len(set(values)))
+
+    def test_mppt_charger_in_message(self):
+        """
+        Test that the MpptCharger scenario puts consistent values in several fields of the same message
+        """
+        self.config.set_config("""
+            device: Device
+            name: TextTest
+            protocol: text
+            fields:
+              - name: Power
+                key: W
+                values:
+                  - type: Arithmetic
+                    value: V * I // 1000000
+              - name: Voltage
+                key: V
+                values:
+                  - type: MpptCharger
+                    amount: 10
+                    day_length: 40
+                    outputs: {V: V, I: I, P: P, CS: CS}
+              - name: Current
+                key: I
+                values: []
+              - name: Charge power
+                key: P
+                values: []
+              - name: Charge state
+                key: CS
+                values: []
+            """)
+        self.config.create_scenarios()
+        emulator = Emulator(self.config)
+        emulator.run()
+
+        messages = self.__get_outputted_messages()
+        self.assertEqual(10, len(messages))
+        for message in messages:
+            fields = dict(line.split(b'\t') for line in message.split(b'\r\n')[1:-1])
+            self.assertEqual(['W', 'V', 'I', 'P', 'CS'], [key.decode() for key in fields])
+            self.assertLessEqual(abs(int(fields[b'W']) - int(fields[b'P'])), 1)
+            self.assertEqual(int(fields[b'I']) > 0, int(fields[b'CS']) != 0)
+
     def test_bitbuffer_in_message(self):
         """
         Test the Bitbuffer scenario in an integration test
@@ -0,0 +1,140 @@
+# Clocks that determine how time passes during emulation
+import datetime
+import time
+
+
+class Clock:
+    """
+    Clock that follows the real time. This is the default clock of the emulator.
+    """
+
+    def now(self):
+        """
+        Get the current time of the clock
+        :return: current time
+        :rtype: datetime.datetime
+        """
+        return datetime.datetime.now()
+
+    def real_seconds(self, seconds):
+        """
+        Convert a duration in clock time to a duration in real time
+        :param seconds: duration in seconds of clock time
+        :type seconds: float
+        :return: duration in seconds of real time
+        :rtype: float
+        """
+        return seconds
+
+    def sleep(self, seconds):
+        """
+        Let a certain amount of clock time pass
+        :param seconds: duration in seconds of clock time
+        :type seconds: float
+        """
+        time.sleep(self.real_seconds(seconds))
+
+    def wait(self, condition, seconds):
+        """
+        Wait on a condition for at most a certain amount of clock time. The lock of the condition must be held.
+        :param condition: condition to wait on
+        :type condition: threading.Condition
+        :param seconds: maximum duration in seconds of clock time, None to wait until the condition is notified
+        :type seconds: float or None
+        """
+        condition.wait(self.real_seconds(seconds) if seconds is not None else None)
+
+    def is_virtual(self):
+        """
+        Check if the clock is a virtual clock, which only advances when sleep() is called
+        :return: true if the clock is virtual, false otherwise
+        :rtype: bool
+        """
+        return False
+
+
+class ScaledClock(Clock):
+    """
+    Clock that runs a certain factor faster (or slower) than the real time.
+    """
+
+    def __init__(self, scale=1.0):
+        """
+        Create a scaled clock, starting at the current time
+        :param scale: factor by which the clock runs faster than the real time, 2.0 lets the clock run twice as fast
+        :type scale: float
+        """
+        self.scale = scale
+        self.start = datetime.datetime.now()
+        self.real_start = time.monotonic()
+
+    def now(self):
+        return self.start + datetime.timedelta(seconds=(time.monotonic() - self.real_start) * self.scale)
+
+    def real_seconds(self, seconds):
+        return max(seconds / self.scale, 0)
+
+
+class VirtualClock(Clock):
+    """
+    Clock that runs as fast as possible. Time only passes when the emulator sleeps, in which case the clock jumps
+    forward directly. Any schedulers attached to the clock execute their tasks in order of their deadline while the
+    clock jumps, such that the emulation produces the same output as it would in real time.
+    """
+
+    def __init__(self, start=None):
+        """
+        Create a virtual clock
+        :param start: the time at which the clock starts; the current time by default
+        :type start: datetime.datetime
+        """
+        self.time = start if start is not None else datetime.datetime.now()
+        self.schedulers = []
+
+    def now(self):
+        return self.time
+
+    def real_seconds(self, seconds):
+        return 0
+
+    def attach(self, scheduler):
+        """
+        Attach a scheduler, whose tasks are executed while the clock advances
+        :param scheduler: scheduler to attach
+        :type scheduler: vemulator.events.scheduler.Scheduler
+        """
+        if scheduler not in self.schedulers:
+            self.schedulers.append(scheduler)
+
+    def detach(self, scheduler):
+        """
+        Detach a scheduler from the clock
+        :param scheduler: scheduler to detach
+        :type scheduler: vemulator.events.scheduler.Scheduler
+        """
+        if scheduler in self.schedulers:
+            self.schedulers.remove(scheduler)
+
+    def sleep(self, seconds):
+        """
+        Advance the clock, executing all tasks of the attached schedulers that are due during this time
+        :param seconds: duration in seconds of clock time
+        :type seconds: float
+        """
+        target = self.time + datetime.timedelta(seconds=seconds)
+        while True:
+            deadlines = [(deadline, scheduler) for scheduler in self.schedulers
+                         for deadline in [scheduler.next_deadline()] if deadline is not None and deadline <= target]
+            if len(deadlines) == 0:
+                break
+            deadline, scheduler = min(deadlines, key=lambda item: item[0])
+            self.time = max(self.time, deadline)
+            scheduler.run_due(self.time)
+        self.time = max(self.time, target)
+
+    def wait(self, condition, seconds):
+        # Waiting for the condition would block forever, since virtual time does not pass on its own
+        pass
+
+    def is_virtual(self):
+        return True
@@ -2,8 +2,11 @@ import os
 import re
 from os.path import dirname, abspath, basename
 
+from ..emulator.dependencies import DependencyException, DependencyGraph, field_dependencies, field_name, written_names
 from ..scenarios.gradient import predefined_gradient_types
+from ..scenarios.mpptcharger import default_outputs, quantities
 from ..util.deserialize_scenario import scenarios, scenario_has_children
+from ..util.expression import Expression, ExpressionException, compile_expression
 from ..util.yamlparser import load_yaml_with_lines
 
 
@@ -115,6 +118,48 @@ def check_config_dict(config, file=''):
             for field in config.get('hex_fields', []):
                 check_config_hex_field(basename(file), field)
 
+    check_config_dependencies(basename(file), config)
+    check_config_written_fields(basename(file), config)
+
+
+def check_config_dependencies(filename, config):
+    """
+    Check that the Arithmetic fields of a config do not reference each other
+    :param filename: name of the yaml file
+    :type filename: str
+    :param config: config dictionary
+    :type config: dict
+    :exception ConfigException if fields reference each other
+    """
+    fields = [(field_name(protocol, field['key']), [field.get('values', [])])
+              for protocol, config_fields in [('text', config.get('fields', [])), ('hex', config.get('hex_fields', []))]
+              for field in config_fields if 'key' in field and (protocol == 'text' or is_int(field['key']))]
+    try:
+        DependencyGraph(field_dependencies(fields))
+    except ExpressionException as e:
+        raise ConfigException('Invalid arithmetic expression supplied in file {}. {}'.format(filename, e))
+    except DependencyException as e:
+        raise ConfigException('{} in file {}. Arithmetic fields can not depend on their own value through other fields.'.format(e, filename))
+
+
+def check_config_written_fields(filename, config):
+    """
+    Check that the fields of which the value is put by the scenario of another field, such as the outputs of an
+    MpptCharger scenario, have no scenarios of their own
+    :param filename: name of the yaml file
+    :type filename: str
+    :param config: config dictionary
+    :type config: dict
+    :exception ConfigException if a field has scenarios and its value is also put by the scenario of another field
+    """
+    generated = set(field['key'] for field in config.get('fields', []) if 'key' in field and field.get('values'))
+    for field in config.get('fields', []):
+        if 'key' not in field or not isinstance(field.get('values', None), list):
+            continue
+        for key in sorted(written_names(field['values']) - {field['key']}):
+            if key in generated:
+                raise ConfigException('Field `{}` has values, but the scenario of field `{}` at #{} in file {} also generates its values. Define the field with `values: []`.'.format(key, field['key'], field.get('__line__', 'NaN'), filename))
+
 
 def check_preset_field(preset, field):
     """
@@ -183,6 +228,7 @@ def check_config_text_field(filename, field):
 
     for value in field['values']:
         check_config_text_value(filename, value)
+        check_config_mppt_charger_key(filename, field.get('key', None), value)
 
 
 def check_config_hex_field(filename, field):
@@ -229,6 +275,10 @@ def check_config_value(filename, value):
     if value['type'] == 'Arithmetic':
         if 'value' not in value:
             raise ConfigException('No value defined for arithmetic value at #{} in file {}. Define a key `value` with the arithmetic expression of the value.'.format(value.get('__line__', 'NaN'), filename))
+        try:
+            compile_expression(value['value'])
+        except ExpressionException as e:
+            raise ConfigException('Invalid arithmetic expression supplied for arithmetic value at #{} in file {}. {}'.format(value.get('__line__', 'NaN'), filename, e))
 
     if value['type'] == 'BitBuffer':
         if 'values' not in value:
@@ -245,7 +295,10 @@ def check_config_value(filename, value):
 
     if value['type'] == 'Gradient':
         if 'gradient_type' in value and value['gradient_type'] not in predefined_gradient_types:
-            raise ConfigException('Invalid gradient type supplied for gradient at #{} in file {}. Gradient type must be one of `linear`, `sqare` or `cube`.'.format(value.get('__line__', 'NaN'), filename))
+            try:
+                Expression(value['gradient_type'], ['x'])
+            except ExpressionException as e:
+                raise ConfigException('Invalid gradient type supplied for gradient at #{} in file {}. Gradient type must be one of `linear`, `square` or `cube`, or an expression of `x`. {}'.format(value.get('__line__', 'NaN'), filename, e))
 
     if value['type'] in ['IntBoundary', 'IntRandom', 'IntRanged']:
         if 'min' in value and not is_int(value['min']):
@@ -297,6 +350,21 @@ def check_config_value(filename, value):
         if not isinstance(value['dict'], dict):
             raise ConfigException('Invalid dictionary value supplied for mapping at #{} in file {}. The value should be a dictionary of possible values of the mapping.'.format(value.get('__line__', 'NaN'), filename))
 
+    if value['type'] == 'MpptCharger':
+        if 'outputs' in value:
+            if not isinstance(value['outputs'], dict) or len(value['outputs']) == 0:
+                raise ConfigException('Invalid outputs supplied for MPPT charger at #{} in file {}. Outputs should be a dictionary with the key of the field of every generated quantity.'.format(value.get('__line__', 'NaN'), filename))
+            for quantity in value['outputs'].values():
+                if quantity not in quantities:
+                    raise ConfigException('Invalid quantity `{}` supplied for MPPT charger at #{} in file {}. Quantities should be one of {}.'.format(quantity, value.get('__line__', 'NaN'), filename, ', '.join(quantities)))
+        for prop in ['day_length', 'step_size', 'panel_power', 'panel_voltage', 'battery_voltage', 'battery_capacity', 'max_current']:
+            if prop in value and (not isinstance(value[prop], (int, float)) or value[prop] <= 0):
+                raise ConfigException('Invalid {} provided for MPPT charger at #{} in file {}. The {} should be a number greater than 0.'.format(prop, value.get('__line__', 'NaN'), filename, prop))
+        if 'load' in value and (not isinstance(value['load'], (int, float)) or value['load'] < 0):
+            raise ConfigException('Invalid load provided for MPPT charger at #{} in file {}. The load should be a number of at least 0.'.format(value.get('__line__', 'NaN'), filename))
+        if 'state_of_charge' in value and (not isinstance(value['state_of_charge'], (int, float)) or not 0 <= value['state_of_charge'] <= 1):
+            raise ConfigException('Invalid state of charge provided for MPPT charger at #{} in file {}. The state of charge should be between 0 and 1.'.format(value.get('__line__', 'NaN'), filename))
+
     if value['type'] == 'StringFixed':
         if 'value' not in value:
             raise ConfigException('No value provided for string value at #{} in file {}. Define a key `value` with value of the string.'.format(value.get('__line__', 'NaN'), filename))
@@ -354,6 +422,27 @@ def check_config_hex_value(filename, value):
     """
     check_config_value(filename, value)
 
+    if value['type'] == 'MpptCharger':
+        raise ConfigException('MPPT charger used in hex field at #{} in file {}. MPPT chargers can only be used in text fields.'.format(value.get('__line__', 'NaN'), filename))
+
     if scenario_has_children(value['type']):
         for value in value.get('values', []):
             check_config_hex_value(filename, value)
+
+
+def check_config_mppt_charger_key(filename, key, value):
+    """
+    Check that the MPPT chargers of a text field generate a quantity for the key of the field
+    :param filename: name of the yaml file
+    :type filename: str
+    :param key: key of the field
+    :type key: str
+    :param value: text value to check
+    :exception ConfigException if an MPPT charger does not generate a quantity for the key of the field
+    """
+    if value['type'] == 'MpptCharger':
+        if key not in value.get('outputs', default_outputs):
+            raise ConfigException('MPPT charger at #{} in file {} does not generate a quantity for the key `{}` of its field. Add the key to `outputs`.'.format(value.get('__line__', 'NaN'), filename, key))
+    elif scenario_has_children(value['type']):
+        for child in value.get('values', []):
+            check_config_mppt_charger_key(filename, key, child)
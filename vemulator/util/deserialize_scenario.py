@@ -11,6 +11,7 @@ from ..scenarios.intrandom import IntRandomScenario
 from ..scenarios.intrange import IntRangeScenario
 from ..scenarios.loop import LoopParentScenario
 from ..scenarios.mapping import MappingScenario
+from ..scenarios.mpptcharger import MpptChargerScenario
 from ..scenarios.parentscenario import ParentScenario
 from ..scenarios.regex import RegexScenario
 from ..scenarios.selectrandom import SelectRandomParentScenario
@@ -33,6 +34,7 @@ scenarios = {
     'Loop': LoopParentScenario,
     'Regex': RegexScenario,
     'Mapping': MappingScenario,
+    'MpptCharger': MpptChargerScenario,
     'StringFixed': StringFixedScenario,
     'SelectRandom': SelectRandomParentScenario,
     'StringBoundary': StringBoundaryScenario,
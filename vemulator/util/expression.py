@@ -0,0 +1,147 @@
+# Util functions related to evaluating the expressions of Gradient and Arithmetic scenarios
+import ast
+import functools
+import math
+
+# Functions and constants that can be used in an expression
+FUNCTIONS = {
+    'abs': abs,
+    'min': min,
+    'max': max,
+    'round': round,
+    'int': int,
+    'float': float,
+    'pow': pow,
+    'sqrt': math.sqrt,
+    'exp': math.exp,
+    'log': math.log,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'floor': math.floor,
+    'ceil': math.ceil,
+}
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+}
+# Syntax that can be used in an expression: arithmetic, comparisons, conditional expressions and calls of FUNCTIONS
+NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.Call,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.LShift, ast.RShift, ast.BitOr, ast.BitXor, ast.BitAnd,
+    ast.UnaryOp, ast.UAdd, ast.USub, ast.Not, ast.Invert,
+    ast.BoolOp, ast.And, ast.Or, ast.IfExp,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+
+
+class ExpressionException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class Expression:
+    """
+    An expression that is parsed, validated and compiled once, and can then be evaluated many times.
+    Only arithmetic on numbers and the names of variables, FUNCTIONS and CONSTANTS are allowed, so an expression can
+    not access attributes, import modules or call any other function.
+
+    Example:
+    expression = Expression('V * I / 1000')
+    expression.names  # ['I', 'V']
+    expression.evaluate({'V': 12000, 'I': 500})  # 6.0
+    """
+
+    def __init__(self, source, variables=None):
+        """
+        Compile an expression
+        :param source: the expression
+        :type source: str
+        :param variables: names of the variables that can be used in the expression; any name by default
+        :type variables: list or None
+        :exception ExpressionException if the expression is invalid or unsafe
+        """
+        self.source = str(source)
+        try:
+            tree = ast.parse(self.source, mode='eval')
+        except SyntaxError as e:
+            raise ExpressionException(f'Expression `{self.source}` is not valid: {e.msg}')
+
+        names = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, NODES):
+                raise ExpressionException(f'Expression `{self.source}` contains {type(node).__name__}, which is not allowed')
+            if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS):
+                raise ExpressionException(f'Expression `{self.source}` calls a function that is not allowed, '
+                                          f'only {list(FUNCTIONS)} can be called')
+            if isinstance(node, ast.Name) and node.id not in FUNCTIONS and node.id not in CONSTANTS:
+                if node.id.startswith('_') or (variables is not None and node.id not in variables):
+                    raise ExpressionException(f'Expression `{self.source}` uses name `{node.id}`, which is not allowed')
+                names.add(node.id)
+
+        self.names = sorted(names)  # Names of the variables that the expression references
+        self.code = compile(tree, '<expression>', 'eval')
+        self.globals = {'__builtins__': {}}
+        self.globals.update(FUNCTIONS)
+        self.globals.update(CONSTANTS)
+        # The expression with every intermediate result passed to _trace, see evaluate_traced()
+        self.traced_code = compile(ast.fix_missing_locations(_Tracer().visit(tree)), '<expression>', 'eval')
+
+    def evaluate(self, variables):
+        """
+        Evaluate the expression. Only the variables the expression references are read, and the mapping is not
+        modified.
+        :param variables: values of the variables
+        :type variables: dict
+        :return: the result
+        :exception NameError if a referenced variable does not exist
+        """
+        return eval(self.code, self.globals, variables)
+
+    def evaluate_traced(self, variables, trace):
+        """
+        Evaluate the expression, and pass the result of every operation and function call to a function, for example
+        to find the largest intermediate result
+        :param variables: values of the variables
+        :type variables: dict
+        :param trace: function that is called with every intermediate result, and returns the value to continue with
+        :type trace: function
+        :return: the result
+        :exception NameError if a referenced variable does not exist
+        """
+        return eval(self.traced_code, dict(self.globals, _trace=trace), variables)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(source):
+    """
+    Compile an expression of which the variables can be any name, or get it from the cache when the same expression
+    has been compiled before, such that checking a config does not compile its expressions multiple times
+    :param source: the expression
+    :type source: str
+    :return: the compiled expression
+    :rtype: Expression
+    :exception ExpressionException if the expression is invalid or unsafe
+    """
+    return Expression(source)
+
+
+class _Tracer(ast.NodeTransformer):
+    """
+    Transformer that wraps every operation and function call of an expression in a call to _trace.
+    Names starting with an underscore can not be used in an expression, so _trace does not clash with a variable.
+    """
+
+    def visit_BinOp(self, node):
+        return self.__trace(node)
+
+    def visit_UnaryOp(self, node):
+        return self.__trace(node)
+
+    def visit_Call(self, node):
+        return self.__trace(node)
+
+    def __trace(self, node):
+        node = self.generic_visit(node)
+        return ast.copy_location(ast.Call(func=ast.Name(id='_trace', ctx=ast.Load()), args=[node], keywords=[]), node)
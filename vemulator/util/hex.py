@@ -1,5 +1,84 @@
 # Util functions related to sending and processing hex messages
-import codecs
+import binascii
+
+# Lookup tables of the bytes codec
+HEX_DIGITS = b'0123456789ABCDEF'
+UPPER = bytes.maketrans(b'abcdef', b'ABCDEF')  # Translation table that converts hex digits to upper case
+NON_HEX = bytes(byte for byte in range(256) if byte not in HEX_DIGITS + b'abcdef')  # Bytes that are not hex digits
+BYTE_TO_HEX = [b'%02X' % byte for byte in range(256)]  # Upper case hex representation of every byte
+
+
+def clean_frame(frame):
+    """
+    Get the hex digits of an incoming hex frame, in upper case and without the colon, newline or any other characters
+    :param frame: incoming hex frame, starting with a colon
+    :type frame: bytes or memoryview
+    :return: hex digits of the command, data and checksum
+    :rtype: bytes
+    """
+    return bytes(frame[1:]).translate(UPPER, NON_HEX)
+
+
+def frame_checksum_valid(digits):
+    """
+    Check the checksum of the hex digits of a frame
+    :param digits: hex digits of the command, data and checksum, in upper case
+    :type digits: bytes
+    :return: true if valid, false otherwise
+    :rtype: bool
+    """
+    if len(digits) < 2:
+        return False
+    if len(digits) % 2 == 1:
+        # The command is a single hex digit
+        digits = b'0' + digits
+    # The sum of all the bytes including the checksum should be 0x55
+    return sum(binascii.unhexlify(digits)) & 0xFF == 0x55
+
+
+def frame_checksum(digits):
+    """
+    Calculate the checksum of the hex digits of a frame
+    :param digits: hex digits of the command and data, in upper case
+    :type digits: bytes
+    :return: checksum as two hex digits
+    :rtype: bytes
+    """
+    if len(digits) % 2 == 1:
+        # The command is a single hex digit
+        digits = b'0' + digits
+    return BYTE_TO_HEX[(0x55 - sum(binascii.unhexlify(digits))) & 0xFF]
+
+
+def build_frame(command, payload=b''):
+    """
+    Build a hex frame
+    :param command: command as a single hex digit
+    :type command: bytes
+    :param payload: payload as hex digits, in upper case
+    :type payload: bytes
+    :return: hex frame, including the colon, the calculated checksum and the newline
+    :rtype: bytes
+    """
+    digits = command + payload
+    return b':' + digits + frame_checksum(digits) + b'\n'
+
+
+def int_to_hex_bytes(value, byte_size, signed=False, little_endian=True):
+    """
+    Convert an integer to little endian hex digits
+    :param value: integer value to convert
+    :type value: int
+    :param byte_size: byte size of the hex encoded integer
+    :type byte_size: int
+    :param signed: should be true if the integer is a signed integer
+    :type signed: bool
+    :param little_endian: false to use big endian instead
+    :type little_endian: bool
+    :return: hex representation of the integer, in upper case
+    :rtype: bytes
+    """
+    return binascii.hexlify(value.to_bytes(byte_size, 'little' if little_endian else 'big', signed=signed)).translate(UPPER)
 
 
 def calculate_checksum(message):
@@ -10,20 +89,7 @@ def calculate_checksum(message):
     :return: checksum as string
     :rtype: str
     """
-
-    # Make sure it is a valid hex string
-    if len(message) % 2 == 1:
-        message = '0' + message
-
-    # Get bytes
-    message_bytes = bytes.fromhex(message)
-
-    # The sum of all the bytes should be 0x55
-    check = 0
-    for byte in message_bytes:
-        check = (check + byte) & 0xFF
-    checksum = (0x55 - check) & 0xFF
-    return '{:02x}'.format(checksum).upper()
+    return frame_checksum(message.upper().encode('ascii')).decode('ascii')
 
 
 def check_checksum(message):
@@ -34,10 +100,7 @@ def check_checksum(message):
     :return: true if valid, false otherwise
     :rtype: bool
     """
-
-    checksum = calculate_checksum(message[:-2])
-
-    return checksum == message[-2:]
+    return calculate_checksum(message[:-2]) == message[-2:]
 
 
 def create_message(command, payload=''):
@@ -50,8 +113,7 @@ def create_message(command, payload=''):
     :return: hex message as binary string, including the calculated checksum
     :rtype: bytes
     """
-    message = str(command) + payload
-    return bytes(':' + message + calculate_checksum(message) + '\n', 'ascii')
+    return build_frame(str(command).encode('ascii'), payload.encode('ascii'))
 
 
 def int_to_hex_string(value, byte_size, signed=False, little_endian=True):
@@ -66,7 +128,7 @@ def int_to_hex_string(value, byte_size, signed=False, little_endian=True):
     :return: hex representation of the integer
     :rtype: str
     """
-    return codecs.encode(value.to_bytes(byte_size, 'little' if little_endian else 'big', signed=signed), 'hex').decode('utf-8').upper()
+    return int_to_hex_bytes(value, byte_size, signed, little_endian).decode('ascii')
 
 
 def string_to_hex_string(value, byte_size=None):
@@ -79,7 +141,7 @@ def string_to_hex_string(value, byte_size=None):
     :return: hex representation of the string
     :rtype: str
     """
-    hex_value = codecs.encode(str(value).encode(), 'hex').decode('utf-8').upper()
+    hex_value = binascii.hexlify(str(value).encode()).translate(UPPER).decode('ascii')
     if byte_size is not None:
         return hex_value.ljust(byte_size * 2, '0')
     else:
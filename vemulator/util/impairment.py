@@ -0,0 +1,221 @@
+# Impairments of a serial link, such as burst errors and lost bytes
+import math
+from random import Random
+
+from . import text
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Impairment:
+    """
+    Impairment of the frames that are sent over a link.
+    Bit errors follow the Gilbert-Elliott model: the link is either in a good state, in which bits are flipped with
+    probability bit_error_rate, or in a bad state (a burst), in which bits are flipped with probability
+    burst_error_rate. For every bit, the link enters a burst with probability burst_start, and leaves a burst with
+    probability burst_end. Without bursts, every bit is flipped independently.
+    Apart from bit errors, bytes can be dropped or inserted, and frames can be truncated.
+
+    The bit errors are generated as masks of block_size bytes at once, which are applied to consecutive frames. With
+    NumPy installed, the masks are generated vectorized. The impairment is reproducible from its seed.
+    """
+    block_size = 4096  # Amount of bytes of bit error masks that are generated at once
+
+    def __init__(self, bit_error_rate=0.0, burst_start=0.0, burst_end=1.0, burst_error_rate=0.5, drop_rate=0.0,
+                 insert_rate=0.0, truncate_rate=0.0, seed=0):
+        """
+        Create an impairment
+        :param bit_error_rate: probability that a bit is flipped outside of a burst
+        :type bit_error_rate: float
+        :param burst_start: probability per bit that a burst starts
+        :type burst_start: float
+        :param burst_end: probability per bit that a burst ends, the mean length of a burst is 1 / burst_end bits
+        :type burst_end: float
+        :param burst_error_rate: probability that a bit is flipped during a burst
+        :type burst_error_rate: float
+        :param drop_rate: probability that a byte is dropped
+        :type drop_rate: float
+        :param insert_rate: probability that a random byte is inserted before a byte
+        :type insert_rate: float
+        :param truncate_rate: probability that a frame is truncated at a random position
+        :type truncate_rate: float
+        :param seed: seed of the random number generator
+        :type seed: int
+        """
+        self.bit_error_rate = bit_error_rate
+        self.burst_start = burst_start
+        self.burst_end = burst_end
+        self.burst_error_rate = burst_error_rate
+        self.drop_rate = drop_rate
+        self.insert_rate = insert_rate
+        self.truncate_rate = truncate_rate
+        self.rand = Random(seed)
+        self.generator = np.random.default_rng(seed) if np is not None else None
+        self.burst = False  # Whether the link is currently in a burst
+        self.remaining = None  # Amount of bits until the link changes state, None if it never changes
+        self.masks = b''  # Bit error masks, of which the part before masks_offset has already been applied
+        self.masks_offset = 0
+        self.statistics = {
+            'frames': 0,
+            'flipped': 0,
+            'dropped': 0,
+            'inserted': 0,
+            'truncated': 0,
+        }
+
+    def has_bit_errors(self):
+        """
+        Check if the impairment flips any bits
+        :return: true if bits can be flipped, false otherwise
+        :rtype: bool
+        """
+        return self.bit_error_rate > 0.0 or (self.burst_start > 0.0 and self.burst_error_rate > 0.0)
+
+    def apply(self, frame):
+        """
+        Impair a frame
+        :param frame: frame to impair
+        :type frame: bytes
+        :return: the impaired frame, which can be empty
+        :rtype: bytes
+        """
+        self.statistics['frames'] += 1
+        if self.has_bit_errors() and len(frame) > 0:
+            mask = int.from_bytes(self.__take_masks(len(frame)), 'big')
+            if mask != 0:
+                self.statistics['flipped'] += bin(mask).count('1')
+                frame = (int.from_bytes(frame, 'big') ^ mask).to_bytes(len(frame), 'big')
+
+        if self.drop_rate > 0.0:
+            positions = list(text.error_positions(len(frame), self.drop_rate, self.rand))
+            if len(positions) > 0:
+                self.statistics['dropped'] += len(positions)
+                parts = []
+                start = 0
+                for position in positions:
+                    parts.append(frame[start:position])
+                    start = position + 1
+                parts.append(frame[start:])
+                frame = b''.join(parts)
+
+        if self.insert_rate > 0.0:
+            positions = list(text.error_positions(len(frame), self.insert_rate, self.rand))
+            if len(positions) > 0:
+                self.statistics['inserted'] += len(positions)
+                parts = []
+                start = 0
+                for position in positions:
+                    parts.append(frame[start:position])
+                    parts.append(bytes([self.rand.getrandbits(8)]))
+                    start = position
+                parts.append(frame[start:])
+                frame = b''.join(parts)
+
+        if self.truncate_rate > 0.0 and len(frame) > 0 and self.rand.random() < self.truncate_rate:
+            self.statistics['truncated'] += 1
+            frame = frame[:self.rand.randrange(len(frame))]
+        return frame
+
+    def get_statistics(self):
+        """
+        Get statistics about the impairment
+        :return: dict with the amount of frames, flipped bits, dropped and inserted bytes and truncated frames
+        :rtype: dict
+        """
+        return dict(self.statistics)
+
+    def __take_masks(self, size):
+        """
+        Take the bit error masks for a frame
+        :param size: size of the frame in bytes
+        :type size: int
+        :return: masks
+        :rtype: bytes
+        """
+        if self.masks_offset + size > len(self.masks):
+            self.masks = self.masks[self.masks_offset:] + self.__generate_masks(max(self.block_size, size))
+            self.masks_offset = 0
+        masks = self.masks[self.masks_offset:self.masks_offset + size]
+        self.masks_offset += size
+        return masks
+
+    def __states(self, bits):
+        """
+        Divide a block of bits into periods in which the state of the link does not change
+        :param bits: amount of bits in the block
+        :type bits: int
+        :return: list of tuples of the length of a period in bits and the bit error rate during that period
+        :rtype: list
+        """
+        periods = []
+        position = 0
+        while position < bits:
+            if self.remaining is None:
+                leave = self.burst_end if self.burst else self.burst_start
+                if leave > 0.0:
+                    # The time spent in a state is geometrically distributed
+                    self.remaining = 1 + int(math.log(1.0 - self.rand.random()) / math.log(1.0 - leave)) \
+                        if leave < 1.0 else 1
+                else:
+                    self.remaining = math.inf
+            length = min(self.remaining, bits - position)
+            periods.append((length, self.burst_error_rate if self.burst else self.bit_error_rate))
+            position += length
+            self.remaining -= length
+            if self.remaining == 0:
+                self.burst = not self.burst
+                self.remaining = None
+        return periods
+
+    def __generate_positions(self, bits, rate):
+        """
+        Draw the positions of the flipped bits in a period using NumPy, by drawing the distances between the flipped
+        bits from a geometric distribution
+        :param bits: amount of bits in the period
+        :type bits: int
+        :param rate: bit error rate during the period
+        :type rate: float
+        :return: positions of the flipped bits
+        :rtype: numpy.ndarray
+        """
+        if rate <= 0.0:
+            return np.zeros(0, dtype=np.int64)
+        if rate >= 1.0:
+            return np.arange(bits, dtype=np.int64)
+        positions = np.zeros(0, dtype=np.int64)
+        while len(positions) == 0 or positions[-1] < bits:
+            # Draw a few more distances than expected, and draw again in the unlikely case that they are not enough
+            amount = int(bits * rate + 4 * math.sqrt(bits * rate) + 10)
+            last = positions[-1] if len(positions) > 0 else -1
+            positions = np.concatenate([positions, last + np.cumsum(self.generator.geometric(rate, amount))])
+        return positions[positions < bits]
+
+    def __generate_masks(self, size):
+        """
+        Generate bit error masks for a block of bytes
+        :param size: size of the block in bytes
+        :type size: int
+        :return: masks
+        :rtype: bytes
+        """
+        periods = self.__states(size * 8)
+        if self.generator is not None:
+            masks = np.zeros(size, dtype=np.uint8)
+            start = 0
+            for length, rate in periods:
+                positions = start + self.__generate_positions(length, rate)
+                np.bitwise_or.at(masks, positions >> 3, np.right_shift(0x80, positions & 7).astype(np.uint8))
+                start += length
+            return masks.tobytes()
+
+        masks = bytearray(size)
+        start = 0
+        for length, rate in periods:
+            for position in text.error_positions(length, rate, self.rand):
+                position += start
+                masks[position >> 3] ^= text.BIT_MASKS[position & 7]
+            start += length
+        return bytes(masks)
@@ -60,6 +60,10 @@ def init_logger(module_name) -> logging.Logger:
     else:
         logger.setLevel(logging.INFO)
 
+    if len(logger.handlers) > 0:
+        # The logger of this module has already been initialized, for example by another scenario or emulator
+        return logger
+
     fh = logging.FileHandler('app.log')
     fh.setLevel(logging.DEBUG)
     formatter = logging.Formatter(log_format)
@@ -1,4 +1,16 @@
 # Util functions related to sending and processing text messages
+import math
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BIT_MASKS = [0x80 >> bit for bit in range(8)]  # Mask of every bit in a byte, most significant bit first
+CHECKSUM_LINE = b'\r\nChecksum\t'
+CHECKSUM_SUM = sum(CHECKSUM_LINE)
+
 
 def check_checksum(message):
     """
@@ -10,10 +22,7 @@ def check_checksum(message):
     """
 
     # The sum of all the bytes in the message should be zero
-    checksum = 0
-    for byte in message:
-        checksum = (checksum + byte) & 255
-    return checksum == 0
+    return sum(message) & 255 == 0
 
 
 def add_checksum(message):
@@ -26,41 +35,175 @@ def add_checksum(message):
     """
 
     # The sum of all the bytes in the message should be zero
-    message += b'\r\nChecksum\t'
-    checksum = 0
-    for byte in message:
-        checksum = (checksum + byte) & 255
-    checksum = (256 - checksum) & 255
+    message += CHECKSUM_LINE
+    checksum = (256 - sum(message)) & 255
     message += checksum.to_bytes(1, 'big')
     return message
 
 
 def bit_error(message, bit_error_rate, rand):
     """
-    Add bit errors to a message
+    Add bit errors to a message. Every bit is flipped independently with a probability of bit_error_rate.
+    Instead of drawing a random number for every bit, the distance to the next flipped bit is drawn from a geometric
+    distribution, such that the cost scales with the amount of errors instead of the length of the message.
     :param message: message
     :type message: bytes
     :param bit_error_rate: bit error rate
     :type bit_error_rate: float
     :param rand: RNG
     :type rand: Random
-    :return:
+    :return: the message with bit errors, of the same length as the message
+    :rtype: bytes
+    """
+    corrupted = bytearray(message)
+    for position in error_positions(len(message) * 8, bit_error_rate, rand):
+        corrupted[position >> 3] ^= BIT_MASKS[position & 7]
+    return bytes(corrupted)
+
+
+def bit_error_batch(messages, bit_error_rate, rand):
+    """
+    Add bit errors to a batch of messages. When NumPy is installed, the errors of all messages are drawn at once,
+    which is faster for large batches. The errors are drawn from a generator seeded by rand, such that the result is
+    reproducible, but different from calling bit_error() for every message.
+    :param messages: messages
+    :type messages: list
+    :param bit_error_rate: bit error rate
+    :type bit_error_rate: float
+    :param rand: RNG
+    :type rand: Random
+    :return: the messages with bit errors
+    :rtype: list
+    """
+    if np is None:
+        return [bit_error(message, bit_error_rate, rand) for message in messages]
+
+    generator = np.random.default_rng(rand.getrandbits(64))
+    data = np.frombuffer(b''.join(messages), dtype=np.uint8)
+    masks = np.packbits(generator.random(len(data) * 8) < bit_error_rate)
+    corrupted = (data ^ masks).tobytes()
+
+    result = []
+    offset = 0
+    for message in messages:
+        result.append(corrupted[offset:offset + len(message)])
+        offset += len(message)
+    return result
+
+
+def error_positions(bits, bit_error_rate, rand):
+    """
+    Draw the positions of the flipped bits in a message, or of any other independent event with a fixed probability
+    :param bits: amount of bits in the message
+    :type bits: int
+    :param bit_error_rate: probability that a bit is flipped
+    :type bit_error_rate: float
+    :param rand: RNG
+    :type rand: Random
+    :return: positions of the flipped bits, in increasing order
+    :rtype: generator
+    """
+    if bit_error_rate <= 0.0:
+        return
+    if bit_error_rate >= 1.0:
+        yield from range(bits)
+        return
+    if bit_error_rate > 0.5:
+        # Draw the positions of the bits that are not flipped instead, which are less common
+        correct = set(error_positions(bits, 1.0 - bit_error_rate, rand))
+        yield from (position for position in range(bits) if position not in correct)
+        return
+
+    log_q = math.log(1.0 - bit_error_rate)
+    position = -1
+    while True:
+        # Amount of correct bits before the next flipped bit, geometrically distributed
+        position += 1 + int(math.log(1.0 - rand.random()) / log_q)
+        if position >= bits:
+            return
+        yield position
+
+
+class TextFrameEncoder:
+    """
+    Encoder that turns the fields of a text message into one or more frames.
+    A message with more than max_fields fields is split into multiple frames: first by moving the H fields to a frame of
+    their own, and otherwise by splitting the fields evenly. The split plan and the encoded prefix of every field are
+    computed once per set of keys. The encoded line of every field and the sum of its bytes are kept until the value of
+    the field changes, such that only changed fields are encoded, and the checksum is the sum of the line sums.
     """
-    # Convert to a large integer value
-    int_representation = int.from_bytes(message, 'big')
-    # most significant byte is at the beginning of the byte array
-    # This large integer value can now be converted to a binary representation (without 0b)
-    bits = bin(int_representation)[2:]
-    # Convert it to a list of bits
-    bit_list = list(map(int, bits.zfill(8 * ((len(bits) + 7) // 8))))
-    # Calculate the amount of bits that have to be corrupted
-    amount_of_errors = round(bit_error_rate * len(bit_list))
-    # Select the specific bit indices to corrupt
-    to_corrupt = rand.sample(range(len(bit_list)), amount_of_errors)
-    for x in to_corrupt: # Corrupt the bit indices
-        bit_list[x] = int(not bool(bit_list[x]))
-
-    # Create large integer again
-    n = int(''.join(map(str, map(int, bit_list))), 2)
-    # And convert to byte array
-    return n.to_bytes((n.bit_length() + 7) // 8, 'big')
\ No newline at end of file
+    max_fields = 21  # Max length is 22 including Checksum
+    h_pattern = re.compile('^H[0-9]+$')
+
+    def __init__(self):
+        """
+        Create an encoder
+        """
+        self.plans = dict()  # key is a tuple of field keys, value is a list of frames, each a list of (key, prefix)
+        self.lines = dict()  # key is a field key, value is a tuple of its value, encoded line and sum of the line
+
+    def plan(self, keys):
+        """
+        Get the frames in which a message with certain keys is sent
+        :param keys: keys of the message, in order
+        :type keys: tuple
+        :return: list of frames, each a list of tuples of a key and its encoded prefix
+        :rtype: list
+        """
+        plan = self.plans.get(keys, None)
+        if plan is None:
+            plan = [[(key, b'\r\n' + bytes(key, 'utf-8') + b'\t') for key in frame] for frame in self.__split(list(keys))]
+            self.plans[keys] = plan
+        return plan
+
+    def encode(self, message, checksum=False):
+        """
+        Encode a message into frames
+        :param message: message fields, with str keys and str values
+        :type message: dict
+        :param checksum: whether to add the checksum to every frame
+        :type checksum: bool
+        :return: list of frames
+        :rtype: list
+        """
+        frames = []
+        lines = self.lines
+        for frame in self.plan(tuple(message)):
+            frame_lines = []
+            total = 0
+            for key, prefix in frame:
+                value = message[key]
+                line = lines.get(key, None)
+                if line is None or line[0] != value:
+                    # Only encode fields that have changed
+                    encoded = prefix + bytes(value, 'utf-8')
+                    line = (value, encoded, sum(encoded))
+                    lines[key] = line
+                frame_lines.append(line[1])
+                total += line[2]
+            if checksum:
+                frame_lines.append(CHECKSUM_LINE)
+                frame_lines.append(((-(total + CHECKSUM_SUM)) & 255).to_bytes(1, 'big'))
+            frames.append(b''.join(frame_lines))
+        return frames
+
+    def __split(self, keys):
+        """
+        Split the keys of a message into frames of at most max_fields keys
+        :param keys: keys of the message
+        :type keys: list
+        :return: list of lists of keys
+        :rtype: list
+        """
+        if len(keys) <= self.max_fields:
+            return [keys]
+
+        # First we check if we can just move the H fields to a new message
+        h_keys = [key for key in keys if self.h_pattern.match(key)]
+        if 0 < len(h_keys) < self.max_fields:
+            non_h_keys = [key for key in keys if not self.h_pattern.match(key)]
+            return self.__split(non_h_keys) + self.__split(h_keys)
+
+        # Removing the H messages does not help, just split evenly
+        split_index = len(keys) // 2
+        return self.__split(keys[:split_index]) + self.__split(keys[split_index:])